@@ -23,7 +23,7 @@ _BLOCKED_NAMES = frozenset({
     "BaseExchange",
     "PerpModule", "SpotModule", "PredictionModule", "ChampionshipModule", "AccountModule",
     # Interfaces
-    "IMarketData", "ITrading", "IPositions", "IAdvancedOrders",
+    "IMarketData", "ISubscription", "ITrading", "IPositions", "IAdvancedOrders", "IMarketDataCodec",
     # Data module
     "DataRetriever", "BacktestDataset",
     # Live trading
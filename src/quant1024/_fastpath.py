@@ -0,0 +1,96 @@
+"""
+Per-tick numeric helpers for LiveTrader
+
+每个 tick 都要执行的纯数值计算 (止损止盈判断、仓位差 → 方向/数量/金额)。
+安装 numba (可选依赖，pip install quant1024[jit]) 时以 @njit 编译为本地代码，
+cache=True 把编译结果缓存到 __pycache__，进程重启不再重新编译；
+未安装时同样的函数按普通 Python 执行，结果一致。
+
+返回值只用整数码和浮点数，日志与下单仍由 LiveTrader 负责。
+"""
+
+from typing import Tuple
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on environment
+    njit = None
+
+
+# compute_trade 的动作码
+TRADE_NONE = 0         # 仓位差小于最小交易量
+TRADE_BUY = 1
+TRADE_SELL = -1
+TRADE_OVER_LIMIT = 2   # 订单金额超出 max_notional
+
+# check_sl_tp 的结果码
+EXIT_NONE = 0
+EXIT_STOP_LOSS = 1
+EXIT_TAKE_PROFIT = 2
+
+MIN_TRADE_SIZE = 0.001
+
+
+def compute_trade(
+    diff: float,
+    price: float,
+    max_notional: float,
+    min_size: float
+) -> Tuple[int, float, float]:
+    """
+    计算调仓动作
+
+    Args:
+        diff: 仓位差 (目标仓位 - 当前仓位)
+        price: 当前价格
+        max_notional: 单笔订单金额上限 (initial_capital * max_position_size)
+        min_size: 最小交易量
+
+    Returns:
+        (动作码, 数量, 订单金额)
+    """
+    size = abs(diff)
+    if size < min_size:
+        return TRADE_NONE, size, 0.0
+    value = size * price
+    if value > max_notional:
+        return TRADE_OVER_LIMIT, size, value
+    if diff > 0:
+        return TRADE_BUY, size, value
+    return TRADE_SELL, size, value
+
+
+def check_sl_tp(pos: float, entry: float, price: float, sl: float, tp: float) -> int:
+    """
+    检查止损止盈
+
+    Args:
+        pos: 当前仓位
+        entry: 开仓价格
+        price: 当前价格
+        sl: 止损比例 (0 表示不启用)
+        tp: 止盈比例 (0 表示不启用)
+
+    Returns:
+        EXIT_NONE / EXIT_STOP_LOSS / EXIT_TAKE_PROFIT
+    """
+    if pos == 0 or entry == 0:
+        return EXIT_NONE
+    pnl_pct = (price - entry) / entry
+    # 无分支比较：sl、tp 均为正时两者互斥 (pnl <= -sl < 0 < tp <= pnl)，
+    # 编译后只有比较与选择指令，没有难以预测的条件跳转
+    hit_sl = (sl > 0) & (pnl_pct <= -sl)
+    hit_tp = (tp > 0) & (pnl_pct >= tp)
+    return EXIT_STOP_LOSS * hit_sl + EXIT_TAKE_PROFIT * hit_tp
+
+
+if njit is not None:
+    # 显式签名：导入时即编译为单一特化版本，免去首次调用时的类型推断
+    compute_trade = njit(
+        "Tuple((int8, float64, float64))(float64, float64, float64, float64)",
+        cache=True, fastmath=True
+    )(compute_trade)
+    check_sl_tp = njit(
+        "int8(float64, float64, float64, float64, float64)",
+        cache=True, fastmath=True
+    )(check_sl_tp)
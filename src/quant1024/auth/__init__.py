@@ -2,7 +2,7 @@
 Authentication modules for quant1024
 """
 
-from .hmac_auth import generate_signature, get_auth_headers, get_simple_auth_headers
+from .hmac_auth import HmacSigner, generate_signature, get_auth_headers, get_simple_auth_headers
 
-__all__ = ["generate_signature", "get_auth_headers", "get_simple_auth_headers"]
+__all__ = ["HmacSigner", "generate_signature", "get_auth_headers", "get_simple_auth_headers"]
 
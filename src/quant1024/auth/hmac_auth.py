@@ -30,7 +30,7 @@ The timestamp must be within 30 seconds of the server time.
 import hmac
 import hashlib
 import time
-from typing import Dict
+from typing import Dict, Optional
 
 
 def generate_signature(
@@ -78,12 +78,56 @@ def generate_signature(
     return signature
 
 
+class HmacSigner:
+    """
+    Reusable HMAC-SHA256 signer for a single secret key.
+    
+    The keyed HMAC state (inner/outer padded key blocks) is computed once;
+    each signature copies that state instead of re-deriving it from the key.
+    Produces the same signatures as generate_signature().
+    
+    Example:
+        >>> signer = HmacSigner("abc123")
+        >>> headers = signer.headers("1024_abc...", "GET", "/api/v1/perp/positions")
+    """
+    
+    __slots__ = ("_mac",)
+    
+    def __init__(self, secret_key: str):
+        self._mac = hmac.new(secret_key.encode('utf-8'), digestmod=hashlib.sha256)
+    
+    def sign(self, timestamp: str, method: str, path: str, body: str = "") -> str:
+        """Sign timestamp + METHOD + path + body, returning the hex digest."""
+        mac = self._mac.copy()
+        mac.update(f"{timestamp}{method.upper()}{path}{body}".encode('utf-8'))
+        return mac.hexdigest()
+    
+    def headers(
+        self,
+        api_key: str,
+        method: str,
+        path: str,
+        body: str = "",
+        timestamp: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Build authentication headers (same layout as get_auth_headers)."""
+        if timestamp is None:
+            timestamp = str(time.time_ns() // 1_000_000)
+        return {
+            "Content-Type": "application/json",
+            "X-TRADING-API-KEY": api_key,
+            "X-SIGNATURE": self.sign(timestamp, method, path, body),
+            "X-TIMESTAMP": timestamp,
+        }
+
+
 def get_auth_headers(
     api_key: str,
     secret_key: str,
     method: str,
     path: str,
-    body: str = ""
+    body: str = "",
+    timestamp: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Generate authentication headers for 1024 Exchange API.
@@ -99,6 +143,8 @@ def get_auth_headers(
         method: HTTP method (GET, POST, PUT, DELETE)
         path: API endpoint path (e.g., /api/v1/perp/orders)
         body: Request body JSON string (empty for GET requests)
+        timestamp: Unix timestamp in milliseconds (string). Generated from
+            the current time when omitted.
     
     Returns:
         Dict with complete authentication headers
@@ -118,7 +164,9 @@ def get_auth_headers(
         The timestamp is validated by the server (must be within 30 seconds).
         Method is automatically converted to uppercase for signature.
     """
-    timestamp = str(int(time.time() * 1000))
+    if timestamp is None:
+        # Integer nanoseconds avoid the float multiply/truncate of time.time()
+        timestamp = str(time.time_ns() // 1_000_000)
     signature = generate_signature(secret_key, timestamp, method, path, body)
     
     return {
@@ -3,7 +3,7 @@ Core functionality for quant1024 package
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 class QuantStrategy(ABC):
@@ -14,6 +14,20 @@ class QuantStrategy(ABC):
     其他软件可以继承这个类来实现自己的交易策略。
     """
     
+    # 可选的向量化信号函数：接收价格 ndarray，返回最新一个信号 (int)。
+    # 设置后实盘每个 tick 直接调用它，不经过 generate_signals 的列表打包；
+    # 可以是 @njit 编译的模块级函数，需用 staticmethod 包装，例如
+    #     _vectorized_core = staticmethod(_trend_signal)
+    _vectorized_core: Optional[Callable[[Any], int]] = None
+    
+    # 实盘传给 generate_signals 的价格格式：默认 list (与回测一致，每个 tick 复制一次窗口)；
+    # 为 True 时改为传入价格窗口的只读 numpy 数组视图，不复制，可直接向量化处理
+    supports_ndarray: bool = False
+    
+    # 增量信号：为 True 时实盘对每个新价格调用一次 update(state, price)，
+    # 按状态 O(1) 更新 (如 EMA / RSI)，不再每个 tick 传入整个价格窗口
+    supports_incremental: bool = False
+    
     def __init__(self, name: str, params: Optional[Dict[str, Any]] = None):
         """
         初始化策略
@@ -37,7 +51,7 @@ class QuantStrategy(ABC):
         生成交易信号（抽象方法，必须由子类实现）
         
         Args:
-            data: 价格数据列表
+            data: 价格数据（实盘中为 list；supports_ndarray 为 True 时为只读 numpy 数组）
             
         Returns:
             信号列表，1表示买入，-1表示卖出，0表示持有
@@ -58,6 +72,23 @@ class QuantStrategy(ABC):
         """
         pass
     
+    def init_state(self) -> Any:
+        """增量信号的初始状态（supports_incremental 为 True 时使用）"""
+        return None
+    
+    def update(self, state: Any, price: float) -> Tuple[Any, int]:
+        """
+        增量更新信号（supports_incremental 为 True 时子类必须实现，LiveTrader 构造时检查）
+        
+        Args:
+            state: 上一次返回的状态（首次为 init_state() 的返回值）
+            price: 新的价格
+            
+        Returns:
+            (新状态, 最新信号)
+        """
+        raise NotImplementedError(f"{type(self).__name__} 未实现增量信号 update()")
+    
     def backtest(self, data: List[float]) -> Dict[str, Any]:
         """
         回测策略
@@ -45,28 +45,21 @@ class ExchangeAdapter(BaseAdapter):
             start_ts = int(start_time.timestamp() * 1000) if start_time else None
             end_ts = int(end_time.timestamp() * 1000) if end_time else None
             
-            # 调用 1024ex API
-            raw_data = self.client.get_klines(
+            # 调用 1024ex API (直接返回 DataFrame，按列转换类型)
+            df = self.client.perp.get_klines(
                 market=symbol,
                 interval=interval,
                 start_time=start_ts,
                 end_time=end_ts,
-                limit=limit or 1000
+                limit=limit or 1000,
+                as_frame=True
             )
+            if df.empty:
+                return df
             
-            # 格式化为DataFrame
-            records = []
-            for item in raw_data:
-                records.append({
-                    'timestamp': pd.to_datetime(item['timestamp'], unit='ms', utc=True),
-                    'open': float(item['open']),
-                    'high': float(item['high']),
-                    'low': float(item['low']),
-                    'close': float(item['close']),
-                    'volume': float(item['volume'])
-                })
-            
-            df = pd.DataFrame(records)
+            price_cols = ['open', 'high', 'low', 'close', 'volume']
+            df = df[['timestamp'] + price_cols].astype(dict.fromkeys(price_cols, float))
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
             return df
         
         else:
@@ -82,19 +75,13 @@ class ExchangeAdapter(BaseAdapter):
         """从交易所获取成交数据"""
         
         if self.source == "1024ex":
-            raw_data = self.client.get_trades(market=symbol, limit=limit)
+            df = self.client.perp.get_trades(market=symbol, limit=limit, as_frame=True)
+            if df.empty:
+                return df
             
-            records = []
-            for item in raw_data:
-                records.append({
-                    'timestamp': pd.to_datetime(item['timestamp'], unit='ms', utc=True),
-                    'price': float(item['price']),
-                    'size': float(item['size']),
-                    'side': item['side'],
-                    'trade_id': item['id']
-                })
-            
-            return pd.DataFrame(records)
+            df = df[['timestamp', 'price', 'size', 'side', 'id']].astype({'price': float, 'size': float})
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+            return df.rename(columns={'id': 'trade_id'})
         
         else:
             raise NotImplementedError(f"交易所 '{self.source}' 的 get_trades 还未实现")
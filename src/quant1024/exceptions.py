@@ -18,8 +18,8 @@ class RateLimitError(Quant1024Exception):
     pass
 
 
-class InvalidParameterError(Quant1024Exception):
-    """参数错误"""
+class InvalidParameterError(Quant1024Exception, ValueError):
+    """参数错误（同时是 ValueError，可按标准库习惯捕获）"""
     pass
 
 
@@ -0,0 +1,350 @@
+"""
+Response cache for read-only endpoints
+
+两级 TTL 缓存：
+- 进程内 LRU (OrderedDict)，命中时不发请求、不解析 JSON
+- 可选共享后端 (如 redis.Redis)，多进程共享，值为 gzip 压缩的 JSON
+
+共享后端只需提供 get(key) / setex(key, ttl, value) 两个方法，不引入 redis 依赖。
+
+CachedMarketData 在任意 IMarketData 实现外包一层按方法 TTL 的进程内缓存。
+KlineCache 把已收盘 K 线按 (市场, 周期) 存为 numpy 结构化数组，区间查询只做切片。
+"""
+
+import gzip
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ..utils import fastjson
+
+if TYPE_CHECKING:
+    from ..interfaces import IMarketData
+
+
+_MISS = object()
+
+
+class ResponseCache:
+    """
+    TTL 响应缓存
+    
+    Example:
+        >>> import redis
+        >>> exchange = Exchange1024ex(response_cache=True, cache_backend=redis.Redis())
+    """
+    
+    def __init__(self, maxsize: int = 4096, backend: Optional[Any] = None, namespace: str = "") -> None:
+        """
+        Args:
+            maxsize: 进程内最多缓存条目数
+            backend: 共享后端 (需支持 get / setex)，None 表示仅进程内
+            namespace: 共享后端的 key 前缀 (如 base_url)，避免不同环境混用
+        """
+        self.maxsize = maxsize
+        self.backend = backend
+        self.namespace = namespace
+        self._local: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Any:
+        """读取缓存，未命中返回 _MISS"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._local.move_to_end(key)
+                    return entry[1]
+                del self._local[key]
+        
+        if self.backend is None:
+            return _MISS
+        try:
+            raw = self.backend.get(self._backend_key(key))
+        except Exception:
+            return _MISS
+        if raw is None:
+            return _MISS
+        return fastjson.loads(gzip.decompress(raw))
+    
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """写入缓存 (进程内 + 共享后端)"""
+        with self._lock:
+            self._local[key] = (time.monotonic() + ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+        
+        if self.backend is not None:
+            try:
+                self.backend.setex(
+                    self._backend_key(key),
+                    max(1, int(ttl)),
+                    gzip.compress(fastjson.dumps(value))
+                )
+            except Exception:
+                pass
+    
+    def clear(self) -> None:
+        """清空进程内缓存"""
+        with self._lock:
+            self._local.clear()
+    
+    def invalidate(self, match: Callable[[Hashable], bool]) -> int:
+        """删除进程内满足 match(key) 的条目，返回删除数量"""
+        with self._lock:
+            keys = [key for key in self._local if match(key)]
+            for key in keys:
+                del self._local[key]
+        return len(keys)
+    
+    def _backend_key(self, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return f"quant1024:{self.namespace}:{digest}"
+
+
+_INTERVAL_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+_INTERVAL_RE = re.compile(r"^(\d+)([mhdw])$")
+
+
+def _interval_ms(interval: str) -> Optional[int]:
+    """K 线周期 (如 1m / 4h / 1d) 转毫秒，无法识别时返回 None"""
+    match = _INTERVAL_RE.match(interval)
+    if match is None:
+        return None
+    return int(match.group(1)) * _INTERVAL_MS[match.group(2)]
+
+
+class CachedMarketData:
+    """
+    带 TTL 的市场数据包装器
+    
+    包装任意 IMarketData 实现 (如 exchange.perp / exchange.spot)，
+    同一 TTL 窗口内的重复读取只发一次请求。已收盘的历史 K 线
+    (end_time 早于最后一根 K 线收盘) 不会再变，永久缓存 (受 maxsize 限制)。
+    其余方法原样转发。
+    
+    Example:
+        >>> market = CachedMarketData(exchange.perp, ttl={"ticker": 1})
+        >>> market.get_ticker("BTC-USDC")   # 1 秒内重复调用不发请求
+        >>> market.clear_symbol("BTC-USDC")
+    """
+    
+    TTL: Dict[str, float] = {
+        "markets": 60,
+        "market": 60,
+        "ticker": 2,
+        "orderbook": 1,
+        "trades": 1,
+        "klines": 60,
+    }
+    
+    def __init__(
+        self,
+        provider: "IMarketData",
+        ttl: Optional[Dict[str, float]] = None,
+        maxsize: int = 4096
+    ) -> None:
+        """
+        Args:
+            provider: 被包装的市场数据实现
+            ttl: 覆盖默认 TTL (秒)，键为 markets/market/ticker/orderbook/trades/klines
+            maxsize: 最多缓存条目数
+        """
+        self._provider = provider
+        self._ttl = {**self.TTL, **(ttl or {})}
+        self._cache = ResponseCache(maxsize=maxsize)
+    
+    @staticmethod
+    def _symbol_key(symbol: str) -> str:
+        """缓存 key 的市场名归一化 (BTC/USDC、btc-usdc 视为同一市场)"""
+        return symbol.upper().replace("/", "-")
+    
+    def _cached(self, kind: str, symbol: str, args: Tuple[Any, ...], ttl: float, fetch: Callable[[], Any]) -> Any:
+        key = (kind, self._symbol_key(symbol), args)
+        value = self._cache.get(key)
+        if value is _MISS:
+            value = fetch()
+            self._cache.set(key, value, ttl)
+        return value
+    
+    def get_markets(self) -> List[Dict[str, Any]]:
+        """获取所有市场列表"""
+        return self._cached("markets", "", (), self._ttl["markets"], self._provider.get_markets)
+    
+    def get_market(self, symbol: str) -> Dict[str, Any]:
+        """获取单个市场信息"""
+        return self._cached("market", symbol, (), self._ttl["market"], lambda: self._provider.get_market(symbol))
+    
+    def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """获取市场行情"""
+        return self._cached("ticker", symbol, (), self._ttl["ticker"], lambda: self._provider.get_ticker(symbol))
+    
+    def get_orderbook(self, symbol: str, depth: int = 20) -> Dict[str, Any]:
+        """获取订单簿"""
+        return self._cached(
+            "orderbook", symbol, (depth,), self._ttl["orderbook"],
+            lambda: self._provider.get_orderbook(symbol, depth)
+        )
+    
+    def get_trades(self, symbol: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """获取最近成交记录"""
+        return self._cached(
+            "trades", symbol, (limit,), self._ttl["trades"],
+            lambda: self._provider.get_trades(symbol, limit)
+        )
+    
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str = "1h",
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """获取 K 线数据 (已收盘的历史窗口永久缓存)"""
+        ttl = self._ttl["klines"]
+        step = _interval_ms(interval)
+        if end_time is not None and step is not None and end_time + step <= time.time() * 1000:
+            ttl = math.inf
+        return self._cached(
+            "klines", symbol, (interval, start_time, end_time, limit), ttl,
+            lambda: self._provider.get_klines(
+                symbol, interval=interval, start_time=start_time, end_time=end_time, limit=limit
+            )
+        )
+    
+    def clear_symbol(self, symbol: str) -> int:
+        """删除某个市场的全部缓存，返回删除条目数"""
+        name = self._symbol_key(symbol)
+        return self._cache.invalidate(lambda key: key[1] == name)
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        self._cache.clear()
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._provider, name)
+
+
+# KlineCache 的行格式，可直接按列 (bars["close"]) 交给 TA 库
+KLINE_DTYPE = [
+    ("ts", "i8"), ("open", "f8"), ("high", "f8"), ("low", "f8"), ("close", "f8"), ("volume", "f8"),
+]
+
+
+class KlineCache:
+    """
+    K 线区间缓存
+    
+    每个 (市场, 周期) 保存一段连续的已收盘 K 线 (按 ts 升序的结构化数组)，
+    已收盘 K 线不会再变，永不过期。查询时只向交易所请求缺失的两端，
+    命中部分用 searchsorted 切片返回，无 JSON 解析与逐行转换。
+    尚未收盘的最新一根每次实时获取，不写入缓存。
+    
+    Example:
+        >>> klines = KlineCache(exchange.perp)
+        >>> bars = klines.get("BTC-USDC", "1h", start, end)
+        >>> bars["close"].mean()
+    """
+    
+    def __init__(self, provider: "IMarketData", page_size: int = 500) -> None:
+        """
+        Args:
+            provider: 提供 get_klines 的市场数据实现
+            page_size: 每次请求的 K 线条数
+        """
+        self._provider = provider
+        self._page_size = page_size
+        self._bars: Dict[Tuple[str, str], Any] = {}
+        self._covered: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, symbol: str, interval: str, start: int, end: int) -> Any:
+        """
+        获取 [start, end] (毫秒，按开盘时间) 内的 K 线
+        
+        Returns:
+            dtype 为 KLINE_DTYPE 的 numpy 数组
+        """
+        import numpy as np
+        
+        step = _interval_ms(interval)
+        if step is None:
+            raise ValueError(f"Unsupported kline interval: {interval}")
+        key = (CachedMarketData._symbol_key(symbol), interval)
+        # 最后一根已收盘 K 线的开盘时间
+        closed = (int(time.time() * 1000) // step - 1) * step
+        
+        with self._lock:
+            bars = self._bars.get(key)
+            covered = self._covered.get(key)
+        
+        if start <= closed:
+            last = min(end, closed)
+            if covered is None:
+                missing = [(start, last)]
+            else:
+                missing = []
+                if start < covered[0]:
+                    missing.append((start, covered[0] - step))
+                if last > covered[1]:
+                    missing.append((covered[1] + step, last))
+            if missing:
+                parts = [self._fetch(symbol, interval, step, lo, hi) for lo, hi in missing]
+                if bars is not None:
+                    parts.append(bars)
+                bars = np.concatenate(parts)
+                _, index = np.unique(bars["ts"], return_index=True)
+                bars = bars[index]
+                lo = start if covered is None else min(start, covered[0])
+                hi = last if covered is None else max(last, covered[1])
+                with self._lock:
+                    self._bars[key] = bars
+                    self._covered[key] = (lo, hi)
+        
+        result = np.empty(0, dtype=KLINE_DTYPE) if bars is None else bars[
+            np.searchsorted(bars["ts"], start, "left"):np.searchsorted(bars["ts"], end, "right")
+        ]
+        if end > closed:
+            live = self._fetch(symbol, interval, step, max(start, closed + step), end)
+            result = np.concatenate([result, live])
+        return result
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._bars.clear()
+            self._covered.clear()
+    
+    def _fetch(self, symbol: str, interval: str, step: int, start: int, end: int) -> Any:
+        """分页拉取 [start, end] 内的 K 线"""
+        import numpy as np
+        
+        rows: List[Tuple[int, float, float, float, float, float]] = []
+        cursor = start
+        while cursor <= end:
+            page = self._provider.get_klines(
+                symbol, interval=interval, start_time=cursor, end_time=end, limit=self._page_size
+            )
+            # 只收游标之后的新 K 线：忽略 start_time 或重复返回边界 K 线的后端不会产生重复行
+            newest = None
+            for item in page:
+                ts = int(item.get("timestamp") or item.get("ts") or 0)
+                if cursor <= ts <= end:
+                    rows.append((
+                        ts, float(item["open"]), float(item["high"]),
+                        float(item["low"]), float(item["close"]), float(item.get("volume") or 0),
+                    ))
+                    if newest is None or ts > newest:
+                        newest = ts
+            # 短页、本页没有新 K 线或游标无法前进时结束，避免死循环
+            if len(page) < self._page_size or newest is None or newest + step <= cursor:
+                break
+            cursor = newest + step
+        return np.array(rows, dtype=KLINE_DTYPE)
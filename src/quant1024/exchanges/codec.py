@@ -0,0 +1,59 @@
+"""
+Sans-I/O response codec
+
+把响应字节解码为快照的纯函数，不依赖客户端与网络。
+回放/回测时可直接解码已落盘的原始响应，无需构造客户端；
+解码实现也可单独基准测试或替换，不影响传输层。
+
+请求层与 typed=True 使用同一套 from_payload，两条路径结果一致。
+"""
+
+from typing import Any, Dict, List, Union
+
+from .snapshot import Kline, Order, Orderbook, PerpPosition, Ticker
+from ..utils import fastjson
+
+
+def _data(buf: Union[bytes, str]) -> Any:
+    """解析 JSON 并取出标准响应的 data 字段"""
+    result = fastjson.loads(buf)
+    if isinstance(result, dict):
+        return result.get("data", result)
+    return result
+
+
+class JsonMarketDataCodec:
+    """
+    1024ex JSON 响应解码器 (实现 IMarketDataCodec)
+    
+    Example:
+        >>> codec = JsonMarketDataCodec()
+        >>> with open("ticker.json", "rb") as f:
+        ...     ticker = codec.decode_ticker(f.read())
+    """
+    
+    __slots__ = ()
+    
+    def decode_ticker(self, buf: Union[bytes, str]) -> Ticker:
+        """解码行情响应"""
+        return Ticker.from_payload(_data(buf))
+    
+    def decode_orderbook(self, buf: Union[bytes, str]) -> Orderbook:
+        """解码订单簿响应"""
+        return Orderbook.from_payload(_data(buf))
+    
+    def decode_klines(self, buf: Union[bytes, str]) -> List[Kline]:
+        """解码 K 线响应"""
+        return [Kline.from_payload(item) for item in _data(buf)]
+    
+    def decode_trades(self, buf: Union[bytes, str]) -> List[Dict[str, Any]]:
+        """解码成交响应"""
+        return _data(buf)
+    
+    def decode_order(self, buf: Union[bytes, str]) -> Order:
+        """解码订单响应"""
+        return Order.from_payload(_data(buf))
+    
+    def decode_position(self, buf: Union[bytes, str]) -> PerpPosition:
+        """解码持仓响应"""
+        return PerpPosition.from_payload(_data(buf))
@@ -18,21 +18,25 @@ Note: Timestamp must be within 30 seconds of server time.
 API Documentation: https://api.1024ex.com/api-docs/openapi.json
 """
 
+import importlib
 import requests
-import json
+import threading
 import time
-from typing import List, Dict, Any, Optional
+import uuid
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 from .base import BaseExchange
-from .modules import (
-    PerpModule,
-    SpotModule,
-    PredictionModule,
-    ChampionshipModule,
-    AccountModule,
-)
-from ..auth.hmac_auth import get_auth_headers, get_simple_auth_headers
+from .cache import ResponseCache
+from .ratelimit import TokenBucket
+from .transport import Http2Session
+from ..auth.hmac_auth import HmacSigner, get_simple_auth_headers
+from ..utils import fastjson
 from ..exceptions import (
     APIError,
     AuthenticationError,
@@ -42,6 +46,52 @@ from ..exceptions import (
     MarketNotFoundError
 )
 
+if TYPE_CHECKING:
+    from .modules import (
+        PerpModule,
+        AsyncPerpModule,
+        SpotModule,
+        PredictionModule,
+        ChampionshipModule,
+        AccountModule,
+    )
+    from .streaming import Subscription
+
+
+class _ModuleAccessor:
+    """
+    Lazily import and construct an API module on first access.
+    
+    The instance is then stored in the client's __dict__, which shadows this
+    (non-data) descriptor, so later accesses are plain attribute lookups.
+    """
+    
+    def __init__(self, module: str, class_name: str, doc: str) -> None:
+        self.module = module
+        self.class_name = class_name
+        self.__doc__ = doc
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+    
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        module = importlib.import_module(f"{__package__}.modules.{self.module}")
+        value = getattr(module, self.class_name)(instance)
+        instance.__dict__[self.name] = value
+        return value
+
+
+# Shared by every unauthenticated request; sessions copy headers, never mutate them.
+_PUBLIC_HEADERS = {"Content-Type": "application/json"}
+
+
+@lru_cache(maxsize=4096)
+def _join_url(base_url: str, path: str) -> str:
+    """urljoin with caching; pollers hit the same few market paths repeatedly."""
+    return urljoin(base_url, path)
+
 
 class Exchange1024ex(BaseExchange):
     """
@@ -72,13 +122,24 @@ class Exchange1024ex(BaseExchange):
         >>> exchange.prediction.list_markets(category="crypto")
     """
     
+    # Seconds a client_order_id submission is remembered (see _submit_once)
+    ORDER_DEDUP_TTL = 30.0
+    
     def __init__(
         self,
         api_key: str = "",
         secret_key: str = "",
         base_url: str = "https://api.1024ex.com",
-        timeout: int = 30,
-        max_retries: int = 3
+        timeout: Union[float, Tuple[float, float]] = 30,
+        max_retries: int = 3,
+        max_workers: int = 16,
+        pool_maxsize: int = 128,
+        http2: bool = False,
+        response_cache: bool = False,
+        cache_backend: Optional[Any] = None,
+        rate_limit: Optional[float] = None,
+        rate_limit_backend: Optional[Any] = None,
+        validate_orders: bool = False
     ):
         """
         Initialize 1024ex client.
@@ -90,58 +151,160 @@ class Exchange1024ex(BaseExchange):
                 - Production: https://api.1024ex.com
                 - Testnet: https://testnet-api.1024ex.com
                 - Local dev: http://localhost:8090
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds, or a (connect, read) tuple so
+                a dead connection fails fast without cutting off slow reads
             max_retries: Maximum retry attempts for failed requests
+            max_workers: Worker threads backing the async modules (async_perp)
+            pool_maxsize: Keep-alive connections kept per host
+            http2: Use an HTTP/2 (httpx) transport that multiplexes concurrent
+                requests over one connection; requires quant1024[http2]
+            response_cache: Cache read-only public endpoints (markets, tickers,
+                categories...) for a short per-endpoint TTL
+            cache_backend: Optional shared cache (e.g. redis.Redis()) used as a
+                second tier behind the in-process cache
+            rate_limit: Pace requests to this many per second before sending,
+                with separate buckets for public and signed endpoints
+            rate_limit_backend: Optional shared counter (e.g. redis.Redis()) so
+                several processes share the rate_limit budget
+            validate_orders: Strictly validate place_order payloads against the
+                pydantic request models before sending (off by default)
         """
         super().__init__(api_key, secret_key, base_url)
         self.secret_key = secret_key
         self.timeout = timeout
         self.max_retries = max_retries
-        self.session = requests.Session()
-        
-        # Initialize modules
-        self._perp = PerpModule(self)
-        self._spot = SpotModule(self)
-        self._prediction = PredictionModule(self)
-        self._championship = ChampionshipModule(self)
-        self._account = AccountModule(self)
+        self.max_workers = max_workers
+        self.validate_orders = validate_orders
+        if http2:
+            self.session = Http2Session()
+        else:
+            self.session = self._build_session(pool_maxsize)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._signer: Optional[HmacSigner] = None
+        self._signer_key = ""
+        self._response_cache: Optional[ResponseCache] = None
+        if response_cache or cache_backend is not None:
+            self._response_cache = ResponseCache(backend=cache_backend, namespace=self.base_url)
+        self._recent_orders: "OrderedDict[str, Tuple[float, Future]]" = OrderedDict()
+        self._recent_orders_lock = threading.Lock()
+        self._public_bucket: Optional[TokenBucket] = None
+        self._private_bucket: Optional[TokenBucket] = None
+        if rate_limit is not None:
+            self._public_bucket = TokenBucket(
+                rate_limit, backend=rate_limit_backend, key=f"{self.base_url}:public")
+            self._private_bucket = TokenBucket(
+                rate_limit, backend=rate_limit_backend, key=f"{self.base_url}:private")
     
     # ========== Module Accessors ==========
-    
-    @property
-    def perp(self) -> PerpModule:
-        """Perpetual futures trading module"""
-        return self._perp
-    
-    @property
-    def spot(self) -> SpotModule:
-        """Spot trading module"""
-        return self._spot
-    
-    @property
-    def prediction(self) -> PredictionModule:
-        """Prediction markets module"""
-        return self._prediction
-    
-    @property
-    def championship(self) -> ChampionshipModule:
-        """Championship leaderboard module"""
-        return self._championship
-    
-    @property
-    def account(self) -> AccountModule:
-        """Account management module"""
-        return self._account
+    # Modules are imported and constructed on first access
+    
+    perp: "PerpModule" = _ModuleAccessor(
+        "perp", "PerpModule", "Perpetual futures trading module")
+    async_perp: "AsyncPerpModule" = _ModuleAccessor(
+        "perp_async", "AsyncPerpModule", "Perpetual futures market data, async (asyncio.gather fan-out)")
+    spot: "SpotModule" = _ModuleAccessor(
+        "spot", "SpotModule", "Spot trading module")
+    prediction: "PredictionModule" = _ModuleAccessor(
+        "prediction", "PredictionModule", "Prediction markets module")
+    championship: "ChampionshipModule" = _ModuleAccessor(
+        "championship", "ChampionshipModule", "Championship leaderboard module")
+    account: "AccountModule" = _ModuleAccessor(
+        "account", "AccountModule", "Account management module")
     
     # ========== HTTP Request Layer ==========
     
+    @staticmethod
+    def _build_session(pool_maxsize: int) -> requests.Session:
+        """
+        Create the shared keep-alive session used by every module.
+        
+        The mounted adapter pools connections (TCP/TLS handshakes are paid once
+        per connection, not per call) and retries 502/503/504. POST is retried
+        too: _request sends one Idempotency-Key for every attempt, so the server
+        drops the duplicate when an order already landed. Connection errors and
+        all other statuses are left to the retry/exception logic in _request.
+        """
+        retry = Retry(
+            total=3,
+            connect=0,
+            read=0,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            backoff_factor=0.2,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
+    
+    def _submit_once(self, key: str, send: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run send() once per key within ORDER_DEDUP_TTL seconds.
+        
+        Repeated submissions of the same client_order_id (caller retries,
+        duplicate signals) wait for the first request and get its response
+        instead of placing a second order. Failures are not remembered, so a
+        failed submission can be retried.
+        """
+        now = time.monotonic()
+        with self._recent_orders_lock:
+            # Constant TTL: insertion order is expiry order
+            recent = self._recent_orders
+            while recent:
+                oldest = next(iter(recent.values()))
+                if oldest[0] > now:
+                    break
+                recent.popitem(last=False)
+            entry = recent.get(key)
+            if entry is not None:
+                future = entry[1]
+                owner = False
+            else:
+                future = Future()
+                recent[key] = (now + self.ORDER_DEDUP_TTL, future)
+                owner = True
+        if not owner:
+            return future.result()
+        try:
+            result = send()
+        except BaseException as e:
+            with self._recent_orders_lock:
+                if self._recent_orders.get(key, (0, None))[1] is future:
+                    del self._recent_orders[key]
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+    
+    def _get_signer(self) -> HmacSigner:
+        """Keyed HMAC signer, rebuilt only when secret_key changes."""
+        if self._signer is None or self._signer_key != self.secret_key:
+            self._signer = HmacSigner(self.secret_key)
+            self._signer_key = self.secret_key
+        return self._signer
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Worker pool for async modules, created on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="1024ex_http"
+            )
+        return self._executor
+    
     def _request(
         self,
         method: str,
         path: str,
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
-        auth_required: bool = True
+        auth_required: bool = True,
+        payload: Optional[bytes] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Send HTTP request to the API.
@@ -152,6 +315,8 @@ class Exchange1024ex(BaseExchange):
             params: URL query parameters
             data: Request body data
             auth_required: Whether authentication is required
+            payload: Pre-serialized JSON body, sent and signed as-is instead of data
+            idempotency_key: Idempotency-Key for POSTs (default: a fresh uuid4)
         
         Returns:
             API response data
@@ -161,20 +326,19 @@ class Exchange1024ex(BaseExchange):
             AuthenticationError: Authentication failed
             RateLimitError: Rate limit exceeded
         """
-        url = urljoin(self.base_url, path)
+        url = _join_url(self.base_url, path)
         
-        # Build request body
-        body = ""
-        if data:
-            body = json.dumps(data)
+        # Build request body (signature covers the exact bytes sent)
+        if payload is None and data:
+            payload = fastjson.dumps(data)
+        body = payload.decode("utf-8") if payload else ""
         
         # Build authentication headers
         if auth_required and self.api_key:
             if self.secret_key:
                 # Use HMAC-SHA256 signature authentication (recommended)
-                headers = get_auth_headers(
+                headers = self._get_signer().headers(
                     api_key=self.api_key,
-                    secret_key=self.secret_key,
                     method=method.upper(),
                     path=path,
                     body=body
@@ -183,18 +347,28 @@ class Exchange1024ex(BaseExchange):
                 # API Key only (for public endpoints or testing)
                 headers = get_simple_auth_headers(self.api_key)
         else:
-            headers = {"Content-Type": "application/json"}
+            headers = _PUBLIC_HEADERS
+        
+        # POST creates state (orders, mints...). One key for every attempt below
+        # lets the server drop the duplicate when a retried request already landed.
+        if method == "POST":
+            headers = {**headers, "Idempotency-Key": idempotency_key or uuid.uuid4().hex}
+        
+        # Pace before sending; a client-side wait is cheaper than a 429 round-trip
+        bucket = self._private_bucket if auth_required else self._public_bucket
         
         # Send request with retry logic
         last_exception = None
         for attempt in range(self.max_retries):
+            if bucket is not None:
+                bucket.acquire()
             try:
                 response = self.session.request(
                     method=method,
                     url=url,
                     headers=headers,
                     params=params,
-                    data=body if data else None,
+                    data=payload,
                     timeout=self.timeout
                 )
                 
@@ -208,7 +382,7 @@ class Exchange1024ex(BaseExchange):
                     raise MarketNotFoundError("Resource not found")
                 elif response.status_code >= 400:
                     try:
-                        error_data = response.json()
+                        error_data = fastjson.loads(response.content)
                         error_msg = error_data.get('message', f'HTTP {response.status_code}')
                     except:
                         error_msg = f'HTTP {response.status_code}'
@@ -216,7 +390,7 @@ class Exchange1024ex(BaseExchange):
                 
                 # Parse response
                 try:
-                    result = response.json()
+                    result = fastjson.loads(response.content)
                     return result
                 except ValueError:
                     return {"success": True, "data": response.text}
@@ -364,6 +538,15 @@ class Exchange1024ex(BaseExchange):
         """Get positions (delegates to perp module)"""
         return self.perp.get_positions(market)
     
+    def subscribe_positions(
+        self,
+        market: str,
+        callback: Callable[[List[Dict[str, Any]]], None],
+        interval: float = 1.0
+    ) -> "Subscription":
+        """Subscribe to position changes for one market (delegates to perp module)"""
+        return self.perp.subscribe_positions(market, callback, interval)
+    
     def get_balance(self) -> Dict[str, Any]:
         """Get account balance (delegates to account module)"""
         return self.account.get_overview()
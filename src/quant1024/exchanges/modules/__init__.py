@@ -3,20 +3,47 @@
 
 模块化架构，每个模块负责一个功能领域：
 - PerpModule: 永续合约交易
+- AsyncPerpModule: 永续合约行情 (asyncio 并发版)
+- BatchingPerpProxy: 下单/撤单客户端合并 (批量接口)
+- CancelCoalescer: 撤单合并 (亚毫秒窗口)
+- AsyncLoader: 读接口协程请求合并 (DataLoader 模式)
 - SpotModule: 现货交易
 - PredictionModule: 预测市场
 - ChampionshipModule: 锦标赛排行榜
 - AccountModule: 账户管理
 """
 
-from .perp import PerpModule
-from .spot import SpotModule
-from .prediction import PredictionModule
-from .championship import ChampionshipModule
-from .account import AccountModule
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .perp import PerpModule
+    from .perp_async import AsyncPerpModule
+    from .batching import BatchingPerpProxy, CancelCoalescer
+    from .loader import AsyncLoader
+    from .spot import SpotModule
+    from .prediction import PredictionModule
+    from .championship import ChampionshipModule
+    from .account import AccountModule
+
+# name -> submodule, imported on first access
+_LAZY = {
+    "PerpModule": "perp",
+    "AsyncPerpModule": "perp_async",
+    "BatchingPerpProxy": "batching",
+    "CancelCoalescer": "batching",
+    "AsyncLoader": "loader",
+    "SpotModule": "spot",
+    "PredictionModule": "prediction",
+    "ChampionshipModule": "championship",
+    "AccountModule": "account",
+}
 
 __all__ = [
     "PerpModule",
+    "AsyncPerpModule",
+    "BatchingPerpProxy",
+    "CancelCoalescer",
+    "AsyncLoader",
     "SpotModule",
     "PredictionModule",
     "ChampionshipModule",
@@ -24,5 +51,11 @@ __all__ = [
 ]
 
 
-
-
+def __getattr__(name: str):
+    """Import module classes lazily so unused modules cost nothing at import."""
+    if name in _LAZY:
+        import importlib
+        value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -7,15 +7,160 @@ Module Base Class
 设计模式：模板方法模式
 - 基类定义请求骨架
 - 子类定义具体路径和参数
+- 只有路径参数的简单接口在 ROUTES 中声明，类创建时生成方法
+- 每个同步接口自动生成 a 前缀的异步版本 (如 place_order -> aplace_order)
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import inspect
+from functools import partial, update_wrapper, wraps
+from string import Formatter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..cache import _MISS
 
 if TYPE_CHECKING:
     from ..exchange_1024ex import Exchange1024ex
 
 
+class Route(NamedTuple):
+    """
+    声明式接口定义
+    
+    path 中的 {placeholder} 即方法的位置参数 (按出现顺序)。
+    
+    Attributes:
+        name: 方法名
+        method: HTTP 方法
+        path: 端点路径模板 (如 /orders/twap/{order_id})
+        doc: 方法文档
+        auth_required: 是否需要认证
+        extract: 是否用 _extract_data 提取 data 字段
+        arg_types: 参数类型注解，默认 str
+        cache_ttl: 只读公开接口的缓存秒数 (见 cached)，None 不缓存
+    """
+    name: str
+    method: str
+    path: str
+    doc: str
+    auth_required: bool = True
+    extract: bool = False
+    arg_types: Tuple[Tuple[str, str], ...] = ()
+    cache_ttl: Optional[float] = None
+
+
+def _compile_route(route: Route, owner: type) -> Callable[..., Any]:
+    """将 Route 编译为方法 (路径、HTTP 方法、认证标志均为常量)"""
+    args = [field for _, field, _, _ in Formatter().parse(route.path) if field]
+    call = f"self._request({route.method!r}, f{route.path!r}, auth_required={route.auth_required})"
+    body = f"self._extract_data({call})" if route.extract else call
+    source = f"def {route.name}(self, {', '.join(args)}):\n    return {body}\n"
+    namespace: Dict[str, Any] = {"Any": Any, "Dict": Dict, "List": List}
+    exec(compile(source, f"<route {owner.__name__}.{route.name}>", "exec"), namespace)
+    
+    fn = namespace[route.name]
+    fn.__doc__ = route.doc
+    fn.__module__ = owner.__module__
+    fn.__qualname__ = f"{owner.__name__}.{route.name}"
+    types = dict(route.arg_types)
+    fn.__annotations__ = {arg: types.get(arg, "str") for arg in args}
+    fn.__annotations__["return"] = "List[Dict[str, Any]]" if route.extract else "Dict[str, Any]"
+    if route.cache_ttl is not None:
+        fn = cached(route.cache_ttl)(fn)
+    return fn
+
+
+
+def cached(ttl: float) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    只读公开接口的 TTL 缓存装饰器
+    
+    仅在客户端启用 response_cache 时生效；key 为 (方法, 参数)。
+    只用于无需认证的接口，缓存结果在调用方之间共享，不应修改。
+    
+    Example:
+        >>> @cached(ttl=300)
+        ... def list_categories(self): ...
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(fn)
+        def wrapper(self: "ModuleBase", *args: Any, **kwargs: Any) -> Any:
+            cache = self._client._response_cache
+            if cache is None:
+                return fn(self, *args, **kwargs)
+            key = (fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            value = cache.get(key)
+            if value is _MISS:
+                value = fn(self, *args, **kwargs)
+                cache.set(key, value, ttl)
+            return value
+        return wrapper
+    return decorator
+
+
+def _make_async_twin(fn: Callable[..., Any], owner: type) -> Callable[..., Any]:
+    """生成同步接口的异步版本 (在客户端线程池中执行)"""
+    async def twin(self: "ModuleBase", *args: Any, **kwargs: Any) -> Any:
+        return await self._arun(fn, *args, **kwargs)
+    
+    update_wrapper(twin, fn)
+    twin.__name__ = f"a{fn.__name__}"
+    twin.__qualname__ = f"{owner.__name__}.a{fn.__name__}"
+    twin.__doc__ = f"{fn.__doc__.strip().splitlines()[0] if fn.__doc__ else fn.__name__} (异步)"
+    return twin
+
+
+class Pipeline:
+    """
+    批量提交的方法调用记录器 (由 ModuleBase.pipeline 创建)
+    
+    with 块内的接口调用只被记录，退出时在客户端线程池中一次性并发发送，
+    N 个请求耗时约 1×RTT (http2=True 时在同一连接上多路复用)。
+    results 按调用顺序排列；请求之间不保证到达服务端的先后。
+    
+    Example:
+        >>> with exchange.perp.pipeline() as pipe:
+        ...     for order_id in order_ids:
+        ...         pipe.cancel_twap(order_id)
+        >>> pipe.results
+    """
+    
+    __slots__ = ("_module", "_calls", "results")
+    
+    def __init__(self, module: "ModuleBase") -> None:
+        self._module = module
+        self._calls: List[Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]] = []
+        self.results: List[Any] = []
+    
+    def __getattr__(self, name: str) -> Callable[..., int]:
+        fn = getattr(self._module, name)
+        if name.startswith("_") or not callable(fn):
+            raise AttributeError(name)
+        
+        def record(*args: Any, **kwargs: Any) -> int:
+            self._calls.append((fn, args, kwargs))
+            return len(self._calls) - 1
+        return record
+    
+    def __len__(self) -> int:
+        return len(self._calls)
+    
+    def execute(self) -> List[Any]:
+        """发送已记录的调用，返回按调用顺序排列的结果；任一请求失败时抛出该异常"""
+        calls, self._calls = self._calls, []
+        executor = self._module._client._get_executor()
+        futures = [executor.submit(fn, *args, **kwargs) for fn, args, kwargs in calls]
+        self.results = [future.result() for future in futures]
+        return self.results
+    
+    def __enter__(self) -> "Pipeline":
+        return self
+    
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.execute()
+
+
 class ModuleBase:
     """
     模块基类
@@ -36,6 +181,33 @@ class ModuleBase:
     
     PATH_PREFIX: str = ""
     
+    # 在类创建时编译为方法的简单接口
+    ROUTES: Tuple[Route, ...] = ()
+    
+    # 不生成异步版本的公开方法 (非 HTTP 接口)
+    SYNC_ONLY: Tuple[str, ...] = ()
+    
+    # 无 __dict__，子类需声明自己的 __slots__
+    __slots__ = ("_client",)
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for route in cls.__dict__.get("ROUTES", ()):
+            if route.name in cls.__dict__:
+                raise TypeError(f"{cls.__name__}.{route.name} is defined both in ROUTES and the class body")
+            setattr(cls, route.name, _compile_route(route, cls))
+        sync_only = set(cls.__dict__.get("SYNC_ONLY", ()))
+        for name, fn in list(cls.__dict__.items()):
+            if (
+                name.startswith("_")
+                or name in sync_only
+                or not inspect.isfunction(fn)
+                or inspect.iscoroutinefunction(fn)
+                or f"a{name}" in cls.__dict__
+            ):
+                continue
+            setattr(cls, f"a{name}", _make_async_twin(fn, cls))
+    
     def __init__(self, client: "Exchange1024ex") -> None:
         """
         初始化模块
@@ -72,31 +244,174 @@ class ModuleBase:
             >>> # 实际请求路径: /api/v1/perp/markets/BTC-USDC/ticker
             >>> self._request("GET", "/markets/BTC-USDC/ticker")
         """
-        path = f"{self.PATH_PREFIX}{endpoint}"
+        # 位置参数直传，避免每次调用构造关键字参数字典
+        return self._client._request(
+            method, f"{self.PATH_PREFIX}{endpoint}", params, data, auth_required
+        )
+    
+    def _request_raw(self, method: str, endpoint: str, payload: bytes, auth_required: bool = True) -> Any:
+        """发送已序列化的 JSON 请求体 (原样签名并发送，见 PredictionModule.order_template)"""
         return self._client._request(
-            method=method,
-            path=path,
+            method, f"{self.PATH_PREFIX}{endpoint}", None, None, auth_required, payload
+        )
+    
+    def _place_once(self, endpoint: str, data: Dict[str, Any], client_order_id: Optional[str]) -> Any:
+        """
+        下单 POST，带 client_order_id 时去重
+        
+        client_order_id 同时作为 Idempotency-Key 发送，服务端据此识别重复请求；
+        客户端在 ORDER_DEDUP_TTL 秒内对同一 ID 只发送一次，重复调用直接拿到首次结果。
+        """
+        if client_order_id is None:
+            return self._request("POST", endpoint, data=data)
+        path = f"{self.PATH_PREFIX}{endpoint}"
+        return self._client._submit_once(
+            f"{path}:{client_order_id}",
+            lambda: self._client._request("POST", path, None, data, True, None, client_order_id)
+        )
+    
+    async def _arequest(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        auth_required: bool = True
+    ) -> Any:
+        """
+        异步发送 HTTP 请求
+        
+        在客户端线程池中执行 _request，不阻塞事件循环；
+        多个 _arequest 可通过 asyncio.gather 并发，N 次请求耗时约 1×RTT。
+        参数与 _request 相同。
+        """
+        return await self._arun(
+            type(self)._request,
+            method,
+            endpoint,
             params=params,
             data=data,
             auth_required=auth_required
         )
     
-    def _extract_data(self, result: Any) -> Any:
+    async def _arun(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """在客户端线程池中执行 fn(self, *args, **kwargs)，不阻塞事件循环"""
+        import asyncio  # 仅异步调用方需要，不计入同步客户端的导入耗时
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._client._get_executor(),
+            partial(fn, self, *args, **kwargs)
+        )
+    
+    def fetch_many(self, fn: Callable[..., Any], keys: Iterable[Any], **kwargs: Any) -> Dict[Any, Any]:
+        """
+        并发调用同一只读接口，返回 {key: 结果}
+        
+        在客户端线程池中执行，请求复用共享 Session 的保活连接，
+        N 个请求耗时约为 N / max_workers 个 RTT。任一请求失败时抛出该异常。
+        
+        Args:
+            fn: 本模块的接口方法，首个参数为 key (如 get_market_stats)
+            keys: 参数列表 (如 market_id 列表)
+            **kwargs: 传给每次调用的其余参数
+        
+        Example:
+            >>> stats = exchange.prediction.fetch_many(exchange.prediction.get_market_stats, ["1", "2", "3"])
+        """
+        keys = list(keys)
+        executor = self._client._get_executor()
+        futures = [executor.submit(fn, key, **kwargs) for key in keys]
+        return {key: future.result() for key, future in zip(keys, futures)}
+    
+    def _iter_pages(self, endpoint: str, params: Dict[str, Any], page_size: int) -> Iterator[Any]:
+        """
+        按 cursor 逐页请求列表接口，逐条产出
+        
+        下一页 cursor 取响应的 next_cursor 字段；没有 cursor 或不满一页时结束。
+        每次只持有一页，调用方提前 break 时不再请求后续页。
+        """
+        params = {**params, "limit": page_size}
+        while True:
+            result = self._request("GET", endpoint, params=params)
+            page = self._extract_data(result)
+            yield from page
+            cursor = result.get("next_cursor") if isinstance(result, dict) else None
+            if not cursor or len(page) < page_size:
+                return
+            params["cursor"] = cursor
+    
+    def pipeline(self) -> Pipeline:
+        """
+        记录一组接口调用，退出 with 块时并发发送
+        
+        适用于服务端没有批量接口的场景 (如逐个取消高级订单)。
+        
+        Example:
+            >>> with exchange.perp.pipeline() as pipe:
+            ...     pipe.cancel_twap("t1")
+            ...     pipe.cancel_iceberg("i1")
+            >>> pipe.results
+        """
+        return Pipeline(self)
+    
+    @staticmethod
+    def _validate(model: str, data: Dict[str, Any]) -> None:
+        """
+        按 quant1024.models.order 中的请求模型严格校验请求体
+        
+        仅在客户端 validate_orders=True 时由下单接口调用。pydantic v2 的
+        校验器在模型类创建时编译 (Rust 核心)，请求体不做转换、原样发送。
+        
+        Raises:
+            InvalidParameterError: 字段缺失或类型不符
+        """
+        from pydantic import ValidationError
+        from ...models import order
+        from ...exceptions import InvalidParameterError
+        try:
+            getattr(order, model).model_validate(data, strict=True)
+        except ValidationError as e:
+            raise InvalidParameterError(str(e)) from None
+    
+    @staticmethod
+    def _compact(**fields: Any) -> Dict[str, Any]:
+        """
+        构造请求参数/请求体，去掉值为 None 或空字符串的字段
+        
+        空字符串与 None 等价 (如 market="" 仍表示不按市场过滤，不会发送 ?market=)；
+        False / 0 等显式值会保留 (如 reduce_only=False、start_time=0)。
+        
+        Example:
+            >>> self._compact(limit=100, market="", reduce_only=False)
+            {'limit': 100, 'reduce_only': False}
+        """
+        return {k: v for k, v in fields.items() if v is not None and v != ""}
+    
+    def _extract_data(self, result: Any, model: Optional[Any] = None, as_frame: bool = False) -> Any:
         """
         从响应中提取 data 字段
         
         处理标准响应格式：{"success": true, "data": [...]}
+        返回的是解析结果本身 (不复制)，调用方可直接持有或修改。
+        只做一次字典取值，不遍历列表；大响应的开销在 JSON 解析本身
+        (500 行 K 线约 285µs 解析 vs 0.15µs 提取)。
         
         Args:
             result: API 响应
+            model: 可选的快照类型 (需提供 from_payload)，如 Ticker；
+                列表响应会逐项转换
+            as_frame: 为 True 时将列表转换为 pandas.DataFrame
         
         Returns:
             data 字段内容，或原始响应
         """
         if isinstance(result, dict):
-            return result.get("data", result)
-        return result
-
-
-
-
+            result = result.get("data", result)
+        if as_frame:
+            import pandas as pd
+            return pd.DataFrame.from_records(result if isinstance(result, list) else [result])
+        if model is None:
+            return result
+        if isinstance(result, list):
+            return [model.from_payload(item) for item in result]
+        return model.from_payload(result)
@@ -28,6 +28,8 @@ class AccountModule(ModuleBase):
     
     PATH_PREFIX = "/api/v1/accounts/me"
     
+    __slots__ = ()
+    
     # ========== 账户概览 ==========
     
     def get_overview(self) -> Dict[str, Any]:
@@ -0,0 +1,271 @@
+"""
+Client-side order batching
+
+将策略逐笔发出的 place_order / cancel_order 在极短窗口内合并，
+通过 batch_place_orders / batch_cancel_orders 一次发送，K 次往返合并为 1 次。
+
+- 窗口: 最多等待 max_delay_ms，或凑满 max_batch 立即发送
+- 每次调用立即返回 concurrent.futures.Future，批量响应返回后按
+  client_order_id / order_id 映射回各自的 Future
+- 窗口内只有一笔时直接走单笔接口，响应格式与 PerpModule 一致
+- 撤单使用更短的窗口 (默认 1ms)，撤单风暴时合并、平时几乎无额外延迟
+"""
+
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .perp import PerpModule
+
+
+_STOP = object()
+
+
+class _Coalescer:
+    """
+    后台线程合并提交项，按批调用 flush
+    
+    flush 接收一批提交项，返回等长的结果列表 (与提交顺序对应)。
+    """
+    
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], List[Any]],
+        max_batch: int,
+        max_delay: float,
+        name: str
+    ) -> None:
+        self._flush = flush
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def submit(self, item: Any) -> Future:
+        """提交一项，返回在批量响应后完成的 Future"""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("batcher is closed")
+            if not self._thread.is_alive():
+                self._thread.start()
+            self._queue.put((item, future))
+        return future
+    
+    def close(self) -> None:
+        """发送剩余项后停止后台线程"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._thread.is_alive()
+            self._queue.put(_STOP)
+        if started:
+            self._thread.join()
+    
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch: List[Tuple[Any, Future]] = [first]
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    # 窗口结束后仍取走已排队的项，不再等待
+                    if remaining > 0:
+                        entry = self._queue.get(timeout=remaining)
+                    else:
+                        entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = self._flush(items)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+def _rows(response: Any) -> List[Any]:
+    """从批量响应中取出逐项结果列表"""
+    data = response.get("data", response) if isinstance(response, dict) else response
+    if isinstance(data, dict):
+        for key in ("orders", "results", "items"):
+            if isinstance(data.get(key), list):
+                return data[key]
+    return data if isinstance(data, list) else []
+
+
+def _match(response: Any, keys: List[str], field: str) -> List[Any]:
+    """
+    将批量响应映射回提交顺序
+    
+    优先按 field (client_order_id / order_id) 匹配，其次按位置，
+    都无法匹配时返回整个批量响应。
+    """
+    rows = _rows(response)
+    by_key = {
+        row.get(field): row
+        for row in rows
+        if isinstance(row, dict) and row.get(field) is not None
+    }
+    matched = []
+    for i, key in enumerate(keys):
+        if key in by_key:
+            matched.append(by_key[key])
+        elif len(rows) == len(keys):
+            matched.append(rows[i])
+        else:
+            matched.append(response)
+    return matched
+
+
+class CancelCoalescer:
+    """
+    撤单合并器
+    
+    cancel-replace 策略在行情剧烈时每秒发出大量撤单。窗口默认 1ms：
+    窗口内及窗口结束时已排队的撤单全部合并为一次 DELETE /orders/batch，
+    单笔时直接调用 DELETE /orders/{id}。
+    
+    Example:
+        >>> with CancelCoalescer(exchange.perp) as cancels:
+        ...     futures = [cancels.cancel_order(oid) for oid in stale_ids]
+        ...     results = [f.result() for f in futures]
+    """
+    
+    def __init__(self, perp: PerpModule, max_batch: int = 100, max_delay_ms: float = 1) -> None:
+        """
+        Args:
+            perp: 用于发送请求的 PerpModule
+            max_batch: 单批最大数量
+            max_delay_ms: 合并窗口 (毫秒)，0 表示只合并已排队的撤单
+        """
+        self._perp = perp
+        self._coalescer = _Coalescer(self._flush, max_batch, max_delay_ms / 1000, "perp_cancel_batcher")
+    
+    def cancel_order(self, order_id: str) -> "Future[Dict[str, Any]]":
+        """撤销订单 (合并发送)"""
+        return self._coalescer.submit(order_id)
+    
+    def close(self) -> None:
+        """发送队列中剩余的撤单并停止后台线程"""
+        self._coalescer.close()
+    
+    def __enter__(self) -> "CancelCoalescer":
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+    
+    def _flush(self, order_ids: List[str]) -> List[Any]:
+        if len(order_ids) == 1:
+            return [self._perp.cancel_order(order_ids[0])]
+        response = self._perp.batch_cancel_orders(order_ids)
+        return _match(response, order_ids, "order_id")
+
+
+class BatchingPerpProxy:
+    """
+    PerpModule 批量下单/撤单代理
+    
+    place_order / cancel_order 返回 Future，其余方法直接转发给 PerpModule。
+    未指定 client_order_id 的订单会自动生成，用于映射批量响应。
+    
+    Example:
+        >>> perp = BatchingPerpProxy(exchange.perp, max_batch=50, max_delay_ms=5)
+        >>> futures = [perp.place_order("BTC-USDC", "long", "limit", "0.1", price=p) for p in prices]
+        >>> results = [f.result() for f in futures]
+        >>> perp.close()
+    """
+    
+    def __init__(
+        self,
+        perp: PerpModule,
+        max_batch: int = 50,
+        max_delay_ms: float = 5,
+        cancel_delay_ms: float = 1
+    ) -> None:
+        """
+        Args:
+            perp: 被代理的 PerpModule
+            max_batch: 单批最大数量
+            max_delay_ms: 下单合并窗口 (毫秒)
+            cancel_delay_ms: 撤单合并窗口 (毫秒)
+        """
+        self._perp = perp
+        self._orders = _Coalescer(self._flush_orders, max_batch, max_delay_ms / 1000, "perp_order_batcher")
+        self._cancels = CancelCoalescer(perp, max_batch, cancel_delay_ms)
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_perp":
+            raise AttributeError(name)
+        return getattr(self._perp, name)
+    
+    def place_order(
+        self,
+        market: str,
+        side: str,
+        order_type: str,
+        size: str,
+        price: Optional[str] = None,
+        leverage: Optional[int] = None,
+        reduce_only: bool = False,
+        post_only: bool = False,
+        time_in_force: str = "GTC",
+        client_order_id: Optional[str] = None
+    ) -> "Future[Dict[str, Any]]":
+        """下单 (合并发送)，参数同 PerpModule.place_order"""
+        return self._orders.submit({
+            "market": market,
+            "side": side,
+            "order_type": order_type,
+            "size": size,
+            "price": price,
+            "leverage": leverage,
+            "reduce_only": reduce_only,
+            "post_only": post_only,
+            "time_in_force": time_in_force,
+            "client_order_id": client_order_id or uuid.uuid4().hex
+        })
+    
+    def cancel_order(self, order_id: str) -> "Future[Dict[str, Any]]":
+        """撤销订单 (合并发送)"""
+        return self._cancels.cancel_order(order_id)
+    
+    def close(self) -> None:
+        """发送队列中剩余的请求并停止后台线程"""
+        self._orders.close()
+        self._cancels.close()
+    
+    def __enter__(self) -> "BatchingPerpProxy":
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+    
+    def _flush_orders(self, orders: List[Dict[str, Any]]) -> List[Any]:
+        # 单笔走 place_order，保留参数校验、client_order_id 去重与 Idempotency-Key
+        if len(orders) == 1:
+            return [self._perp.place_order(**orders[0])]
+        response = self._perp.batch_place_orders([PerpModule._build_order(**o) for o in orders])
+        return _match(response, [o["client_order_id"] for o in orders], "client_order_id")
+
@@ -27,6 +27,8 @@ class ChampionshipModule(ModuleBase):
     
     PATH_PREFIX = "/api/v1/championships"
     
+    __slots__ = ()
+    
     def list_championships(
         self,
         status: Optional[str] = None,
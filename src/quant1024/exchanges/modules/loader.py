@@ -0,0 +1,83 @@
+"""
+Async request coalescing (DataLoader pattern)
+
+同一事件循环 tick 内对同一接口族的多次 await loader.load(key)
+被合并为一次 batch_fn(keys) 调用，调用方代码无需改动。
+
+- 窗口: 最多等待 max_wait_ms，或凑满 max_batch 立即发送
+- 窗口内重复的 key 共享同一个结果
+- batch_fn 失败时，该批所有等待方收到同一异常
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+
+class AsyncLoader:
+    """
+    协程请求合并器
+
+    一个 loader 只在一个事件循环中使用；batch_fn 接收 key 列表，
+    返回 {key: 结果}。
+
+    Example:
+        >>> loader = exchange.prediction.orderbook_loader(max_wait_ms=1)
+        >>> books = await asyncio.gather(*(loader.load(m) for m in market_ids))
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Awaitable[Dict[Any, Any]]],
+        max_batch: int = 100,
+        max_wait_ms: float = 1.0
+    ) -> None:
+        self._batch_fn = batch_fn
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self._pending: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def load(self, key: Hashable) -> Any:
+        """获取 key 对应的结果 (与同一窗口内的其他请求合并发送)"""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self._max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._max_wait, self._dispatch)
+        # shield: 单个调用方取消不影响共享同一 key 的其他调用方
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """批量获取，结果按 keys 顺序返回"""
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[Hashable, "asyncio.Future[Any]"]) -> None:
+        try:
+            results = await self._batch_fn(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if key in results:
+                future.set_result(results[key])
+            else:
+                future.set_exception(KeyError(key))
@@ -11,8 +11,70 @@ PerpModule - 永续合约模块
 实现接口: IMarketData, ITrading, IPositions, IAdvancedOrders
 """
 
-from typing import Any, Dict, List, Optional
-from ._base import ModuleBase
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Union
+from ._base import ModuleBase, Route, cached
+from ..snapshot import Kline, Order, Orderbook, PerpPosition, Ticker
+from ..streaming import MarketFeed, OrderCache, Subscription
+from ...utils import fastjson
+
+if TYPE_CHECKING:
+    from ..exchange_1024ex import Exchange1024ex
+
+
+# 拆分模板时的占位值 (含 NUL，不会与真实字段值冲突)
+_SIDE_MARK = fastjson.dumps("\x00side")
+_SIZE_MARK = fastjson.dumps("\x00size")
+
+
+class PerpOrderTemplate:
+    """
+    固定市场/订单类型的永续下单模板 (由 PerpModule.order_template 创建)
+    
+    请求体除 side / size / client_order_id 外的字段只序列化一次，
+    submit 时只拼接这三个值，生成的字节与同参数的 place_order 完全一致。
+    
+    Example:
+        >>> template = exchange.perp.order_template("BTC-USDC", order_type="market")
+        >>> template.submit(side="long", size="0.1", client_order_id="abc123")
+    """
+    
+    __slots__ = ("_module", "_fields", "_head", "_mid", "_tail")
+    
+    def __init__(self, module: "PerpModule", fields: Dict[str, Any]) -> None:
+        self._module = module
+        self._fields = fields
+        # 按 place_order 的字段顺序序列化后在占位值处切开：
+        # {"market":..,"side": | <side> | ,"type":..,"size": | <size> | ,"reduce_only":..
+        body = fastjson.dumps(PerpModule._build_order(side="\x00side", size="\x00size", **fields))
+        self._head, rest = body.split(_SIDE_MARK)
+        self._mid, self._tail = rest.split(_SIZE_MARK)
+        self._tail = self._tail[:-1]
+    
+    def body(self, side: str, size: str, client_order_id: Optional[str] = None) -> bytes:
+        """生成请求体"""
+        parts = [self._head, fastjson.dumps(side), self._mid, fastjson.dumps(size), self._tail]
+        if client_order_id is not None:
+            parts.append(b',"client_order_id":' + fastjson.dumps(client_order_id))
+        parts.append(b"}")
+        return b"".join(parts)
+    
+    def submit(self, side: str, size: str, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """按模板下单 (带 client_order_id 时与 place_order 一样去重)"""
+        module = self._module
+        client = module._client
+        if client.validate_orders:
+            module._validate(
+                "OrderRequest",
+                PerpModule._build_order(side=side, size=size, client_order_id=client_order_id, **self._fields)
+            )
+        payload = self.body(side, size, client_order_id)
+        if client_order_id is None:
+            return module._request_raw("POST", "/orders", payload)
+        path = f"{module.PATH_PREFIX}/orders"
+        return client._submit_once(
+            f"{path}:{client_order_id}",
+            lambda: client._request("POST", path, None, None, True, payload, client_order_id)
+        )
 
 
 class PerpModule(ModuleBase):
@@ -29,31 +91,169 @@ class PerpModule(ModuleBase):
     
     PATH_PREFIX = "/api/v1/perp"
     
+    __slots__ = ("_order_cache", "_ticker_feed", "_orderbook_feed", "_positions_feed")
+    
+    # 批量读取内部已在线程池并发，不再生成异步版本 (避免占用同一线程池等待自身)
+    SYNC_ONLY = (
+        "enable_order_cache", "disable_order_cache", "order_template",
+        "get_tickers", "get_orderbooks", "get_trades_batch",
+        "subscribe_ticker", "subscribe_orderbook", "subscribe_positions",
+        "iter_order_history", "iter_trade_history",
+    )
+    
+    def __init__(self, client: "Exchange1024ex") -> None:
+        super().__init__(client)
+        self._order_cache: Optional[OrderCache] = None
+        self._ticker_feed: Optional[MarketFeed] = None
+        self._orderbook_feed: Optional[MarketFeed] = None
+        self._positions_feed: Optional[MarketFeed] = None
+    
     # ========== 市场数据 (Market Data) ==========
     
+    @cached(ttl=60)
     def get_markets(self) -> List[Dict[str, Any]]:
         """获取所有永续合约市场"""
         result = self._request("GET", "/markets", auth_required=False)
         return self._extract_data(result)
     
+    @cached(ttl=60)
     def get_market(self, market: str) -> Dict[str, Any]:
         """获取单个市场信息"""
         return self._request("GET", f"/markets/{market}", auth_required=False)
     
-    def get_ticker(self, market: str) -> Dict[str, Any]:
-        """获取 24h 行情"""
-        return self._request("GET", f"/markets/{market}/ticker", auth_required=False)
+    @cached(ttl=2)
+    def get_ticker(self, market: str, typed: bool = False) -> Union[Dict[str, Any], Ticker]:
+        """
+        获取 24h 行情
+        
+        Args:
+            market: 市场名称
+            typed: 为 True 时返回 Ticker 快照 (属性访问，适合高频轮询)
+        """
+        result = self._request("GET", f"/markets/{market}/ticker", auth_required=False)
+        if typed:
+            return self._extract_data(result, model=Ticker)
+        return result
     
-    def get_orderbook(self, market: str, depth: int = 20) -> Dict[str, Any]:
-        """获取订单簿"""
+    def get_orderbook(self, market: str, depth: int = 20, typed: bool = False) -> Union[Dict[str, Any], Orderbook]:
+        """
+        获取订单簿
+        
+        Args:
+            market: 市场名称
+            depth: 档位数
+            typed: 为 True 时返回 Orderbook 快照 (bids / asks 为 numpy 数组)
+        """
         params = {"depth": depth}
-        return self._request("GET", f"/markets/{market}/orderbook", params=params, auth_required=False)
+        result = self._request("GET", f"/markets/{market}/orderbook", params=params, auth_required=False)
+        if typed:
+            return self._extract_data(result, model=Orderbook)
+        return result
     
-    def get_trades(self, market: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """获取最近成交"""
+    def get_trades(self, market: str, limit: int = 100, as_frame: bool = False) -> Any:
+        """
+        获取最近成交
+        
+        Args:
+            market: 市场名称
+            limit: 数量
+            as_frame: 为 True 时返回 pandas.DataFrame (逐列构造，不逐行转换)
+        """
         params = {"limit": limit}
         result = self._request("GET", f"/markets/{market}/trades", params=params, auth_required=False)
-        return self._extract_data(result)
+        return self._extract_data(result, as_frame=as_frame)
+    
+    # 批量读取：服务端没有多市场行情接口，在共享连接池上并发请求，返回 {market: 结果}
+    
+    def get_tickers(self, markets: List[str], typed: bool = False) -> Dict[str, Any]:
+        """批量获取行情 (并发)"""
+        return self.fetch_many(self.get_ticker, markets, typed=typed)
+    
+    def get_orderbooks(self, markets: List[str], depth: int = 20, typed: bool = False) -> Dict[str, Any]:
+        """批量获取订单簿 (并发)"""
+        return self.fetch_many(self.get_orderbook, markets, depth=depth, typed=typed)
+    
+    def get_trades_batch(self, markets: List[str], limit: int = 100) -> Dict[str, Any]:
+        """批量获取最近成交 (并发)"""
+        return self.fetch_many(self.get_trades, markets, limit=limit)
+    
+    # 订阅：同一市场只有一个上游刷新，更新分发给所有订阅方；最后一个订阅关闭时停止
+    
+    def subscribe_ticker(
+        self,
+        market: str,
+        callback: Callable[[Dict[str, Any]], None],
+        interval: float = 0.5
+    ) -> Subscription:
+        """
+        订阅行情，变化时调用 callback(ticker)
+        
+        Args:
+            market: 市场名称
+            callback: 在后台线程中执行，耗时处理应转交队列
+            interval: 刷新间隔 (秒)，以首次订阅为准
+        
+        Returns:
+            订阅句柄，调用 close() 取消
+        """
+        if self._ticker_feed is None:
+            self._ticker_feed = MarketFeed(self, self._fetch_ticker, interval=interval, name="perp_ticker_feed")
+        return self._ticker_feed.subscribe(market, callback)
+    
+    def subscribe_orderbook(
+        self,
+        market: str,
+        callback: Callable[[Dict[str, Any]], None],
+        interval: float = 0.5
+    ) -> Subscription:
+        """
+        订阅订单簿 (默认深度)，变化时调用 callback(book)
+        
+        Args:
+            market: 市场名称
+            callback: 在后台线程中执行，耗时处理应转交队列
+            interval: 刷新间隔 (秒)，以首次订阅为准
+        
+        Returns:
+            订阅句柄，调用 close() 取消
+        """
+        if self._orderbook_feed is None:
+            self._orderbook_feed = MarketFeed(self, self.get_orderbook, interval=interval, name="perp_orderbook_feed")
+        return self._orderbook_feed.subscribe(market, callback)
+    
+    def subscribe_positions(
+        self,
+        market: str,
+        callback: Callable[[List[Dict[str, Any]]], None],
+        interval: float = 1.0
+    ) -> Subscription:
+        """
+        订阅单个市场的持仓，变化时调用 callback(positions)
+        
+        positions 为该市场的持仓列表 (无持仓时为空列表)，格式同 get_positions。
+        
+        Args:
+            market: 市场名称
+            callback: 在后台线程中执行，耗时处理应转交队列
+            interval: 刷新间隔 (秒)，以首次订阅为准
+        
+        Returns:
+            订阅句柄，调用 close() 取消
+        """
+        if self._positions_feed is None:
+            self._positions_feed = MarketFeed(
+                self, self._fetch_positions, interval=interval, name="perp_positions_feed"
+            )
+        return self._positions_feed.subscribe(market, callback)
+    
+    def _fetch_ticker(self, market: str) -> Dict[str, Any]:
+        # 绕过 get_ticker 的响应缓存，否则轮询拿到的是过期快照
+        return self._request("GET", f"/markets/{market}/ticker", auth_required=False)
+    
+    def _fetch_positions(self, market: str) -> List[Dict[str, Any]]:
+        # 绕过订单缓存，只保留该市场的持仓
+        positions = self._extract_data(self._request("GET", "/positions"))
+        return [p for p in positions if isinstance(p, dict) and p.get("market") == market]
     
     def get_klines(
         self,
@@ -61,16 +261,25 @@ class PerpModule(ModuleBase):
         interval: str = "1h",
         start_time: Optional[int] = None,
         end_time: Optional[int] = None,
-        limit: int = 500
-    ) -> List[Dict[str, Any]]:
-        """获取 K 线数据"""
-        params: Dict[str, Any] = {"interval": interval, "limit": limit}
-        if start_time:
-            params["start_time"] = start_time
-        if end_time:
-            params["end_time"] = end_time
+        limit: int = 500,
+        as_frame: bool = False,
+        typed: bool = False
+    ) -> Any:
+        """
+        获取 K 线数据
+        
+        Args:
+            as_frame: 为 True 时返回 pandas.DataFrame (逐列构造，不逐行转换)
+            typed: 为 True 时返回 List[Kline] 快照 (属性访问，无每行 dict)
+        """
+        params = self._compact(
+            interval=interval,
+            limit=limit,
+            start_time=start_time,
+            end_time=end_time
+        )
         result = self._request("GET", f"/markets/{market}/klines", params=params, auth_required=False)
-        return self._extract_data(result)
+        return self._extract_data(result, model=Kline if typed else None, as_frame=as_frame)
     
     def get_funding_rate(self, market: str) -> Dict[str, Any]:
         """获取当前资金费率"""
@@ -84,11 +293,7 @@ class PerpModule(ModuleBase):
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """获取资金费率历史"""
-        params: Dict[str, Any] = {"limit": limit}
-        if start_time:
-            params["start_time"] = start_time
-        if end_time:
-            params["end_time"] = end_time
+        params = self._compact(limit=limit, start_time=start_time, end_time=end_time)
         result = self._request("GET", f"/markets/{market}/funding-history", params=params, auth_required=False)
         return self._extract_data(result)
     
@@ -136,7 +341,66 @@ class PerpModule(ModuleBase):
             reduce_only: 只减仓
             post_only: 只做 Maker
             time_in_force: 有效期 (GTC/IOC/FOK)
-            client_order_id: 客户端订单 ID
+            client_order_id: 客户端订单 ID (30 秒内重复提交只下一次单)
+        """
+        data = self._build_order(
+            market, side, order_type, size, price, leverage,
+            reduce_only, post_only, time_in_force, client_order_id
+        )
+        if self._client.validate_orders:
+            self._validate("OrderRequest", data)
+        return self._place_once("/orders", data, client_order_id)
+    
+    def order_template(
+        self,
+        market: str,
+        order_type: str = "market",
+        price: Optional[str] = None,
+        leverage: Optional[int] = None,
+        reduce_only: bool = False,
+        post_only: bool = False,
+        time_in_force: str = "GTC"
+    ) -> PerpOrderTemplate:
+        """
+        创建下单模板 (同一市场重复下单场景，如策略调仓)
+        
+        Args:
+            market: 市场名称
+            order_type: 订单类型 (limit/market)
+            price: 价格 (限价单)
+            leverage: 杠杆倍数
+            reduce_only: 只减仓
+            post_only: 只做 Maker
+            time_in_force: 有效期 (GTC/IOC/FOK)
+        """
+        return PerpOrderTemplate(self, {
+            "market": market,
+            "order_type": order_type,
+            "price": price,
+            "leverage": leverage,
+            "reduce_only": reduce_only,
+            "post_only": post_only,
+            "time_in_force": time_in_force,
+        })
+    
+    @staticmethod
+    def _build_order(
+        market: str,
+        side: str,
+        order_type: str,
+        size: str,
+        price: Optional[str] = None,
+        leverage: Optional[int] = None,
+        reduce_only: bool = False,
+        post_only: bool = False,
+        time_in_force: str = "GTC",
+        client_order_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        构造下单请求体 (place_order 与批量下单共用)
+        
+        下单是最高频的调用，这里用字面量 dict + 条件赋值，
+        比 _compact(**kwargs) 少一次 kwargs dict 与推导式的分配 (约 4 倍)。
         """
         data: Dict[str, Any] = {
             "market": market,
@@ -147,47 +411,72 @@ class PerpModule(ModuleBase):
             "post_only": post_only,
             "time_in_force": time_in_force
         }
-        if price:
+        if price is not None:
             data["price"] = price
-        if leverage:
+        if leverage is not None:
             data["leverage"] = leverage
-        if client_order_id:
+        if client_order_id is not None:
             data["client_order_id"] = client_order_id
-        
-        return self._request("POST", "/orders", data=data)
+        return data
     
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """撤销订单"""
         return self._request("DELETE", f"/orders/{order_id}")
     
     def cancel_all_orders(self, market: Optional[str] = None) -> Dict[str, Any]:
-        """批量撤销订单"""
-        params = {}
-        if market:
-            params["market"] = market
-        return self._request("DELETE", "/orders", params=params)
+        """批量撤销订单 (一次请求；启用订单缓存时同步移除缓存挂单)"""
+        params = self._compact(market=market)
+        result = self._request("DELETE", "/orders", params=params)
+        if self._order_cache is not None:
+            self._order_cache.discard_orders(market)
+        return result
     
     def get_orders(
         self,
         market: Optional[str] = None,
         side: Optional[str] = None,
         limit: int = 100,
-        cursor: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """获取当前订单"""
-        params: Dict[str, Any] = {"limit": limit}
-        if market:
-            params["market"] = market
-        if side:
-            params["side"] = side
-        if cursor:
-            params["cursor"] = cursor
+        cursor: Optional[str] = None,
+        typed: bool = False
+    ) -> Union[List[Dict[str, Any]], List[Order]]:
+        """获取当前订单 (typed=True 返回 List[Order])"""
+        params = self._compact(limit=limit, market=market, side=side, cursor=cursor)
         result = self._request("GET", "/orders", params=params)
-        return self._extract_data(result)
+        return self._extract_data(result, model=Order if typed else None)
+    
+    def get_order(self, order_id: str, typed: bool = False) -> Union[Dict[str, Any], Order]:
+        """获取订单详情 (启用订单缓存时优先读取缓存；typed=True 返回 Order 快照)"""
+        result = None
+        if self._order_cache is not None:
+            order = self._order_cache.get_order(order_id)
+            if order is not None:
+                result = {"success": True, "data": order}
+        if result is None:
+            result = self._request("GET", f"/orders/{order_id}")
+        if typed:
+            return self._extract_data(result, model=Order)
+        return result
+    
+    def enable_order_cache(self, interval: float = 1.0) -> OrderCache:
+        """
+        启用订单/持仓缓存
+        
+        后台线程每 interval 秒批量刷新挂单与持仓，get_order / get_positions
+        命中缓存时不再发送请求。推送源可通过返回的 OrderCache.apply_* 写入更新。
+        
+        Args:
+            interval: 刷新间隔 (秒)
+        """
+        if self._order_cache is None:
+            self._order_cache = OrderCache(self, interval=interval)
+        self._order_cache.start()
+        return self._order_cache
     
-    def get_order(self, order_id: str) -> Dict[str, Any]:
-        """获取订单详情"""
-        return self._request("GET", f"/orders/{order_id}")
+    def disable_order_cache(self) -> None:
+        """停止并移除订单缓存"""
+        if self._order_cache is not None:
+            self._order_cache.stop()
+            self._order_cache = None
     
     def update_order(
         self,
@@ -196,9 +485,7 @@ class PerpModule(ModuleBase):
         size: Optional[str] = None
     ) -> Dict[str, Any]:
         """修改订单"""
-        data: Dict[str, Any] = {"price": price}
-        if size:
-            data["size"] = size
+        data = self._compact(price=price, size=size)
         return self._request("PUT", f"/orders/{order_id}", data=data)
     
     def batch_place_orders(self, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -214,13 +501,26 @@ class PerpModule(ModuleBase):
     # ========== 持仓 (Positions) ==========
     
     def get_positions(self, market: Optional[str] = None) -> List[Dict[str, Any]]:
-        """获取所有持仓"""
+        """获取所有持仓 (启用订单缓存时优先读取缓存)"""
+        if self._order_cache is not None:
+            positions = self._order_cache.get_positions(market)
+            if positions is not None:
+                return positions
         result = self._request("GET", "/positions")
         return self._extract_data(result)
     
-    def get_position(self, market: str) -> Dict[str, Any]:
-        """获取单个市场持仓"""
-        return self._request("GET", f"/positions/{market}")
+    def get_position(self, market: str, typed: bool = False) -> Union[Dict[str, Any], PerpPosition]:
+        """
+        获取单个市场持仓
+        
+        Args:
+            market: 市场名称
+            typed: 为 True 时返回 PerpPosition 快照
+        """
+        result = self._request("GET", f"/positions/{market}")
+        if typed:
+            return self._extract_data(result, model=PerpPosition)
+        return result
     
     def close_position(
         self,
@@ -230,11 +530,7 @@ class PerpModule(ModuleBase):
         order_type: str = "market"
     ) -> Dict[str, Any]:
         """平仓"""
-        data: Dict[str, Any] = {"type": order_type}
-        if size:
-            data["size"] = size
-        if price:
-            data["price"] = price
+        data = self._compact(type=order_type, size=size, price=price)
         return self._request("POST", f"/positions/{market}/close", data=data)
     
     def get_leverage(self, market: str) -> Dict[str, Any]:
@@ -260,14 +556,12 @@ class PerpModule(ModuleBase):
         stop_loss_type: str = "market"
     ) -> Dict[str, Any]:
         """设置止盈止损"""
-        data: Dict[str, Any] = {
-            "take_profit_type": take_profit_type,
-            "stop_loss_type": stop_loss_type
-        }
-        if take_profit_price:
-            data["take_profit_price"] = take_profit_price
-        if stop_loss_price:
-            data["stop_loss_price"] = stop_loss_price
+        data = self._compact(
+            take_profit_type=take_profit_type,
+            stop_loss_type=stop_loss_type,
+            take_profit_price=take_profit_price,
+            stop_loss_price=stop_loss_price
+        )
         return self._request("POST", f"/positions/{market}/tpsl", data=data)
     
     def modify_tpsl(
@@ -277,18 +571,12 @@ class PerpModule(ModuleBase):
         stop_loss_price: Optional[str] = None
     ) -> Dict[str, Any]:
         """修改止盈止损"""
-        data: Dict[str, Any] = {}
-        if take_profit_price:
-            data["take_profit_price"] = take_profit_price
-        if stop_loss_price:
-            data["stop_loss_price"] = stop_loss_price
+        data = self._compact(take_profit_price=take_profit_price, stop_loss_price=stop_loss_price)
         return self._request("PUT", f"/positions/{market}/tpsl", data=data)
     
     def cancel_tpsl(self, market: str, tpsl_type: Optional[str] = None) -> Dict[str, Any]:
         """取消止盈止损"""
-        params = {}
-        if tpsl_type:
-            params["type"] = tpsl_type
+        params = self._compact(type=tpsl_type)
         return self._request("DELETE", f"/positions/{market}/tpsl", params=params)
     
     # ========== 历史数据 (History) ==========
@@ -304,19 +592,15 @@ class PerpModule(ModuleBase):
         cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """获取历史订单"""
-        params: Dict[str, Any] = {"limit": limit}
-        if market:
-            params["market"] = market
-        if side:
-            params["side"] = side
-        if status:
-            params["status"] = status
-        if start_time:
-            params["start_time"] = start_time
-        if end_time:
-            params["end_time"] = end_time
-        if cursor:
-            params["cursor"] = cursor
+        params = self._compact(
+            limit=limit,
+            market=market,
+            side=side,
+            status=status,
+            start_time=start_time,
+            end_time=end_time,
+            cursor=cursor
+        )
         result = self._request("GET", "/orders/history", params=params)
         return self._extract_data(result)
     
@@ -330,20 +614,51 @@ class PerpModule(ModuleBase):
         cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """获取成交历史"""
-        params: Dict[str, Any] = {"limit": limit}
-        if market:
-            params["market"] = market
-        if order_id:
-            params["order_id"] = order_id
-        if start_time:
-            params["start_time"] = start_time
-        if end_time:
-            params["end_time"] = end_time
-        if cursor:
-            params["cursor"] = cursor
+        params = self._compact(
+            limit=limit,
+            market=market,
+            order_id=order_id,
+            start_time=start_time,
+            end_time=end_time,
+            cursor=cursor
+        )
         result = self._request("GET", "/trades", params=params)
         return self._extract_data(result)
     
+    def iter_order_history(
+        self,
+        market: Optional[str] = None,
+        side: Optional[str] = None,
+        status: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        page_size: int = 200
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐条遍历全部历史订单 (按 cursor 自动翻页)
+        
+        每次只持有一页；提前 break 时不再请求后续页。
+        
+        Example:
+            >>> for order in exchange.perp.iter_order_history(market="BTC-USDC"):
+            ...     if order["created_at"] < cutoff:
+            ...         break
+        """
+        params = self._compact(market=market, side=side, status=status, start_time=start_time, end_time=end_time)
+        return self._iter_pages("/orders/history", params, page_size)
+    
+    def iter_trade_history(
+        self,
+        market: Optional[str] = None,
+        order_id: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        page_size: int = 200
+    ) -> Iterator[Dict[str, Any]]:
+        """逐条遍历全部成交历史 (按 cursor 自动翻页)"""
+        params = self._compact(market=market, order_id=order_id, start_time=start_time, end_time=end_time)
+        return self._iter_pages("/trades", params, page_size)
+    
     def get_user_funding_history(
         self,
         market: Optional[str] = None,
@@ -352,13 +667,7 @@ class PerpModule(ModuleBase):
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """获取用户资金费历史"""
-        params: Dict[str, Any] = {"limit": limit}
-        if market:
-            params["market"] = market
-        if start_time:
-            params["start_time"] = start_time
-        if end_time:
-            params["end_time"] = end_time
+        params = self._compact(limit=limit, market=market, start_time=start_time, end_time=end_time)
         result = self._request("GET", "/funding/history", params=params)
         return self._extract_data(result)
     
@@ -374,15 +683,36 @@ class PerpModule(ModuleBase):
         end_time: Optional[int] = None
     ) -> Dict[str, Any]:
         """获取盈亏汇总"""
-        params: Dict[str, Any] = {}
-        if market:
-            params["market"] = market
-        if start_time:
-            params["start_time"] = start_time
-        if end_time:
-            params["end_time"] = end_time
+        params = self._compact(market=market, start_time=start_time, end_time=end_time)
         return self._request("GET", "/pnl", params=params)
     
+    # ========== 高级订单 - 列表/取消 (由 ROUTES 生成) ==========
+    
+    ROUTES = (
+        Route("get_twap_orders", "GET", "/orders/twap", "获取 TWAP 订单列表", extract=True),
+        Route("cancel_twap", "DELETE", "/orders/twap/{order_id}", "取消 TWAP 订单"),
+        Route("get_vwap_orders", "GET", "/orders/vwap", "获取 VWAP 订单列表", extract=True),
+        Route("cancel_vwap", "DELETE", "/orders/vwap/{order_id}", "取消 VWAP 订单"),
+        Route("get_oco_orders", "GET", "/orders/oco", "获取 OCO 订单列表", extract=True),
+        Route("cancel_oco", "DELETE", "/orders/oco/{order_id}", "取消 OCO 订单"),
+        Route("get_bracket_orders", "GET", "/orders/bracket", "获取 Bracket 订单列表", extract=True),
+        Route("cancel_bracket", "DELETE", "/orders/bracket/{order_id}", "取消 Bracket 订单"),
+        Route("get_iceberg_orders", "GET", "/orders/iceberg", "获取冰山订单列表", extract=True),
+        Route("cancel_iceberg", "DELETE", "/orders/iceberg/{order_id}", "取消冰山订单"),
+        Route("get_conditional_orders", "GET", "/orders/conditional", "获取条件订单列表", extract=True),
+        Route("cancel_conditional", "DELETE", "/orders/conditional/{order_id}", "取消条件订单"),
+        Route("get_scale_orders", "GET", "/orders/scale", "获取阶梯订单列表", extract=True),
+        Route("cancel_scale", "DELETE", "/orders/scale/{order_id}", "取消阶梯订单"),
+        Route("get_trailing_stop_orders", "GET", "/orders/trailing-stop", "获取追踪止损订单列表", extract=True),
+        Route("cancel_trailing_stop", "DELETE", "/orders/trailing-stop/{order_id}", "取消追踪止损订单"),
+        Route("get_pegged_orders", "GET", "/orders/pegged", "获取 Pegged 订单列表", extract=True),
+        Route("cancel_pegged", "DELETE", "/orders/pegged/{order_id}", "取消 Pegged 订单"),
+        Route("get_pov_orders", "GET", "/orders/pov", "获取 POV 订单列表", extract=True),
+        Route("cancel_pov", "DELETE", "/orders/pov/{order_id}", "取消 POV 订单"),
+        Route("get_sniper_orders", "GET", "/orders/sniper", "获取狙击订单列表", extract=True),
+        Route("cancel_sniper", "DELETE", "/orders/sniper/{order_id}", "取消狙击订单"),
+    )
+    
     # ========== 高级订单 - TWAP ==========
     
     def create_twap(
@@ -397,30 +727,18 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建 TWAP 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "total_size": total_size,
-            "duration_seconds": duration_seconds,
-            "reduce_only": reduce_only
-        }
-        if interval_seconds:
-            data["interval_seconds"] = interval_seconds
-        if slippage_tolerance:
-            data["slippage_tolerance"] = slippage_tolerance
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            total_size=total_size,
+            duration_seconds=duration_seconds,
+            reduce_only=reduce_only,
+            interval_seconds=interval_seconds,
+            slippage_tolerance=slippage_tolerance,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/twap", data=data)
     
-    def get_twap_orders(self) -> List[Dict[str, Any]]:
-        """获取 TWAP 订单列表"""
-        result = self._request("GET", "/orders/twap")
-        return self._extract_data(result)
-    
-    def cancel_twap(self, order_id: str) -> Dict[str, Any]:
-        """取消 TWAP 订单"""
-        return self._request("DELETE", f"/orders/twap/{order_id}")
-    
     # ========== 高级订单 - VWAP ==========
     
     def create_vwap(
@@ -435,30 +753,18 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建 VWAP 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "total_size": total_size,
-            "end_time": end_time,
-            "reduce_only": reduce_only
-        }
-        if start_time:
-            data["start_time"] = start_time
-        if slippage_tolerance:
-            data["slippage_tolerance"] = slippage_tolerance
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            total_size=total_size,
+            end_time=end_time,
+            reduce_only=reduce_only,
+            start_time=start_time,
+            slippage_tolerance=slippage_tolerance,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/vwap", data=data)
     
-    def get_vwap_orders(self) -> List[Dict[str, Any]]:
-        """获取 VWAP 订单列表"""
-        result = self._request("GET", "/orders/vwap")
-        return self._extract_data(result)
-    
-    def cancel_vwap(self, order_id: str) -> Dict[str, Any]:
-        """取消 VWAP 订单"""
-        return self._request("DELETE", f"/orders/vwap/{order_id}")
-    
     # ========== 高级订单 - OCO ==========
     
     def create_oco(
@@ -474,32 +780,19 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建 OCO 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "tp_trigger_price": tp_trigger_price,
-            "sl_trigger_price": sl_trigger_price,
-            "reduce_only": reduce_only
-        }
-        if size:
-            data["size"] = size
-        if tp_limit_price:
-            data["tp_limit_price"] = tp_limit_price
-        if sl_limit_price:
-            data["sl_limit_price"] = sl_limit_price
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            tp_trigger_price=tp_trigger_price,
+            sl_trigger_price=sl_trigger_price,
+            reduce_only=reduce_only,
+            size=size,
+            tp_limit_price=tp_limit_price,
+            sl_limit_price=sl_limit_price,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/oco", data=data)
     
-    def get_oco_orders(self) -> List[Dict[str, Any]]:
-        """获取 OCO 订单列表"""
-        result = self._request("GET", "/orders/oco")
-        return self._extract_data(result)
-    
-    def cancel_oco(self, order_id: str) -> Dict[str, Any]:
-        """取消 OCO 订单"""
-        return self._request("DELETE", f"/orders/oco/{order_id}")
-    
     # ========== 高级订单 - Bracket ==========
     
     def create_bracket(
@@ -514,29 +807,18 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建 Bracket 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "size": size,
-            "take_profit_price": take_profit_price,
-            "stop_loss_price": stop_loss_price,
-            "entry_type": entry_type
-        }
-        if entry_price:
-            data["entry_price"] = entry_price
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            size=size,
+            take_profit_price=take_profit_price,
+            stop_loss_price=stop_loss_price,
+            entry_type=entry_type,
+            entry_price=entry_price,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/bracket", data=data)
     
-    def get_bracket_orders(self) -> List[Dict[str, Any]]:
-        """获取 Bracket 订单列表"""
-        result = self._request("GET", "/orders/bracket")
-        return self._extract_data(result)
-    
-    def cancel_bracket(self, order_id: str) -> Dict[str, Any]:
-        """取消 Bracket 订单"""
-        return self._request("DELETE", f"/orders/bracket/{order_id}")
-    
     # ========== 高级订单 - Iceberg ==========
     
     def create_iceberg(
@@ -551,28 +833,18 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建冰山订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "total_size": total_size,
-            "visible_size": visible_size,
-            "price": price,
-            "post_only": post_only,
-            "reduce_only": reduce_only
-        }
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            total_size=total_size,
+            visible_size=visible_size,
+            price=price,
+            post_only=post_only,
+            reduce_only=reduce_only,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/iceberg", data=data)
     
-    def get_iceberg_orders(self) -> List[Dict[str, Any]]:
-        """获取冰山订单列表"""
-        result = self._request("GET", "/orders/iceberg")
-        return self._extract_data(result)
-    
-    def cancel_iceberg(self, order_id: str) -> Dict[str, Any]:
-        """取消冰山订单"""
-        return self._request("DELETE", f"/orders/iceberg/{order_id}")
-    
     # ========== 高级订单 - Conditional ==========
     
     def create_conditional(
@@ -589,32 +861,20 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建条件订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "size": size,
-            "trigger_price": trigger_price,
-            "order_type": order_type,
-            "trigger_price_type": trigger_price_type,
-            "reduce_only": reduce_only
-        }
-        if limit_price:
-            data["limit_price"] = limit_price
-        if slippage_tolerance:
-            data["slippage_tolerance"] = slippage_tolerance
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            size=size,
+            trigger_price=trigger_price,
+            order_type=order_type,
+            trigger_price_type=trigger_price_type,
+            reduce_only=reduce_only,
+            limit_price=limit_price,
+            slippage_tolerance=slippage_tolerance,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/conditional", data=data)
     
-    def get_conditional_orders(self) -> List[Dict[str, Any]]:
-        """获取条件订单列表"""
-        result = self._request("GET", "/orders/conditional")
-        return self._extract_data(result)
-    
-    def cancel_conditional(self, order_id: str) -> Dict[str, Any]:
-        """取消条件订单"""
-        return self._request("DELETE", f"/orders/conditional/{order_id}")
-    
     # ========== 高级订单 - Scale ==========
     
     def create_scale(
@@ -631,31 +891,20 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建阶梯订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "total_size": total_size,
-            "num_orders": num_orders,
-            "start_price": start_price,
-            "end_price": end_price,
-            "post_only": post_only,
-            "reduce_only": reduce_only
-        }
-        if size_skew:
-            data["size_skew"] = size_skew
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            total_size=total_size,
+            num_orders=num_orders,
+            start_price=start_price,
+            end_price=end_price,
+            post_only=post_only,
+            reduce_only=reduce_only,
+            size_skew=size_skew,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/scale", data=data)
     
-    def get_scale_orders(self) -> List[Dict[str, Any]]:
-        """获取阶梯订单列表"""
-        result = self._request("GET", "/orders/scale")
-        return self._extract_data(result)
-    
-    def cancel_scale(self, order_id: str) -> Dict[str, Any]:
-        """取消阶梯订单"""
-        return self._request("DELETE", f"/orders/scale/{order_id}")
-    
     # ========== 高级订单 - Trailing Stop ==========
     
     def create_trailing_stop(
@@ -670,29 +919,18 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建追踪止损订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "size": size,
-            "callback_rate": callback_rate,
-            "trigger_price_type": trigger_price_type,
-            "reduce_only": reduce_only
-        }
-        if activation_price:
-            data["activation_price"] = activation_price
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            size=size,
+            callback_rate=callback_rate,
+            trigger_price_type=trigger_price_type,
+            reduce_only=reduce_only,
+            activation_price=activation_price,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/trailing-stop", data=data)
     
-    def get_trailing_stop_orders(self) -> List[Dict[str, Any]]:
-        """获取追踪止损订单列表"""
-        result = self._request("GET", "/orders/trailing-stop")
-        return self._extract_data(result)
-    
-    def cancel_trailing_stop(self, order_id: str) -> Dict[str, Any]:
-        """取消追踪止损订单"""
-        return self._request("DELETE", f"/orders/trailing-stop/{order_id}")
-    
     # ========== 高级订单 - Pegged ==========
     
     def create_pegged(
@@ -709,32 +947,20 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建 Pegged 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "size": size,
-            "peg_type": peg_type,
-            "offset": offset,
-            "post_only": post_only,
-            "reduce_only": reduce_only
-        }
-        if min_price:
-            data["min_price"] = min_price
-        if max_price:
-            data["max_price"] = max_price
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            size=size,
+            peg_type=peg_type,
+            offset=offset,
+            post_only=post_only,
+            reduce_only=reduce_only,
+            min_price=min_price,
+            max_price=max_price,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/pegged", data=data)
     
-    def get_pegged_orders(self) -> List[Dict[str, Any]]:
-        """获取 Pegged 订单列表"""
-        result = self._request("GET", "/orders/pegged")
-        return self._extract_data(result)
-    
-    def cancel_pegged(self, order_id: str) -> Dict[str, Any]:
-        """取消 Pegged 订单"""
-        return self._request("DELETE", f"/orders/pegged/{order_id}")
-    
     # ========== 高级订单 - POV ==========
     
     def create_pov(
@@ -751,33 +977,20 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建 POV 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "total_size": total_size,
-            "participation_rate": participation_rate,
-            "max_duration_seconds": max_duration_seconds,
-            "reduce_only": reduce_only
-        }
-        if min_slice_size:
-            data["min_slice_size"] = min_slice_size
-        if max_slice_size:
-            data["max_slice_size"] = max_slice_size
-        if price_limit:
-            data["price_limit"] = price_limit
-        if leverage:
-            data["leverage"] = leverage
+        data = self._compact(
+            market=market,
+            side=side,
+            total_size=total_size,
+            participation_rate=participation_rate,
+            max_duration_seconds=max_duration_seconds,
+            reduce_only=reduce_only,
+            min_slice_size=min_slice_size,
+            max_slice_size=max_slice_size,
+            price_limit=price_limit,
+            leverage=leverage
+        )
         return self._request("POST", "/orders/pov", data=data)
     
-    def get_pov_orders(self) -> List[Dict[str, Any]]:
-        """获取 POV 订单列表"""
-        result = self._request("GET", "/orders/pov")
-        return self._extract_data(result)
-    
-    def cancel_pov(self, order_id: str) -> Dict[str, Any]:
-        """取消 POV 订单"""
-        return self._request("DELETE", f"/orders/pov/{order_id}")
-    
     # ========== 高级订单 - Sniper ==========
     
     def create_sniper(
@@ -794,30 +1007,16 @@ class PerpModule(ModuleBase):
         leverage: Optional[int] = None
     ) -> Dict[str, Any]:
         """创建狙击订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "size": size,
-            "sniper_type": sniper_type,
-            "reduce_only": reduce_only
-        }
-        if target_price:
-            data["target_price"] = target_price
-        if min_depth_qty:
-            data["min_depth_qty"] = min_depth_qty
-        if slippage_tolerance:
-            data["slippage_tolerance"] = slippage_tolerance
-        if max_wait_seconds:
-            data["max_wait_seconds"] = max_wait_seconds
-        if leverage:
-            data["leverage"] = leverage
-        return self._request("POST", "/orders/sniper", data=data)
-    
-    def get_sniper_orders(self) -> List[Dict[str, Any]]:
-        """获取狙击订单列表"""
-        result = self._request("GET", "/orders/sniper")
-        return self._extract_data(result)
-    
-    def cancel_sniper(self, order_id: str) -> Dict[str, Any]:
-        """取消狙击订单"""
-        return self._request("DELETE", f"/orders/sniper/{order_id}")
+        data = self._compact(
+            market=market,
+            side=side,
+            size=size,
+            sniper_type=sniper_type,
+            reduce_only=reduce_only,
+            target_price=target_price,
+            min_depth_qty=min_depth_qty,
+            slippage_tolerance=slippage_tolerance,
+            max_wait_seconds=max_wait_seconds,
+            leverage=leverage
+        )
+        return self._request("POST", "/orders/sniper", data=data)
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+AsyncPerpModule - 永续合约行情模块 (异步)
+
+PerpModule 行情接口的 async 版本，适合多市场轮询：
+- 每个读接口均为 async def，可被 asyncio.gather 并发调度
+- gather_* 辅助方法一次性拉取多个市场，N 个市场耗时约 1×RTT
+- poll_tickers 单任务轮询，结果推入 asyncio.Queue
+
+请求在客户端线程池中执行 (复用同一 requests.Session 的连接)，
+签名、重试与错误映射与同步接口完全一致。
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+from ._base import ModuleBase
+from ..snapshot import Orderbook, Ticker
+
+
+class AsyncPerpModule(ModuleBase):
+    """
+    永续合约行情模块 (异步)
+    
+    Example:
+        >>> exchange = Exchange1024ex()
+        >>> tickers = await exchange.async_perp.gather_tickers(["BTC-USDC", "ETH-USDC"], typed=True)
+        >>> tickers["BTC-USDC"].last
+    """
+    
+    PATH_PREFIX = "/api/v1/perp"
+    
+    __slots__ = ()
+    
+    # ========== 市场数据 (Market Data) ==========
+    
+    async def get_markets(self) -> List[Dict[str, Any]]:
+        """获取所有永续合约市场"""
+        result = await self._arequest("GET", "/markets", auth_required=False)
+        return self._extract_data(result)
+    
+    async def get_market(self, market: str) -> Dict[str, Any]:
+        """获取单个市场信息"""
+        return await self._arequest("GET", f"/markets/{market}", auth_required=False)
+    
+    async def get_ticker(self, market: str, typed: bool = False) -> Union[Dict[str, Any], Ticker]:
+        """获取 24h 行情 (typed=True 返回 Ticker 快照)"""
+        result = await self._arequest("GET", f"/markets/{market}/ticker", auth_required=False)
+        if typed:
+            return self._extract_data(result, model=Ticker)
+        return result
+    
+    async def get_orderbook(self, market: str, depth: int = 20, typed: bool = False) -> Union[Dict[str, Any], Orderbook]:
+        """获取订单簿 (typed=True 返回 Orderbook 快照)"""
+        params = {"depth": depth}
+        result = await self._arequest("GET", f"/markets/{market}/orderbook", params=params, auth_required=False)
+        if typed:
+            return self._extract_data(result, model=Orderbook)
+        return result
+    
+    async def get_trades(self, market: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """获取最近成交"""
+        params = {"limit": limit}
+        result = await self._arequest("GET", f"/markets/{market}/trades", params=params, auth_required=False)
+        return self._extract_data(result)
+    
+    async def get_klines(
+        self,
+        market: str,
+        interval: str = "1h",
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """获取 K 线数据"""
+        params = self._compact(
+            interval=interval,
+            limit=limit,
+            start_time=start_time,
+            end_time=end_time
+        )
+        result = await self._arequest("GET", f"/markets/{market}/klines", params=params, auth_required=False)
+        return self._extract_data(result)
+    
+    async def get_funding_rate(self, market: str) -> Dict[str, Any]:
+        """获取当前资金费率"""
+        return await self._arequest("GET", f"/markets/{market}/funding-rate", auth_required=False)
+    
+    async def get_mark_price(self, market: str) -> Dict[str, Any]:
+        """获取标记价格"""
+        return await self._arequest("GET", f"/markets/{market}/mark-price", auth_required=False)
+    
+    async def get_index_price(self, market: str) -> Dict[str, Any]:
+        """获取指数价格"""
+        return await self._arequest("GET", f"/markets/{market}/index-price", auth_required=False)
+    
+    async def get_open_interest(self, market: str) -> Dict[str, Any]:
+        """获取持仓量"""
+        return await self._arequest("GET", f"/markets/{market}/open-interest", auth_required=False)
+    
+    # ========== 批量并发 (Fan-out) ==========
+    
+    async def gather_tickers(self, markets: List[str], typed: bool = False) -> Dict[str, Any]:
+        """并发获取多个市场行情，返回 {market: ticker}"""
+        results = await asyncio.gather(*(self.get_ticker(m, typed=typed) for m in markets))
+        return dict(zip(markets, results))
+    
+    async def gather_orderbooks(self, markets: List[str], depth: int = 20, typed: bool = False) -> Dict[str, Any]:
+        """并发获取多个市场订单簿，返回 {market: orderbook}"""
+        results = await asyncio.gather(*(self.get_orderbook(m, depth, typed=typed) for m in markets))
+        return dict(zip(markets, results))
+    
+    async def gather_funding_rates(self, markets: List[str]) -> Dict[str, Any]:
+        """并发获取多个市场资金费率，返回 {market: funding_rate}"""
+        results = await asyncio.gather(*(self.get_funding_rate(m) for m in markets))
+        return dict(zip(markets, results))
+    
+    async def poll_tickers(
+        self,
+        markets: List[str],
+        queue: "asyncio.Queue[Dict[str, Any]]",
+        interval: float = 1.0,
+        typed: bool = False
+    ) -> None:
+        """
+        持续轮询多个市场行情，每轮结果 ({market: ticker}) 推入 queue
+        
+        单个轮询任务，每轮一次 gather；sleep 在 gather 之外，
+        轮询周期 = max(interval, 最慢请求耗时)，抖动不随市场数增长。
+        取消任务即可停止。
+        
+        Args:
+            markets: 市场列表
+            queue: 接收结果的 asyncio.Queue
+            interval: 两轮之间的最短间隔 (秒)
+            typed: 为 True 时推送 Ticker 快照
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await queue.put(await self.gather_tickers(markets, typed=typed))
+            await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
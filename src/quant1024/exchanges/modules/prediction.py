@@ -11,8 +11,44 @@ PredictionModule - 预测市场模块
 实现接口: IMarketData, ITrading
 """
 
-from typing import Any, Dict, List, Optional
-from ._base import ModuleBase
+from operator import index
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+from ._base import ModuleBase, Route, cached
+from ..streaming import MarketFeed, Subscription
+from ...utils import fastjson
+
+if TYPE_CHECKING:
+    from .loader import AsyncLoader
+    from ..exchange_1024ex import Exchange1024ex
+
+
+class OrderTemplate:
+    """
+    固定市场/方向/结果的下单模板 (由 PredictionModule.order_template 创建)
+    
+    请求体的固定部分只序列化一次，submit 时只格式化价格与数量两个整数，
+    生成的字节与 place_order 完全一致。
+    
+    Example:
+        >>> bid = exchange.prediction.order_template(market_id=123, side=0, outcome_index=0)
+        >>> bid.submit(price_e6=650000, amount=10)
+    """
+    
+    __slots__ = ("_module", "_endpoint", "_body")
+    
+    def __init__(self, module: "PredictionModule", endpoint: str, fixed: Dict[str, int]) -> None:
+        self._module = module
+        self._endpoint = endpoint
+        # {"market_id":1,"side":0,"outcome_index":0,"price_e6":%d,"amount":%d}
+        self._body = fastjson.dumps(fixed)[:-1] + b',"price_e6":%d,"amount":%d}'
+    
+    def body(self, price_e6: int, amount: int) -> bytes:
+        """生成请求体 (非整数参数抛出 TypeError)"""
+        return self._body % (index(price_e6), index(amount))
+    
+    def submit(self, price_e6: int, amount: int) -> Dict[str, Any]:
+        """按模板下单"""
+        return self._module._request_raw("POST", self._endpoint, self._body % (index(price_e6), index(amount)))
 
 
 class PredictionModule(ModuleBase):
@@ -29,6 +65,41 @@ class PredictionModule(ModuleBase):
     
     PATH_PREFIX = "/api/v1/prediction"
     
+    __slots__ = ("_orderbook_feed",)
+    
+    # 批量读取内部已在线程池并发，不再生成异步版本 (避免占用同一线程池等待自身)
+    SYNC_ONLY = (
+        "orderbook_loader", "order_template", "subscribe_orderbook", "unsubscribe_orderbook",
+        "batch_get_markets", "batch_get_stats", "batch_get_orderbooks",
+    )
+    
+    # 只有路径参数的接口，类创建时生成方法
+    ROUTES = (
+        # 市场发现
+        Route("list_categories", "GET", "/categories", "获取分类列表", auth_required=False, cache_ttl=300),
+        # 市场详情
+        Route("get_market", "GET", "/markets/{market_id}", "获取市场详情", auth_required=False, cache_ttl=30),
+        Route("get_market_stats", "GET", "/markets/{market_id}/stats", "获取市场统计", auth_required=False, cache_ttl=5),
+        Route("get_market_outcomes", "GET", "/markets/{market_id}/outcomes", "获取市场结果选项 (多结果市场)", auth_required=False),
+        Route("get_all_depths", "GET", "/markets/{market_id}/all-depths", "获取所有结果的深度", auth_required=False),
+        Route("get_price_balance", "GET", "/markets/{market_id}/price-balance", "获取价格平衡 (CTF 约束检查)", auth_required=False),
+        Route("get_market_match_stats", "GET", "/markets/{market_id}/match-stats", "获取市场撮合统计", auth_required=False),
+        # 用户数据
+        Route("get_my_positions", "GET", "/me/positions", "获取我的持仓"),
+        Route("get_my_stats", "GET", "/me/stats", "获取我的统计数据"),
+        # Oracle
+        Route("get_oracle_config", "GET", "/markets/{market_id}/oracle-config", "获取 Oracle 配置",
+              auth_required=False, arg_types=(("market_id", "int"),)),
+        Route("get_proposal", "GET", "/markets/{market_id}/proposal", "获取当前提案",
+              auth_required=False, arg_types=(("market_id", "int"),)),
+        Route("get_research", "GET", "/markets/{market_id}/research", "获取 LLM Oracle 研究数据",
+              auth_required=False, arg_types=(("market_id", "int"),)),
+    )
+    
+    def __init__(self, client: "Exchange1024ex") -> None:
+        super().__init__(client)
+        self._orderbook_feed: Optional[MarketFeed] = None
+    
     # ========== 市场发现 (Discovery) ==========
     
     def list_markets(
@@ -41,22 +112,23 @@ class PredictionModule(ModuleBase):
         page_size: int = 20
     ) -> Dict[str, Any]:
         """获取市场列表"""
-        params: Dict[str, Any] = {"page": page, "page_size": page_size}
-        if status:
-            params["status"] = status
-        if category:
-            params["category"] = category
-        if market_type:
-            params["market_type"] = market_type
-        if creator:
-            params["creator"] = creator
+        params = self._compact(
+            page=page,
+            page_size=page_size,
+            status=status,
+            category=category,
+            market_type=market_type,
+            creator=creator
+        )
         return self._request("GET", "/markets", params=params, auth_required=False)
     
+    @cached(ttl=10)
     def list_active_markets(self, limit: int = 50) -> Dict[str, Any]:
         """获取活跃市场"""
         params = {"limit": limit}
         return self._request("GET", "/markets/active", params=params, auth_required=False)
     
+    @cached(ttl=10)
     def list_trending_markets(self, limit: int = 50) -> Dict[str, Any]:
         """获取热门市场 (按交易量)"""
         params = {"limit": limit}
@@ -77,10 +149,7 @@ class PredictionModule(ModuleBase):
         params = {"q": query, "limit": limit}
         return self._request("GET", "/search", params=params, auth_required=False)
     
-    def list_categories(self) -> Dict[str, Any]:
-        """获取分类列表"""
-        return self._request("GET", "/categories", auth_required=False)
-    
+    @cached(ttl=60)
     def list_tags(self, limit: int = 50) -> Dict[str, Any]:
         """获取热门标签"""
         params = {"limit": limit}
@@ -88,31 +157,54 @@ class PredictionModule(ModuleBase):
     
     # ========== 市场详情 (Markets) ==========
     
-    def get_market(self, market_id: str) -> Dict[str, Any]:
-        """获取市场详情"""
-        return self._request("GET", f"/markets/{market_id}", auth_required=False)
-    
-    def get_market_stats(self, market_id: str) -> Dict[str, Any]:
-        """获取市场统计"""
-        return self._request("GET", f"/markets/{market_id}/stats", auth_required=False)
-    
-    def get_market_outcomes(self, market_id: str) -> Dict[str, Any]:
-        """获取市场结果选项 (多结果市场)"""
-        return self._request("GET", f"/markets/{market_id}/outcomes", auth_required=False)
-    
     def get_market_orderbook(self, market_id: str) -> Dict[str, Any]:
-        """获取市场订单簿"""
+        """获取市场订单簿 (已订阅时读取本地快照)"""
+        feed = self._orderbook_feed
+        if feed is not None:
+            book = feed.get(market_id)
+            if book is not None:
+                return book
+        return self._fetch_orderbook(market_id)
+    
+    def _fetch_orderbook(self, market_id: str) -> Dict[str, Any]:
         return self._request("GET", f"/markets/{market_id}/orderbook", auth_required=False)
     
+    def subscribe_orderbook(
+        self,
+        market_id: str,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        interval: float = 0.5
+    ) -> Subscription:
+        """
+        订阅订单簿，变化时回调
+        
+        所有订阅共用一个后台线程，同一市场的多个订阅只刷新一次；订阅期间
+        get_market_orderbook 直接返回本地快照。最后一个订阅关闭时停止刷新。
+        
+        Args:
+            market_id: 市场 ID
+            callback: 订单簿变化时调用 callback(book)
+            interval: 刷新间隔 (秒)，以首次订阅为准
+        
+        Returns:
+            订阅句柄，调用 close() 取消
+        """
+        if self._orderbook_feed is None:
+            self._orderbook_feed = MarketFeed(
+                self, self._fetch_orderbook, interval=interval, name="prediction_orderbook_feed"
+            )
+        return self._orderbook_feed.subscribe(market_id, callback)
+    
+    def unsubscribe_orderbook(self, market_id: str, callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+        """取消订单簿订阅；callback 为 None 时移除该市场的全部订阅"""
+        if self._orderbook_feed is not None:
+            self._orderbook_feed.unsubscribe(market_id, callback)
+    
     def get_market_depth(self, market_id: str, outcome_index: int = 0) -> Dict[str, Any]:
         """获取市场深度"""
         params = {"outcome_index": outcome_index}
         return self._request("GET", f"/markets/{market_id}/depth", params=params, auth_required=False)
     
-    def get_all_depths(self, market_id: str) -> Dict[str, Any]:
-        """获取所有结果的深度"""
-        return self._request("GET", f"/markets/{market_id}/all-depths", auth_required=False)
-    
     def get_market_trades(self, market_id: str, limit: int = 50) -> Dict[str, Any]:
         """获取市场成交"""
         params = {"limit": limit}
@@ -143,26 +235,54 @@ class PredictionModule(ModuleBase):
         limit: int = 100
     ) -> Dict[str, Any]:
         """获取 K 线数据"""
-        params: Dict[str, Any] = {
-            "outcome_index": outcome_index,
-            "interval": interval,
-            "limit": limit
-        }
-        if start_time:
-            params["start_time"] = start_time
-        if end_time:
-            params["end_time"] = end_time
+        params = self._compact(
+            outcome_index=outcome_index,
+            interval=interval,
+            limit=limit,
+            start_time=start_time,
+            end_time=end_time
+        )
         return self._request("GET", f"/markets/{market_id}/klines", params=params, auth_required=False)
     
-    def get_price_balance(self, market_id: str) -> Dict[str, Any]:
-        """获取价格平衡 (CTF 约束检查)"""
-        return self._request("GET", f"/markets/{market_id}/price-balance", auth_required=False)
-    
-    def batch_get_prices(self, market_ids: List[int]) -> Dict[str, Any]:
-        """批量获取市场价格"""
+    def batch_get_prices(self, market_ids: Sequence[int]) -> Dict[str, Any]:
+        """批量获取市场价格 (market_ids 可为 list、array.array 或 numpy 数组)"""
         data = {"market_ids": market_ids}
         return self._request("POST", "/markets/batch-prices", data=data, auth_required=False)
     
+    # 以下批量读取没有服务端聚合接口 (仅 batch-prices 有)，
+    # 在共享连接池上并发请求，返回 {market_id: 响应}
+    
+    def batch_get_markets(self, market_ids: List[str]) -> Dict[str, Any]:
+        """批量获取市场详情 (并发)"""
+        return self.fetch_many(self.get_market, market_ids)
+    
+    def batch_get_stats(self, market_ids: List[str]) -> Dict[str, Any]:
+        """批量获取市场统计 (并发)"""
+        return self.fetch_many(self.get_market_stats, market_ids)
+    
+    def batch_get_orderbooks(self, market_ids: List[str]) -> Dict[str, Any]:
+        """批量获取市场订单簿 (并发)"""
+        return self.fetch_many(self.get_market_orderbook, market_ids)
+    
+    def orderbook_loader(self, max_batch: int = 100, max_wait_ms: float = 1.0) -> "AsyncLoader":
+        """
+        订单簿请求合并器 (asyncio)
+        
+        同一窗口内多个协程的 load(market_id) 合并为一轮并发请求，
+        重复的 market_id 只请求一次。每个事件循环创建一个。
+        
+        Example:
+            >>> loader = exchange.prediction.orderbook_loader()
+            >>> book = await loader.load("123")
+        """
+        import asyncio
+        from .loader import AsyncLoader
+        
+        async def batch(market_ids: List[str]) -> Dict[str, Any]:
+            books = await asyncio.gather(*(self.aget_market_orderbook(m) for m in market_ids))
+            return dict(zip(market_ids, books))
+        return AsyncLoader(batch, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    
     # ========== 交易 (Trading) - 二元市场 ==========
     
     def mint(self, market_id: int, amount: int) -> Dict[str, Any]:
@@ -222,8 +342,29 @@ class PredictionModule(ModuleBase):
             "price_e6": price_e6,
             "amount": amount
         }
+        if self._client.validate_orders:
+            self._validate("PredictionOrderRequest", data)
         return self._request("POST", "/orders", data=data)
     
+    def order_template(
+        self,
+        market_id: int,
+        side: int,
+        outcome_index: int,
+        multi_outcome: bool = False
+    ) -> OrderTemplate:
+        """
+        创建下单模板 (做市等重复下单场景)
+        
+        Args:
+            market_id: 市场 ID
+            side: 0=买, 1=卖
+            outcome_index: 结果索引
+            multi_outcome: True 时走多结果市场下单接口
+        """
+        fixed = {"market_id": index(market_id), "side": index(side), "outcome_index": index(outcome_index)}
+        return OrderTemplate(self, "/multi-outcome/orders" if multi_outcome else "/orders", fixed)
+    
     def cancel_order(self, market_id: int, order_id: int) -> Dict[str, Any]:
         """取消订单"""
         data = {"market_id": market_id, "order_id": order_id}
@@ -231,13 +372,11 @@ class PredictionModule(ModuleBase):
     
     def cancel_all_orders(self, market_id: Optional[int] = None) -> Dict[str, Any]:
         """取消所有订单"""
-        data: Dict[str, Any] = {}
-        if market_id:
-            data["market_id"] = market_id
+        data = self._compact(market_id=market_id)
         return self._request("POST", "/orders/cancel-all", data=data)
     
-    def batch_cancel_orders(self, market_id: int, order_ids: List[int]) -> Dict[str, Any]:
-        """批量取消订单"""
+    def batch_cancel_orders(self, market_id: int, order_ids: Sequence[int]) -> Dict[str, Any]:
+        """批量取消订单 (order_ids 可为 list、array.array 或 numpy 数组)"""
         data = {"market_id": market_id, "order_ids": order_ids}
         return self._request("POST", "/orders/batch-cancel", data=data)
     
@@ -274,14 +413,12 @@ class PredictionModule(ModuleBase):
             "price_e6": price_e6,
             "amount": amount
         }
+        if self._client.validate_orders:
+            self._validate("PredictionOrderRequest", data)
         return self._request("POST", "/multi-outcome/orders", data=data)
     
     # ========== 用户数据 (User) ==========
     
-    def get_my_positions(self) -> Dict[str, Any]:
-        """获取我的持仓"""
-        return self._request("GET", "/me/positions")
-    
     def get_my_orders(
         self,
         market_id: Optional[int] = None,
@@ -289,11 +426,7 @@ class PredictionModule(ModuleBase):
         limit: int = 50
     ) -> Dict[str, Any]:
         """获取我的订单"""
-        params: Dict[str, Any] = {"limit": limit}
-        if market_id:
-            params["market_id"] = market_id
-        if status:
-            params["status"] = status
+        params = self._compact(limit=limit, market_id=market_id, status=status)
         return self._request("GET", "/me/orders", params=params)
     
     def get_my_trades(
@@ -302,9 +435,7 @@ class PredictionModule(ModuleBase):
         limit: int = 50
     ) -> Dict[str, Any]:
         """获取我的成交"""
-        params: Dict[str, Any] = {"limit": limit}
-        if market_id:
-            params["market_id"] = market_id
+        params = self._compact(limit=limit, market_id=market_id)
         return self._request("GET", "/me/trades", params=params)
     
     def get_my_matches(self, limit: int = 50) -> Dict[str, Any]:
@@ -312,10 +443,6 @@ class PredictionModule(ModuleBase):
         params = {"limit": limit}
         return self._request("GET", "/me/matches", params=params)
     
-    def get_my_stats(self) -> Dict[str, Any]:
-        """获取我的统计数据"""
-        return self._request("GET", "/me/stats")
-    
     def get_activity(self, limit: int = 50) -> Dict[str, Any]:
         """获取活动动态"""
         params = {"limit": limit}
@@ -326,24 +453,8 @@ class PredictionModule(ModuleBase):
         params = {"limit": limit}
         return self._request("GET", "/matches", params=params, auth_required=False)
     
-    def get_market_match_stats(self, market_id: str) -> Dict[str, Any]:
-        """获取市场撮合统计"""
-        return self._request("GET", f"/markets/{market_id}/match-stats", auth_required=False)
-    
     # ========== Oracle 相关 ==========
     
-    def get_oracle_config(self, market_id: int) -> Dict[str, Any]:
-        """获取 Oracle 配置"""
-        return self._request("GET", f"/markets/{market_id}/oracle-config", auth_required=False)
-    
-    def get_proposal(self, market_id: int) -> Dict[str, Any]:
-        """获取当前提案"""
-        return self._request("GET", f"/markets/{market_id}/proposal", auth_required=False)
-    
-    def get_research(self, market_id: int) -> Dict[str, Any]:
-        """获取 LLM Oracle 研究数据"""
-        return self._request("GET", f"/markets/{market_id}/research", auth_required=False)
-    
     def challenge_result(
         self,
         market_id: int,
@@ -351,12 +462,11 @@ class PredictionModule(ModuleBase):
         evidence_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """挑战结果"""
-        data: Dict[str, Any] = {
-            "market_id": market_id,
-            "challenger_outcome_index": challenger_outcome_index
-        }
-        if evidence_hash:
-            data["evidence_hash"] = evidence_hash
+        data = self._compact(
+            market_id=market_id,
+            challenger_outcome_index=challenger_outcome_index,
+            evidence_hash=evidence_hash
+        )
         return self._request("POST", "/oracle/challenges", data=data)
     
     def finalize_result(self, market_id: int) -> Dict[str, Any]:
@@ -11,8 +11,13 @@ SpotModule - 现货交易模块
 实现接口: IMarketData, ITrading
 """
 
-from typing import Any, Dict, List, Optional
-from ._base import ModuleBase
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Union
+from ._base import ModuleBase, Route
+from ..snapshot import Orderbook
+from ..streaming import MarketFeed, Subscription
+
+if TYPE_CHECKING:
+    from ..exchange_1024ex import Exchange1024ex
 
 
 class SpotModule(ModuleBase):
@@ -29,31 +34,107 @@ class SpotModule(ModuleBase):
     
     PATH_PREFIX = "/api/v1/spot"
     
-    # ========== 市场数据 (Market Data) ==========
-    
-    def get_markets(self) -> List[Dict[str, Any]]:
-        """获取所有现货市场"""
-        result = self._request("GET", "/markets", auth_required=False)
-        return self._extract_data(result)
-    
-    def get_market(self, market: str) -> Dict[str, Any]:
-        """获取单个市场信息"""
-        return self._request("GET", f"/markets/{market}", auth_required=False)
+    __slots__ = ("_ticker_feed", "_orderbook_feed")
+    
+    # 批量读取内部已在线程池并发，不再生成异步版本
+    SYNC_ONLY = (
+        "get_tickers", "get_orderbooks", "get_trades_batch",
+        "subscribe_ticker", "subscribe_orderbook", "iter_order_history",
+    )
+    
+    # 只有路径参数的接口，类创建时生成方法
+    ROUTES = (
+        # 市场数据
+        Route("get_markets", "GET", "/markets", "获取所有现货市场", auth_required=False, extract=True, cache_ttl=60),
+        Route("get_market", "GET", "/markets/{market}", "获取单个市场信息", auth_required=False, cache_ttl=60),
+        Route("get_ticker", "GET", "/markets/{market}/ticker", "获取 24h 行情", auth_required=False, cache_ttl=2),
+        Route("get_tokens", "GET", "/tokens", "获取所有代币信息", auth_required=False, extract=True),
+        Route("get_token", "GET", "/tokens/{symbol}", "获取单个代币信息", auth_required=False),
+        # 余额
+        Route("get_balances", "GET", "/balances", "获取所有代币余额"),
+        Route("get_balance", "GET", "/balances/{symbol}", "获取单个代币余额"),
+        # 交易
+        Route("cancel_order", "DELETE", "/orders/{order_id}", "撤销订单"),
+        Route("get_order", "GET", "/orders/{order_id}", "获取订单详情"),
+        # 高级订单 - 列表/取消
+        Route("get_conditional_orders", "GET", "/orders/conditional", "获取条件订单列表", extract=True),
+        Route("cancel_conditional", "DELETE", "/orders/conditional/{order_id}", "取消条件订单"),
+        Route("get_twap_orders", "GET", "/orders/twap", "获取 TWAP 订单列表", extract=True),
+        Route("cancel_twap", "DELETE", "/orders/twap/{order_id}", "取消 TWAP 订单"),
+        Route("get_vwap_orders", "GET", "/orders/vwap", "获取 VWAP 订单列表", extract=True),
+        Route("cancel_vwap", "DELETE", "/orders/vwap/{order_id}", "取消 VWAP 订单"),
+        Route("get_oco_orders", "GET", "/orders/oco", "获取 OCO 订单列表", extract=True),
+        Route("cancel_oco", "DELETE", "/orders/oco/{order_id}", "取消 OCO 订单"),
+        Route("get_iceberg_orders", "GET", "/orders/iceberg", "获取冰山订单列表", extract=True),
+        Route("cancel_iceberg", "DELETE", "/orders/iceberg/{order_id}", "取消冰山订单"),
+        Route("get_scale_orders", "GET", "/orders/scale", "获取阶梯订单列表", extract=True),
+        Route("cancel_scale", "DELETE", "/orders/scale/{order_id}", "取消阶梯订单"),
+        Route("get_pegged_orders", "GET", "/orders/pegged", "获取 Pegged 订单列表", extract=True),
+        Route("cancel_pegged", "DELETE", "/orders/pegged/{order_id}", "取消 Pegged 订单"),
+        Route("get_pov_orders", "GET", "/orders/pov", "获取 POV 订单列表", extract=True),
+        Route("cancel_pov", "DELETE", "/orders/pov/{order_id}", "取消 POV 订单"),
+    )
+    
+    def __init__(self, client: "Exchange1024ex") -> None:
+        super().__init__(client)
+        self._ticker_feed: Optional[MarketFeed] = None
+        self._orderbook_feed: Optional[MarketFeed] = None
     
-    def get_ticker(self, market: str) -> Dict[str, Any]:
-        """获取 24h 行情"""
-        return self._request("GET", f"/markets/{market}/ticker", auth_required=False)
+    # ========== 市场数据 (Market Data) ==========
     
-    def get_orderbook(self, market: str, depth: int = 20) -> Dict[str, Any]:
-        """获取订单簿"""
+    def get_orderbook(self, market: str, depth: int = 20, typed: bool = False) -> Union[Dict[str, Any], Orderbook]:
+        """获取订单簿 (typed=True 返回 Orderbook 快照，bids / asks 为 numpy 数组)"""
         params = {"depth": depth}
-        return self._request("GET", f"/markets/{market}/orderbook", params=params, auth_required=False)
+        result = self._request("GET", f"/markets/{market}/orderbook", params=params, auth_required=False)
+        if typed:
+            return self._extract_data(result, model=Orderbook)
+        return result
     
     def get_trades(self, market: str, limit: int = 100) -> List[Dict[str, Any]]:
         """获取最近成交"""
         result = self._request("GET", f"/markets/{market}/trades", auth_required=False)
         return self._extract_data(result)
     
+    # 批量读取：服务端没有多市场行情接口，在共享连接池上并发请求，返回 {market: 结果}
+    
+    def get_tickers(self, markets: List[str]) -> Dict[str, Any]:
+        """批量获取行情 (并发)"""
+        return self.fetch_many(self.get_ticker, markets)
+    
+    def get_orderbooks(self, markets: List[str], depth: int = 20, typed: bool = False) -> Dict[str, Any]:
+        """批量获取订单簿 (并发)"""
+        return self.fetch_many(self.get_orderbook, markets, depth=depth, typed=typed)
+    
+    def get_trades_batch(self, markets: List[str], limit: int = 100) -> Dict[str, Any]:
+        """批量获取最近成交 (并发)"""
+        return self.fetch_many(self.get_trades, markets, limit=limit)
+    
+    def subscribe_ticker(
+        self,
+        market: str,
+        callback: Callable[[Dict[str, Any]], None],
+        interval: float = 0.5
+    ) -> Subscription:
+        """订阅行情，变化时回调 (同一市场共享一次刷新，close() 取消)"""
+        if self._ticker_feed is None:
+            self._ticker_feed = MarketFeed(self, self._fetch_ticker, interval=interval, name="spot_ticker_feed")
+        return self._ticker_feed.subscribe(market, callback)
+    
+    def subscribe_orderbook(
+        self,
+        market: str,
+        callback: Callable[[Dict[str, Any]], None],
+        interval: float = 0.5
+    ) -> Subscription:
+        """订阅订单簿，变化时回调 (同一市场共享一次刷新，close() 取消)"""
+        if self._orderbook_feed is None:
+            self._orderbook_feed = MarketFeed(self, self.get_orderbook, interval=interval, name="spot_orderbook_feed")
+        return self._orderbook_feed.subscribe(market, callback)
+    
+    def _fetch_ticker(self, market: str) -> Dict[str, Any]:
+        # 绕过 get_ticker 的响应缓存
+        return self._request("GET", f"/markets/{market}/ticker", auth_required=False)
+    
     def get_klines(
         self,
         market: str,
@@ -66,25 +147,6 @@ class SpotModule(ModuleBase):
         result = self._request("GET", f"/markets/{market}/klines", auth_required=False)
         return self._extract_data(result)
     
-    def get_tokens(self) -> List[Dict[str, Any]]:
-        """获取所有代币信息"""
-        result = self._request("GET", "/tokens", auth_required=False)
-        return self._extract_data(result)
-    
-    def get_token(self, symbol: str) -> Dict[str, Any]:
-        """获取单个代币信息"""
-        return self._request("GET", f"/tokens/{symbol}", auth_required=False)
-    
-    # ========== 余额 (Balances) ==========
-    
-    def get_balances(self) -> Dict[str, Any]:
-        """获取所有代币余额"""
-        return self._request("GET", "/balances")
-    
-    def get_balance(self, symbol: str) -> Dict[str, Any]:
-        """获取单个代币余额"""
-        return self._request("GET", f"/balances/{symbol}")
-    
     # ========== 交易 (Trading) ==========
     
     def place_order(
@@ -111,45 +173,33 @@ class SpotModule(ModuleBase):
             quote_amount: 报价货币数量 (如 "买 100 USDC 的 BTC")
             post_only: 只做 Maker
             time_in_force: 有效期 (GTC/IOC/FOK)
-            client_order_id: 客户端订单 ID
+            client_order_id: 客户端订单 ID (30 秒内重复提交只下一次单)
         """
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "type": order_type,
-            "size": size,
-            "post_only": post_only,
-            "time_in_force": time_in_force
-        }
-        if price:
-            data["price"] = price
-        if quote_amount:
-            data["quote_amount"] = quote_amount
-        if client_order_id:
-            data["client_order_id"] = client_order_id
+        data = self._compact(
+            market=market,
+            side=side,
+            type=order_type,
+            size=size,
+            post_only=post_only,
+            time_in_force=time_in_force,
+            price=price,
+            quote_amount=quote_amount,
+            client_order_id=client_order_id
+        )
+        if self._client.validate_orders:
+            self._validate("SpotOrderRequest", data)
         
-        return self._request("POST", "/orders", data=data)
-    
-    def cancel_order(self, order_id: str) -> Dict[str, Any]:
-        """撤销订单"""
-        return self._request("DELETE", f"/orders/{order_id}")
+        return self._place_once("/orders", data, client_order_id)
     
     def cancel_all_orders(self, market: Optional[str] = None) -> Dict[str, Any]:
-        """批量撤销订单"""
-        params = {}
-        if market:
-            params["market"] = market
-        return self._request("DELETE", "/orders", params=params)
+        """批量撤销订单 (一次请求)"""
+        return self._request("DELETE", "/orders", params=self._compact(market=market))
     
     def get_orders(self, market: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """获取当前订单"""
         result = self._request("GET", "/orders")
         return self._extract_data(result)
     
-    def get_order(self, order_id: str) -> Dict[str, Any]:
-        """获取订单详情"""
-        return self._request("GET", f"/orders/{order_id}")
-    
     def update_order(
         self,
         order_id: str,
@@ -157,9 +207,7 @@ class SpotModule(ModuleBase):
         size: Optional[str] = None
     ) -> Dict[str, Any]:
         """修改订单"""
-        data: Dict[str, Any] = {"price": price}
-        if size:
-            data["size"] = size
+        data = self._compact(price=price, size=size)
         return self._request("PUT", f"/orders/{order_id}", data=data)
     
     def batch_place_orders(self, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -180,9 +228,14 @@ class SpotModule(ModuleBase):
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """获取历史订单"""
-        result = self._request("GET", "/orders/history")
+        params = self._compact(market=market, limit=limit)
+        result = self._request("GET", "/orders/history", params=params)
         return self._extract_data(result)
     
+    def iter_order_history(self, market: Optional[str] = None, page_size: int = 200) -> Iterator[Dict[str, Any]]:
+        """逐条遍历全部历史订单 (按 cursor 自动翻页)"""
+        return self._iter_pages("/orders/history", self._compact(market=market), page_size)
+    
     def get_trade_history(
         self,
         market: Optional[str] = None,
@@ -205,27 +258,17 @@ class SpotModule(ModuleBase):
         trigger_price_type: str = "last"
     ) -> Dict[str, Any]:
         """创建条件订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "size": size,
-            "trigger_price": trigger_price,
-            "order_type": order_type,
-            "trigger_price_type": trigger_price_type
-        }
-        if limit_price:
-            data["limit_price"] = limit_price
+        data = self._compact(
+            market=market,
+            side=side,
+            size=size,
+            trigger_price=trigger_price,
+            order_type=order_type,
+            trigger_price_type=trigger_price_type,
+            limit_price=limit_price
+        )
         return self._request("POST", "/orders/conditional", data=data)
     
-    def get_conditional_orders(self) -> List[Dict[str, Any]]:
-        """获取条件订单列表"""
-        result = self._request("GET", "/orders/conditional")
-        return self._extract_data(result)
-    
-    def cancel_conditional(self, order_id: str) -> Dict[str, Any]:
-        """取消条件订单"""
-        return self._request("DELETE", f"/orders/conditional/{order_id}")
-    
     # ========== 高级订单 - TWAP ==========
     
     def create_twap(
@@ -238,27 +281,16 @@ class SpotModule(ModuleBase):
         slippage_tolerance: Optional[float] = None
     ) -> Dict[str, Any]:
         """创建 TWAP 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "total_size": total_size,
-            "duration_seconds": duration_seconds
-        }
-        if interval_seconds:
-            data["interval_seconds"] = interval_seconds
-        if slippage_tolerance:
-            data["slippage_tolerance"] = slippage_tolerance
+        data = self._compact(
+            market=market,
+            side=side,
+            total_size=total_size,
+            duration_seconds=duration_seconds,
+            interval_seconds=interval_seconds,
+            slippage_tolerance=slippage_tolerance
+        )
         return self._request("POST", "/orders/twap", data=data)
     
-    def get_twap_orders(self) -> List[Dict[str, Any]]:
-        """获取 TWAP 订单列表"""
-        result = self._request("GET", "/orders/twap")
-        return self._extract_data(result)
-    
-    def cancel_twap(self, order_id: str) -> Dict[str, Any]:
-        """取消 TWAP 订单"""
-        return self._request("DELETE", f"/orders/twap/{order_id}")
-    
     # ========== 高级订单 - VWAP ==========
     
     def create_vwap(
@@ -271,27 +303,16 @@ class SpotModule(ModuleBase):
         slippage_tolerance: Optional[float] = None
     ) -> Dict[str, Any]:
         """创建 VWAP 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "total_size": total_size,
-            "end_time": end_time
-        }
-        if start_time:
-            data["start_time"] = start_time
-        if slippage_tolerance:
-            data["slippage_tolerance"] = slippage_tolerance
+        data = self._compact(
+            market=market,
+            side=side,
+            total_size=total_size,
+            end_time=end_time,
+            start_time=start_time,
+            slippage_tolerance=slippage_tolerance
+        )
         return self._request("POST", "/orders/vwap", data=data)
     
-    def get_vwap_orders(self) -> List[Dict[str, Any]]:
-        """获取 VWAP 订单列表"""
-        result = self._request("GET", "/orders/vwap")
-        return self._extract_data(result)
-    
-    def cancel_vwap(self, order_id: str) -> Dict[str, Any]:
-        """取消 VWAP 订单"""
-        return self._request("DELETE", f"/orders/vwap/{order_id}")
-    
     # ========== 高级订单 - OCO ==========
     
     def create_oco(
@@ -304,26 +325,16 @@ class SpotModule(ModuleBase):
         stop_limit_price: Optional[str] = None
     ) -> Dict[str, Any]:
         """创建 OCO 订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "size": size,
-            "limit_price": limit_price,
-            "stop_price": stop_price
-        }
-        if stop_limit_price:
-            data["stop_limit_price"] = stop_limit_price
+        data = self._compact(
+            market=market,
+            side=side,
+            size=size,
+            limit_price=limit_price,
+            stop_price=stop_price,
+            stop_limit_price=stop_limit_price
+        )
         return self._request("POST", "/orders/oco", data=data)
     
-    def get_oco_orders(self) -> List[Dict[str, Any]]:
-        """获取 OCO 订单列表"""
-        result = self._request("GET", "/orders/oco")
-        return self._extract_data(result)
-    
-    def cancel_oco(self, order_id: str) -> Dict[str, Any]:
-        """取消 OCO 订单"""
-        return self._request("DELETE", f"/orders/oco/{order_id}")
-    
     # ========== 高级订单 - Iceberg ==========
     
     def create_iceberg(
@@ -346,15 +357,6 @@ class SpotModule(ModuleBase):
         }
         return self._request("POST", "/orders/iceberg", data=data)
     
-    def get_iceberg_orders(self) -> List[Dict[str, Any]]:
-        """获取冰山订单列表"""
-        result = self._request("GET", "/orders/iceberg")
-        return self._extract_data(result)
-    
-    def cancel_iceberg(self, order_id: str) -> Dict[str, Any]:
-        """取消冰山订单"""
-        return self._request("DELETE", f"/orders/iceberg/{order_id}")
-    
     # ========== 高级订单 - Scale ==========
     
     def create_scale(
@@ -369,28 +371,18 @@ class SpotModule(ModuleBase):
         post_only: bool = False
     ) -> Dict[str, Any]:
         """创建阶梯订单"""
-        data: Dict[str, Any] = {
-            "market": market,
-            "side": side,
-            "total_size": total_size,
-            "num_orders": num_orders,
-            "start_price": start_price,
-            "end_price": end_price,
-            "post_only": post_only
-        }
-        if size_skew:
-            data["size_skew"] = size_skew
+        data = self._compact(
+            market=market,
+            side=side,
+            total_size=total_size,
+            num_orders=num_orders,
+            start_price=start_price,
+            end_price=end_price,
+            post_only=post_only,
+            size_skew=size_skew
+        )
         return self._request("POST", "/orders/scale", data=data)
     
-    def get_scale_orders(self) -> List[Dict[str, Any]]:
-        """获取阶梯订单列表"""
-        result = self._request("GET", "/orders/scale")
-        return self._extract_data(result)
-    
-    def cancel_scale(self, order_id: str) -> Dict[str, Any]:
-        """取消阶梯订单"""
-        return self._request("DELETE", f"/orders/scale/{order_id}")
-    
     # ========== 高级订单 - Pegged ==========
     
     def create_pegged(
@@ -413,15 +405,6 @@ class SpotModule(ModuleBase):
         }
         return self._request("POST", "/orders/pegged", data=data)
     
-    def get_pegged_orders(self) -> List[Dict[str, Any]]:
-        """获取 Pegged 订单列表"""
-        result = self._request("GET", "/orders/pegged")
-        return self._extract_data(result)
-    
-    def cancel_pegged(self, order_id: str) -> Dict[str, Any]:
-        """取消 Pegged 订单"""
-        return self._request("DELETE", f"/orders/pegged/{order_id}")
-    
     # ========== 高级订单 - POV ==========
     
     def create_pov(
@@ -441,12 +424,3 @@ class SpotModule(ModuleBase):
             "max_duration_seconds": max_duration_seconds
         }
         return self._request("POST", "/orders/pov", data=data)
-    
-    def get_pov_orders(self) -> List[Dict[str, Any]]:
-        """获取 POV 订单列表"""
-        result = self._request("GET", "/orders/pov")
-        return self._extract_data(result)
-    
-    def cancel_pov(self, order_id: str) -> Dict[str, Any]:
-        """取消 POV 订单"""
-        return self._request("DELETE", f"/orders/pov/{order_id}")
@@ -0,0 +1,78 @@
+"""
+Client-side rate limiting
+
+请求发送前按令牌桶节流，把突发流量摊平，避免触发服务端 429
+后整轮往返作废、再退避重试。
+
+- 进程内: 令牌桶 (单调时钟，线程安全)，令牌不足时预约并等待
+- 可选共享后端 (如 redis.Redis)，多进程按 1 秒窗口共享配额，
+  只需提供 incr(key) / expire(key, seconds) 两个方法，不引入 redis 依赖
+"""
+
+import threading
+import time
+from typing import Any, Optional
+
+
+class TokenBucket:
+    """
+    令牌桶限速器
+
+    Example:
+        >>> bucket = TokenBucket(rate=10, burst=20)
+        >>> bucket.acquire()  # 超出速率时阻塞到有令牌为止
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        backend: Optional[Any] = None,
+        key: str = ""
+    ) -> None:
+        """
+        Args:
+            rate: 每秒令牌数 (请求数)
+            burst: 桶容量，默认等于 rate
+            backend: 共享后端 (需支持 incr / expire)，None 表示仅进程内
+            key: 共享后端的 key 前缀，区分不同端点组/环境
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.backend = backend
+        self.key = key
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """取得一个令牌，必要时阻塞等待"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 允许透支：后到的调用方排在前面的预约之后
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        if self.backend is not None:
+            self._acquire_shared()
+
+    def _acquire_shared(self) -> None:
+        """在共享后端的当前 1 秒窗口内计数，超额时等到下一个窗口"""
+        while True:
+            now = time.time()
+            window = int(now)
+            key = f"quant1024:ratelimit:{self.key}:{window}"
+            try:
+                count = self.backend.incr(key)
+                if count == 1:
+                    self.backend.expire(key, 2)
+            except Exception:
+                return  # 后端不可用时仅按进程内限速
+            if count <= self.rate:
+                return
+            time.sleep(window + 1 - now)
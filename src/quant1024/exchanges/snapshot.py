@@ -0,0 +1,193 @@
+"""
+Lightweight snapshot records
+
+高频轮询接口 (ticker / position / kline / order / orderbook) 的轻量返回类型。
+使用 __slots__ + frozen dataclass：属性访问走固定偏移，且没有每实例 __dict__。
+订单簿按列存储 (bids / asks 为 (depth, 2) float64 数组)。
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List
+
+
+def _dec(payload: Dict[str, Any], *keys: str) -> Decimal:
+    """按顺序取第一个存在的字段并转为 Decimal（缺失时为 0）"""
+    for key in keys:
+        value = payload.get(key)
+        if value is not None and value != "":
+            return Decimal(str(value))
+    return Decimal(0)
+
+
+@dataclass(frozen=True)
+class Ticker:
+    """24h 行情快照"""
+    __slots__ = ("market", "last", "bid", "ask", "volume", "ts")
+
+    market: str
+    last: Decimal
+    bid: Decimal
+    ask: Decimal
+    volume: Decimal
+    ts: int
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Ticker":
+        """从 API 响应字典构建"""
+        return cls(
+            market=payload.get("market", ""),
+            last=_dec(payload, "last_price", "last"),
+            bid=_dec(payload, "bid", "best_bid"),
+            ask=_dec(payload, "ask", "best_ask"),
+            volume=_dec(payload, "volume_24h", "volume"),
+            ts=int(payload.get("timestamp") or payload.get("ts") or 0),
+        )
+
+
+@dataclass(frozen=True)
+class PerpPosition:
+    """永续合约持仓快照"""
+    __slots__ = ("market", "side", "size", "entry_price", "mark_price", "unrealized_pnl", "leverage")
+
+    market: str
+    side: str
+    size: Decimal
+    entry_price: Decimal
+    mark_price: Decimal
+    unrealized_pnl: Decimal
+    leverage: int
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "PerpPosition":
+        """从 API 响应字典构建"""
+        return cls(
+            market=payload.get("market", ""),
+            side=payload.get("side", ""),
+            size=_dec(payload, "size"),
+            entry_price=_dec(payload, "entry_price"),
+            mark_price=_dec(payload, "mark_price"),
+            unrealized_pnl=_dec(payload, "unrealized_pnl"),
+            leverage=int(payload.get("leverage") or 0),
+        )
+
+
+@dataclass(frozen=True)
+class Kline:
+    """K 线快照"""
+    __slots__ = ("ts", "open", "high", "low", "close", "volume")
+
+    ts: int
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    volume: Decimal
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Kline":
+        """从 API 响应字典构建"""
+        return cls(
+            ts=int(payload.get("timestamp") or payload.get("ts") or 0),
+            open=_dec(payload, "open"),
+            high=_dec(payload, "high"),
+            low=_dec(payload, "low"),
+            close=_dec(payload, "close"),
+            volume=_dec(payload, "volume"),
+        )
+
+
+@dataclass(frozen=True)
+class Order:
+    """订单快照"""
+    __slots__ = ("order_id", "market", "side", "order_type", "price", "size", "filled_size", "status")
+
+    order_id: str
+    market: str
+    side: str
+    order_type: str
+    price: Decimal
+    size: Decimal
+    filled_size: Decimal
+    status: str
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Order":
+        """从 API 响应字典构建"""
+        return cls(
+            order_id=str(payload.get("order_id", "")),
+            market=payload.get("market", ""),
+            side=payload.get("side", ""),
+            order_type=payload.get("order_type", ""),
+            price=_dec(payload, "price"),
+            size=_dec(payload, "size"),
+            filled_size=_dec(payload, "filled_size", "filled"),
+            status=payload.get("status", ""),
+        )
+
+
+def _levels(rows: List[Any]) -> Any:
+    """[[price, size], ...] 或 [{"price", "size"}, ...] 转为 (depth, 2) float64 数组"""
+    import numpy as np  # 延迟导入，不拖慢客户端 import
+    if rows and isinstance(rows[0], dict):
+        rows = [(row.get("price"), row.get("size")) for row in rows]
+    return np.array(rows, dtype=np.float64).reshape(-1, 2)
+
+
+@dataclass(frozen=True)
+class Orderbook:
+    """
+    订单簿快照 (按列存储)
+
+    bids / asks 为 (depth, 2) 的 float64 数组，列依次为价格、数量；
+    中间价、加权均价等计算是一次向量运算，不逐档遍历 dict。
+    """
+    __slots__ = ("market", "bids", "asks", "ts")
+
+    market: str
+    bids: Any
+    asks: Any
+    ts: int
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Orderbook":
+        """从 API 响应字典构建"""
+        return cls(
+            market=payload.get("market", ""),
+            bids=_levels(payload.get("bids") or []),
+            asks=_levels(payload.get("asks") or []),
+            ts=int(payload.get("timestamp") or payload.get("ts") or 0),
+        )
+
+    @property
+    def mid(self) -> float:
+        """中间价 (任一侧为空时为 nan)"""
+        if not len(self.bids) or not len(self.asks):
+            return float("nan")
+        return float(self.bids[0, 0] + self.asks[0, 0]) / 2
+
+    def vwap(self, side: str, depth: int = 0) -> float:
+        """
+        前 depth 档的成交量加权均价
+
+        Args:
+            side: "bids" 或 "asks"
+            depth: 档位数，0 表示全部
+        """
+        levels = self.bids if side == "bids" else self.asks
+        if depth:
+            levels = levels[:depth]
+        volume = levels[:, 1].sum()
+        return float(levels[:, 0] @ levels[:, 1] / volume) if volume else float("nan")
+
+    def imbalance(self, depth: int = 0) -> float:
+        """
+        前 depth 档的买卖量失衡 (bid - ask) / (bid + ask)，范围 [-1, 1]
+
+        Args:
+            depth: 档位数，0 表示全部
+        """
+        bids, asks = (self.bids[:depth], self.asks[:depth]) if depth else (self.bids, self.asks)
+        bid, ask = bids[:, 1].sum(), asks[:, 1].sum()
+        total = bid + ask
+        return float((bid - ask) / total) if total else 0.0
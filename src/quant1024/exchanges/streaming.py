@@ -0,0 +1,319 @@
+"""
+Streaming state caches
+
+本地缓存交易所状态 (订单、持仓、行情快照)，读取变为内存查找，不再逐次 REST 往返。
+
+数据来源与传输无关：
+- 内置后台线程按固定间隔批量刷新 (一次 get_orders 覆盖全部挂单)
+- 任何推送源 (如 WebSocket 频道) 可直接调用 apply_* 写入
+"""
+
+import logging
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional
+
+if TYPE_CHECKING:
+    from .modules._base import ModuleBase
+    from .modules.perp import PerpModule
+
+logger = logging.getLogger(__name__)
+
+
+class OrderCache:
+    """
+    订单/持仓缓存
+    
+    - 订单按 order_id 缓存，仅保存当前挂单；已成交/已撤单在下次刷新时移除，
+      查询会回退到 REST 以获取最终状态
+    - 持仓按 market 缓存；key 经 sys.intern 驻留，调用方同样驻留 market
+      (如策略初始化时 sys.intern("BTC-USDC")) 后，查找按指针命中，不再逐字节比较
+    
+    Example:
+        >>> cache = exchange.perp.enable_order_cache(interval=1.0)
+        >>> exchange.perp.get_order("order_123")   # 命中缓存时不发请求
+        >>> cache.stop()
+    """
+    
+    def __init__(self, perp: "PerpModule", interval: float = 1.0) -> None:
+        """
+        Args:
+            perp: 数据来源 PerpModule
+            interval: 后台刷新间隔 (秒)
+        """
+        self._perp = perp
+        self.interval = interval
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._positions: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    # ========== 写入 ==========
+    
+    def apply_order(self, order: Dict[str, Any]) -> None:
+        """写入一条订单更新 (推送源调用)"""
+        order_id = order.get("order_id")
+        if order_id is None:
+            return
+        with self._lock:
+            self._orders[order_id] = order
+    
+    def apply_position(self, position: Dict[str, Any]) -> None:
+        """写入一条持仓更新 (推送源调用)"""
+        market = position.get("market")
+        if market is None:
+            return
+        with self._lock:
+            if self._positions is None:
+                self._positions = {}
+            self._positions[sys.intern(market)] = position
+    
+    def discard_orders(self, market: Optional[str] = None) -> None:
+        """移除某个市场 (None 为全部) 的缓存挂单，用于批量撤单之后"""
+        with self._lock:
+            if market is None:
+                self._orders = {}
+            else:
+                self._orders = {k: o for k, o in self._orders.items() if o.get("market") != market}
+    
+    def refresh(self) -> None:
+        """通过 REST 全量刷新挂单与持仓"""
+        orders = self._perp.get_orders()
+        # 绕过 get_positions：缓存加载后它直接返回本缓存，持仓将不再刷新
+        positions = self._perp._extract_data(self._perp._request("GET", "/positions"))
+        with self._lock:
+            self._orders = {o["order_id"]: o for o in orders if isinstance(o, dict) and "order_id" in o}
+            self._positions = {
+                sys.intern(p["market"]): p for p in positions if isinstance(p, dict) and "market" in p
+            }
+    
+    # ========== 读取 ==========
+    
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """按 order_id 查找挂单，未命中返回 None"""
+        return self._orders.get(order_id)
+    
+    def get_positions(self, market: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """获取缓存持仓，尚未加载时返回 None"""
+        positions = self._positions
+        if positions is None:
+            return None
+        if market:
+            position = positions.get(market)
+            return [position] if position is not None else []
+        return list(positions.values())
+    
+    # ========== 后台刷新 ==========
+    
+    def start(self) -> None:
+        """启动后台刷新线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="perp_order_cache", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """停止后台刷新"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Order cache refresh failed: {e}")
+            self._stop.wait(self.interval)
+
+
+class Subscription:
+    """
+    订阅句柄 (由 MarketFeed.subscribe 返回)
+    
+    close() 只移除本订阅 (包括只维护快照的订阅)；同一 key 的其他订阅方与共享的后台刷新不受影响，
+    最后一个订阅关闭时后台线程自动停止。
+    """
+    
+    __slots__ = ("feed", "key", "callback")
+    
+    def __init__(self, feed: "MarketFeed", key: Hashable, callback: Optional[Callable[[Any], None]]) -> None:
+        self.feed = feed
+        self.key = key
+        self.callback = callback
+    
+    def close(self) -> None:
+        """取消订阅 (只移除本句柄，重复调用无副作用)"""
+        self.feed._remove(self)
+    
+    def __enter__(self) -> "Subscription":
+        return self
+    
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+
+class MarketFeed:
+    """
+    行情订阅 (变化时回调)
+    
+    后台线程按 interval 在共享连接池上并发刷新所有订阅的 key，
+    只有快照与上次不同时才回调，调用方得到推送语义而无需自己轮询。
+    
+    Example:
+        >>> sub = exchange.prediction.subscribe_orderbook("123", on_book)
+        >>> exchange.prediction.get_market_orderbook("123")   # 读取本地快照
+        >>> sub.close()
+    """
+    
+    def __init__(
+        self,
+        module: "ModuleBase",
+        fetch: Callable[[Any], Any],
+        interval: float = 0.5,
+        name: str = "market_feed"
+    ) -> None:
+        """
+        Args:
+            module: 发起请求的模块 (使用其 fetch_many 并发刷新)
+            fetch: 单个 key 的 REST 读取函数
+            interval: 后台刷新间隔 (秒)
+            name: 后台线程名
+        """
+        self._module = module
+        self._fetch = fetch
+        self.interval = interval
+        self.name = name
+        # 每个 key 的订阅句柄 (含只维护快照、callback 为 None 的订阅)；句柄为空时删除 key
+        self._subscriptions: Dict[Hashable, List[Subscription]] = {}
+        self._latest: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    # ========== 订阅 ==========
+    
+    def subscribe(self, key: Hashable, callback: Optional[Callable[[Any], None]] = None) -> Subscription:
+        """
+        订阅 key；callback 为 None 时只维护本地快照
+        
+        同一 key 的多个订阅共用一次上游刷新，更新按订阅顺序分发给各回调。
+        回调在后台线程中执行，耗时处理应转交队列 (如 queue.put_nowait)。
+        """
+        subscription = Subscription(self, key, callback)
+        with self._lock:
+            self._subscriptions.setdefault(key, []).append(subscription)
+            latest = self._latest.get(key)
+        self.start()
+        # 新订阅方立即收到当前快照，不必等下一轮变化
+        if callback is not None and latest is not None:
+            callback(latest)
+        return subscription
+    
+    def unsubscribe(self, key: Hashable, callback: Optional[Callable[[Any], None]] = None) -> None:
+        """
+        取消订阅；没有订阅时停止后台线程
+        
+        callback 为 None 时移除该 key 的全部订阅与快照；
+        否则只移除一个使用该回调的订阅，其他订阅 (含只维护快照的订阅) 不受影响。
+        """
+        with self._lock:
+            subscriptions = self._subscriptions.get(key)
+            if subscriptions is None:
+                return
+            if callback is None:
+                del subscriptions[:]
+            else:
+                for subscription in subscriptions:
+                    if subscription.callback == callback:
+                        subscriptions.remove(subscription)
+                        break
+        self._release(key)
+    
+    def _remove(self, subscription: Subscription) -> None:
+        """移除单个订阅句柄 (Subscription.close 调用)"""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.key)
+            if subscriptions is None:
+                return
+            for i, existing in enumerate(subscriptions):
+                if existing is subscription:
+                    del subscriptions[i]
+                    break
+        self._release(subscription.key)
+    
+    def _release(self, key: Hashable) -> None:
+        """key 没有剩余订阅时删除 key 与快照，全部 key 都没有订阅时停止后台线程"""
+        with self._lock:
+            if self._subscriptions.get(key) == []:
+                del self._subscriptions[key]
+                self._latest.pop(key, None)
+            idle = not self._subscriptions
+        if idle:
+            self.stop()
+    
+    def keys(self) -> List[Hashable]:
+        """当前订阅的 key"""
+        with self._lock:
+            return list(self._subscriptions)
+    
+    # ========== 写入 ==========
+    
+    def apply(self, key: Hashable, value: Any) -> None:
+        """写入一份快照 (推送源调用)，与上次不同时触发回调"""
+        with self._lock:
+            if key not in self._subscriptions or self._latest.get(key) == value:
+                return
+            self._latest[key] = value
+            callbacks = [s.callback for s in self._subscriptions[key] if s.callback is not None]
+        for callback in callbacks:
+            try:
+                callback(value)
+            except Exception as e:
+                logger.warning(f"Market feed callback failed for {key!r}: {e}")
+    
+    def refresh(self) -> None:
+        """通过 REST 并发刷新全部订阅"""
+        keys = self.keys()
+        if keys:
+            for key, value in self._module.fetch_many(self._fetch, keys).items():
+                self.apply(key, value)
+    
+    # ========== 读取 ==========
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """最新快照，未订阅或尚未加载时返回 None"""
+        return self._latest.get(key)
+    
+    # ========== 后台刷新 ==========
+    
+    def start(self) -> None:
+        """启动后台刷新线程 (并发调用只会启动一个线程)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and not self._stop.is_set():
+                return
+            # 每个线程持有自己的停止事件：已停止但尚未退出的旧线程不会被新的 start 唤醒
+            self._stop.set()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), name=self.name, daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        """停止后台刷新 (可在回调中调用，此时不等待后台线程退出)"""
+        with self._lock:
+            self._stop.set()
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+    
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Market feed refresh failed: {e}")
+            stop.wait(self.interval)
@@ -0,0 +1,125 @@
+"""
+HTTP transports for exchange clients
+
+默认使用 requests.Session (HTTP/1.1 keep-alive 连接池)。
+Http2Session 基于 httpx，在单个连接上多路复用并发请求，
+适合 async_perp 等大量并发行情轮询场景。
+
+select_fastest_endpoint 在启动时测量多个候选地址的往返延迟，选出最快的一个。
+
+安装: pip install quant1024[http2]
+"""
+
+import statistics
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import requests
+
+
+class Http2Session:
+    """
+    HTTP/2 会话 (httpx)
+    
+    提供与 requests.Session.request 相同的调用方式，
+    传输层异常转换为 requests.ConnectionError / requests.Timeout，
+    因此客户端的重试与错误处理逻辑无需改动。
+    
+    Example:
+        >>> exchange = Exchange1024ex(api_key="xxx", secret_key="xxx", http2=True)
+    """
+    
+    def __init__(self, max_connections: int = 32, keepalive_expiry: float = 60.0) -> None:
+        """
+        Args:
+            max_connections: 最大连接数 (同时也是保活连接数)
+            keepalive_expiry: 空闲连接保活时长 (秒)；httpx 默认 5 秒，
+                轮询间隔稍长就会重新握手
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "HTTP/2 传输需要 httpx 库\n"
+                "安装: pip install quant1024[http2]"
+            )
+        
+        self._httpx = httpx
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+    
+    @property
+    def headers(self) -> Any:
+        """默认请求头"""
+        return self._client.headers
+    
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[bytes] = None,
+        timeout: Union[None, float, Tuple[float, float]] = None
+    ) -> Any:
+        """发送请求，返回 httpx.Response (status_code/headers/content/text 与 requests 一致)"""
+        if isinstance(timeout, tuple):
+            # requests 风格 (connect, read)
+            timeout = self._httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            return self._client.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                content=data,
+                timeout=timeout
+            )
+        except self._httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+    
+    def close(self) -> None:
+        """关闭连接"""
+        self._client.close()
+
+
+def select_fastest_endpoint(endpoints: Sequence[str], samples: int = 5, timeout: float = 2.0) -> str:
+    """
+    选出往返延迟最低的候选地址
+    
+    每个地址在一个保活连接上发送 samples 次 HEAD 请求，首次 (含 TCP/TLS 握手) 不计入，
+    其余取中位数后比较。无法连接的地址被排除；全部失败时返回第一个地址。
+    
+    Args:
+        endpoints: 候选 base_url 列表 (如不同区域的接入点)
+        samples: 每个地址的探测次数
+        timeout: 单次探测超时 (秒)
+    
+    Example:
+        >>> base_url = select_fastest_endpoint(["https://api.1024ex.com", "https://other-region.example"])
+    """
+    if not endpoints:
+        raise ValueError("endpoints must not be empty")
+    best, best_rtt = endpoints[0], float("inf")
+    for url in endpoints:
+        rtts = []
+        with requests.Session() as session:
+            try:
+                for _ in range(max(samples, 2)):
+                    start = time.perf_counter()
+                    session.head(url, timeout=timeout)
+                    rtts.append(time.perf_counter() - start)
+            except requests.RequestException:
+                continue
+        rtt = statistics.median(rtts[1:])
+        if rtt < best_rtt:
+            best, best_rtt = url, rtt
+    return best
@@ -3,24 +3,31 @@
 
 使用 Python Protocol 定义统一接口，实现接口隔离原则 (ISP)。
 不同模块实现相同接口，上层代码只依赖接口而非具体实现。
+接口仅用于静态类型检查，不支持 isinstance；运行时需要判断时
+直接检查方法 (如 hasattr(obj, "place_order"))。
 
 Interfaces:
 - IMarketData: 市场数据接口
+- ISubscription: 行情订阅句柄
 - ITrading: 交易接口
 - IPositions: 持仓接口
 - IAdvancedOrders: 高级订单接口
+- IMarketDataCodec: 响应解码接口 (sans-I/O)
 """
 
-from .market_data import IMarketData
+from .market_data import IMarketData, ISubscription
 from .trading import ITrading
 from .positions import IPositions
 from .advanced_orders import IAdvancedOrders
+from .codecs import IMarketDataCodec
 
 __all__ = [
     "IMarketData",
+    "ISubscription",
     "ITrading",
     "IPositions",
     "IAdvancedOrders",
+    "IMarketDataCodec",
 ]
 
 
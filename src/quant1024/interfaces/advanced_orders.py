@@ -4,10 +4,10 @@ IAdvancedOrders - 高级订单接口
 定义高级订单类型的标准接口，包括 TWAP、VWAP、OCO、Bracket、Iceberg 等。
 """
 
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Protocol
 
 
-@runtime_checkable
 class IAdvancedOrders(Protocol):
     """
     高级订单接口
@@ -36,7 +36,9 @@ class IAdvancedOrders(Protocol):
         side: str,
         total_size: str,
         duration_seconds: int,
-        **kwargs: Any
+        *,
+        interval_seconds: Optional[int] = None,
+        slippage_tolerance: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         创建 TWAP 订单 (时间加权平均价格)
@@ -48,7 +50,8 @@ class IAdvancedOrders(Protocol):
             side: 方向 (buy/sell)
             total_size: 总数量
             duration_seconds: 执行时长 (秒)
-            **kwargs: interval_seconds, slippage_tolerance, reduce_only 等
+            interval_seconds: 子订单间隔 (秒，可选)
+            slippage_tolerance: 滑点容忍度 (可选)
         
         Returns:
             TWAP 订单信息
@@ -70,9 +73,10 @@ class IAdvancedOrders(Protocol):
         market: str,
         side: str,
         total_size: str,
-        duration_seconds: int,
-        participation_rate: float,
-        **kwargs: Any
+        end_time: int,
+        *,
+        start_time: Optional[int] = None,
+        slippage_tolerance: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         创建 VWAP 订单 (成交量加权平均价格)
@@ -83,8 +87,9 @@ class IAdvancedOrders(Protocol):
             market: 市场符号
             side: 方向
             total_size: 总数量
-            duration_seconds: 执行时长
-            participation_rate: 参与率 (0.0-1.0)
+            end_time: 结束时间戳 (毫秒)
+            start_time: 开始时间戳 (毫秒，默认立即开始)
+            slippage_tolerance: 滑点容忍度 (可选)
         
         Returns:
             VWAP 订单信息
@@ -180,9 +185,10 @@ class IAdvancedOrders(Protocol):
         market: str,
         side: str,
         total_size: str,
-        display_size: str,
+        visible_size: str,
         price: str,
-        **kwargs: Any
+        *,
+        post_only: bool = False
     ) -> Dict[str, Any]:
         """
         创建冰山订单
@@ -193,8 +199,9 @@ class IAdvancedOrders(Protocol):
             market: 市场符号
             side: 方向
             total_size: 总数量 (隐藏)
-            display_size: 显示数量
+            visible_size: 显示数量
             price: 价格
+            post_only: 只做 Maker
         
         Returns:
             冰山订单信息
@@ -0,0 +1,50 @@
+"""
+IMarketDataCodec - 响应解码接口
+
+把响应字节解码为快照的纯函数接口 (sans-I/O)，与 IMarketData 的传输职责分离。
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, List, Protocol, Union
+
+if TYPE_CHECKING:
+    from ..exchanges.snapshot import Kline, Order, Orderbook, PerpPosition, Ticker
+
+
+class IMarketDataCodec(Protocol):
+    """
+    市场数据解码接口
+    
+    输入为完整的响应体 (bytes 或 str)，不做任何 I/O。
+    
+    Implementations:
+        - JsonMarketDataCodec: 1024ex JSON 响应
+    
+    Example:
+        >>> def replay(codec: IMarketDataCodec, frames: list[bytes]) -> list[float]:
+        ...     return [float(codec.decode_ticker(f).last) for f in frames]
+    """
+    
+    def decode_ticker(self, buf: Union[bytes, str]) -> Ticker:
+        """解码行情响应"""
+        ...
+    
+    def decode_orderbook(self, buf: Union[bytes, str]) -> Orderbook:
+        """解码订单簿响应 (bids / asks 为 numpy 数组)"""
+        ...
+    
+    def decode_klines(self, buf: Union[bytes, str]) -> List[Kline]:
+        """解码 K 线响应"""
+        ...
+    
+    def decode_trades(self, buf: Union[bytes, str]) -> List[Dict[str, Any]]:
+        """解码成交响应"""
+        ...
+    
+    def decode_order(self, buf: Union[bytes, str]) -> Order:
+        """解码订单响应"""
+        ...
+    
+    def decode_position(self, buf: Union[bytes, str]) -> PerpPosition:
+        """解码持仓响应"""
+        ...
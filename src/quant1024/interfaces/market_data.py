@@ -4,10 +4,23 @@ IMarketData - 市场数据接口
 定义获取市场数据的标准接口，所有提供市场数据的模块都应实现此接口。
 """
 
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Protocol
+
+
+class ISubscription(Protocol):
+    """
+    行情订阅句柄
+    
+    同一 (频道, 市场) 的多个订阅共享一个上游数据源，
+    close() 只移除自身；最后一个订阅关闭时上游随之释放。
+    """
+    
+    def close(self) -> None:
+        """取消订阅"""
+        ...
 
 
-@runtime_checkable
 class IMarketData(Protocol):
     """
     市场数据接口
@@ -92,6 +105,44 @@ class IMarketData(Protocol):
         """
         ...
     
+    def get_tickers(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取行情
+        
+        Args:
+            symbols: 市场符号列表
+        
+        Returns:
+            {symbol: 行情数据}，按 symbols 顺序
+        """
+        ...
+    
+    def get_orderbooks(self, symbols: List[str], depth: int = 20) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取订单簿
+        
+        Args:
+            symbols: 市场符号列表
+            depth: 深度档位数量 (默认 20)
+        
+        Returns:
+            {symbol: 订单簿数据}
+        """
+        ...
+    
+    def get_trades_batch(self, symbols: List[str], limit: int = 50) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        批量获取最近成交记录
+        
+        Args:
+            symbols: 市场符号列表
+            limit: 每个市场的返回数量限制
+        
+        Returns:
+            {symbol: 成交记录列表}
+        """
+        ...
+    
     def get_klines(
         self,
         symbol: str,
@@ -114,7 +165,37 @@ class IMarketData(Protocol):
             K线数据列表，每条包含 open, high, low, close, volume, timestamp
         """
         ...
-
-
-
-
+    
+    def subscribe_ticker(
+        self,
+        symbol: str,
+        callback: Callable[[Dict[str, Any]], None]
+    ) -> ISubscription:
+        """
+        订阅行情推送
+        
+        Args:
+            symbol: 市场符号
+            callback: 行情变化时调用 callback(ticker)
+        
+        Returns:
+            订阅句柄
+        """
+        ...
+    
+    def subscribe_orderbook(
+        self,
+        symbol: str,
+        callback: Callable[[Dict[str, Any]], None]
+    ) -> ISubscription:
+        """
+        订阅订单簿推送
+        
+        Args:
+            symbol: 市场符号
+            callback: 订单簿变化时调用 callback(book)
+        
+        Returns:
+            订阅句柄
+        """
+        ...
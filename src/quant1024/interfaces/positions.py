@@ -4,10 +4,10 @@ IPositions - 持仓接口
 定义持仓管理的标准接口，适用于保证金交易（永续合约等）。
 """
 
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Protocol
 
 
-@runtime_checkable
 class IPositions(Protocol):
     """
     持仓接口
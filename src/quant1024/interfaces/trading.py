@@ -4,10 +4,10 @@ ITrading - 交易接口
 定义交易操作的标准接口，所有提供交易功能的模块都应实现此接口。
 """
 
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Protocol
 
 
-@runtime_checkable
 class ITrading(Protocol):
     """
     交易接口
@@ -36,18 +36,26 @@ class ITrading(Protocol):
         order_type: str,
         size: str,
         price: Optional[str] = None,
-        **kwargs: Any
+        *,
+        post_only: bool = False,
+        time_in_force: str = "GTC",
+        client_order_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         下单
         
+        参数全部显式声明 (不用 **kwargs)，高频调用时不额外分配 kwargs 字典；
+        各实现可追加自有参数 (如永续合约的 leverage, reduce_only)。
+        
         Args:
             market: 市场符号
             side: 方向 (buy/sell 或 long/short)
             order_type: 订单类型 (limit/market)
             size: 数量
             price: 价格 (限价单必填)
-            **kwargs: 其他参数 (reduce_only, post_only, time_in_force 等)
+            post_only: 只做 Maker
+            time_in_force: 有效方式 (GTC/IOC/FOK)
+            client_order_id: 客户端订单 ID
         
         Returns:
             订单信息，包含 order_id, status 等字段
@@ -73,6 +81,8 @@ class ITrading(Protocol):
         """
         批量撤销订单
         
+        实现应调用交易所的批量撤单接口 (一次请求)，不应先查询挂单再逐个撤销。
+        
         Args:
             market: 市场符号 (可选，不填则撤销所有市场的订单)
         
@@ -144,6 +154,23 @@ class ITrading(Protocol):
         """
         ...
     
+    async def abatch_place_orders(
+        self,
+        orders: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        批量下单 (异步)
+        
+        整批订单一次请求发送，可与其他协程并发等待。
+        
+        Args:
+            orders: 订单列表
+        
+        Returns:
+            批量下单结果
+        """
+        ...
+    
     def get_order_history(
         self,
         market: Optional[str] = None,
@@ -161,6 +188,25 @@ class ITrading(Protocol):
         """
         ...
     
+    def iter_order_history(
+        self,
+        market: Optional[str] = None,
+        page_size: int = 200
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐条遍历全部历史订单
+        
+        实现按 cursor 翻页，每次只持有一页，调用方可提前结束。
+        
+        Args:
+            market: 市场符号 (可选)
+            page_size: 每页数量
+        
+        Returns:
+            历史订单迭代器
+        """
+        ...
+    
     def get_trade_history(
         self,
         market: Optional[str] = None,
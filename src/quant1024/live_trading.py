@@ -4,27 +4,119 @@ Live Trading Module - Start trading with your strategy in one function call
 让用户用最简单的方式开始实盘交易
 """
 
-import time
+import asyncio
+import gc
+import inspect
 import logging
+import os
 import sys
-from typing import Optional, Dict, Any, List
+import time
+import uuid
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
 from datetime import datetime
 
+import numpy as np
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - depends on environment
+    uvloop = None
+
+from . import _fastpath
 from .core import QuantStrategy
 from .exchanges import BaseExchange, Exchange1024ex
+from .exchanges.transport import select_fastest_endpoint
 from .exceptions import Quant1024Exception, InvalidParameterError
 from .monitor_feeds import RuntimeConfig, RuntimeReporter
 
 
-# 配置日志 - 输出到 stdout 以避免在 Railway 等平台上被标记为错误
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    stream=sys.stdout,  # 明确指定输出到 stdout
-    force=True  # 强制重新配置（防止被其他模块覆盖）
-)
 logger = logging.getLogger(__name__)
 
+# 状态日志中的信号显示文本（其余取值显示为 HOLD）
+_SIGNAL_STR = {1: "🟢 BUY", -1: "🔴 SELL"}
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """asctime 按秒缓存：同一秒内的日志只拼接毫秒部分，不再逐条调用 localtime / strftime"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = (None, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached = self._cached_second
+        if cached[0] != second:
+            cached = (second, time.strftime(self.default_time_format, self.converter(second)))
+            self._cached_second = cached
+        # 输出与 logging.Formatter 默认格式一致，如 2024-01-01 12:00:00,123
+        return self.default_msec_format % (cached[1], record.msecs)
+
+
+def configure_logging(level: int = logging.INFO):
+    """
+    配置日志 - 输出到 stdout 以避免在 Railway 等平台上被标记为错误
+    
+    start_trading 会自动调用；直接使用 LiveTrader 时可按需调用，
+    导入本模块不会修改 root logger。
+    
+    时间戳按秒缓存，降低推送驱动等高频循环中每条日志的开销。
+    
+    Args:
+        level: 日志级别（默认 INFO）
+    """
+    handler = logging.StreamHandler(sys.stdout)  # 明确指定输出到 stdout
+    handler.setFormatter(_CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logging.basicConfig(
+        level=level,
+        handlers=[handler],
+        force=True  # 强制重新配置（防止被其他模块覆盖）
+    )
+
+
+@dataclass(frozen=True)
+class TickState:
+    """单个 tick 的决策输入（构建一次后在下单、上报、日志间传递）"""
+    __slots__ = ("price", "position", "signal", "target")
+
+    price: float
+    position: float
+    signal: int
+    target: float
+
+
+def _parse_1024ex_ticker(ticker: Dict[str, Any]) -> float:
+    """1024ex 行情响应：{"success": true, "data": {"last_price": ...}}"""
+    return float(ticker['data']['last_price'])
+
+
+def _parse_1024ex_positions(positions: List[Dict[str, Any]]) -> Optional[float]:
+    """1024ex 持仓响应（已去掉 data 包装的列表），无持仓时返回 None"""
+    return float(positions[0].get('size', 0)) if positions else None
+
+
+def _parse_generic_ticker(ticker: Any) -> float:
+    """未知交易所的行情响应：兼容有无 data 包装两种格式"""
+    if not isinstance(ticker, dict):
+        return 0.0
+    # 如果有 'data' 字段，从 data 中获取
+    data = ticker['data'] if 'data' in ticker else ticker
+    return float(data.get('last_price', 0))
+
+
+def _parse_generic_positions(positions: Any) -> Optional[float]:
+    """未知交易所的持仓响应：兼容有无 data 包装两种格式，无持仓时返回 None"""
+    # 如果有 'data' 字段，从 data 中获取
+    if isinstance(positions, dict) and 'data' in positions:
+        positions = positions['data']
+    if positions and len(positions) > 0:
+        return float(positions[0].get('size', 0))
+    return None
+
 
 class LiveTrader:
     """
@@ -41,6 +133,8 @@ class LiveTrader:
     - 使用 BaseExchange 抽象接口，支持多个交易所
     - 只依赖 3 个核心方法：get_ticker, get_positions, place_order
     - 任何实现 BaseExchange 的交易所都可以使用
+    - 监控报告经 RuntimeReporter 的单个后台线程发送，复用同一保活连接，
+      不会为每次报告重新建立 TCP/TLS 连接
     """
     
     def __init__(
@@ -55,7 +149,14 @@ class LiveTrader:
         stop_loss: Optional[float] = None,
         take_profit: Optional[float] = None,
         # ========== 简化：只有一个参数 ==========
-        runtime_config: Optional[RuntimeConfig] = None
+        runtime_config: Optional[RuntimeConfig] = None,
+        cache_path: Optional[str] = None,
+        async_orders: bool = False,
+        skip_unchanged_price: bool = False,
+        history_length: int = 100,
+        log_every: int = 1,
+        gc_policy: str = "auto",
+        subscribe_positions: bool = False
     ):
         """
         初始化实盘交易器
@@ -73,7 +174,36 @@ class LiveTrader:
             runtime_config: Runtime 监控配置
                 - 如果提供，自动启用监控
                 - 如果为 None，不启用监控
+            cache_path: 价格历史缓存目录（可选）
+                - 按 (market, check_interval) 保存到 .npz 文件，重启后直接恢复，跳过预热
+                - 最新数据点早于 10 个 check_interval 时视为过期，整体丢弃
+            async_orders: 后台下单（默认 False）
+                - True 时下单请求在后台执行，交易循环不等待订单返回，止损止盈检查不被延迟
+                - 代价：当前 tick 内拿不到成交确认；订单返回前不会再下新单，
+                  持仓在订单返回后才更新
+            skip_unchanged_price: 价格与持仓都和上个 tick 相同时复用上次信号（默认 False）
+                - 适合计算代价高的策略；前提是策略只依赖价格变化，
+                  不依赖窗口长度或重复价格的个数
+            history_length: 价格历史窗口长度（默认 100），缓冲区按此一次性分配
+            log_every: 每 N 次迭代输出一次状态日志（默认 1，即每次都输出）
+                - 推送驱动或 check_interval 很短时调大，减少日志开销
+            gc_policy: 垃圾回收策略（"auto" 或 "manual"，默认 "auto"）
+                - "manual"：运行期间关闭自动 GC，启动时 gc.freeze() 冻结已有对象，
+                  每个 tick 结束后回收第 0 代，每 1000 个 tick 完整回收一次，
+                  GC 停顿不会落在下单路径中；运行结束后恢复
+            subscribe_positions: 1024ex 持仓订阅（默认 False）
+                - 1024ex 没有持仓推送，订阅是后台线程按 REST 轮询；True 时以持仓缓存的
+                  刷新周期轮询，请求数不变，只是把持仓刷新移出交易路径
+                - 其他交易所提供 subscribe_positions 推送时始终自动订阅，不受此参数影响
         """
+        if history_length < 10:
+            raise InvalidParameterError("history_length 不能小于 10（信号至少需要 10 个数据点）")
+        if gc_policy not in ("auto", "manual"):
+            raise InvalidParameterError(f"gc_policy 只能是 'auto' 或 'manual': {gc_policy!r}")
+        # 声明增量信号却未实现 update 时在构造时报错，而不是在每个 tick 记录错误并返回 HOLD
+        if getattr(strategy, "supports_incremental", False) and type(strategy).update is QuantStrategy.update:
+            raise InvalidParameterError(f"{type(strategy).__name__} 设置了 supports_incremental，但未实现 update()")
+        
         self.strategy = strategy
         self.exchange = exchange
         self.market = market
@@ -81,16 +211,83 @@ class LiveTrader:
         self.max_position_size = max_position_size
         self.check_interval = check_interval
         self.max_slippage = max_slippage
+        # 止损止盈比例以 float 保存 (0.0 表示不启用)，每个 tick 直接传给 check_sl_tp
         self.stop_loss = stop_loss
         self.take_profit = take_profit
+        self.async_orders = async_orders
+        # 每笔订单不变的字段，下单时只补 side / size / client_order_id
+        self._order_template = {"market": market, "order_type": "market"}  # 使用市价单快速成交
+        # 1024ex: 固定字段预先序列化，下单时只拼接变化的字段；其他交易所下单时再调用 place_order
+        self._submit_order = None
+        if isinstance(exchange, Exchange1024ex):
+            self._submit_order = exchange.perp.order_template(**self._order_template).submit
+        self.skip_unchanged_price = skip_unchanged_price
+        # 上个 tick 的 (价格, 持仓, 信号)，用于 skip_unchanged_price
+        self._last_tick = (None, None, 0)
+        self._pending_order: Optional[asyncio.Future] = None
+        # 下单请求发出到返回之间为 True，期间忽略持仓推送（以订单结果为准）
+        self._order_in_flight = False
+        # 每笔订单返回后加一：推送收到后、应用前有订单返回时，推送是成交前的快照
+        self._order_seq = 0
+        # start_async 运行期间的事件循环：推送线程的持仓回调转交到这里执行
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # 响应格式由交易所决定，构造时选定解析函数，每个 tick 不再判断格式
+        if isinstance(exchange, Exchange1024ex):
+            self._parse_ticker = _parse_1024ex_ticker
+            self._parse_positions = _parse_1024ex_positions
+        else:
+            self._parse_ticker = _parse_generic_ticker
+            self._parse_positions = _parse_generic_positions
+        # 策略提供向量化信号函数时，每个 tick 直接用它计算最新信号
+        self._signal_core = getattr(strategy, "_vectorized_core", None)
+        # 默认向 generate_signals 传入 list；策略声明 supports_ndarray 时传入只读视图
+        self._signal_input_ndarray = bool(getattr(strategy, "supports_ndarray", False))
+        # 增量策略：每个新价格 O(1) 更新状态，信号直接取最近一次 update 的结果
+        self._incremental = bool(getattr(strategy, "supports_incremental", False))
+        self._strategy_state = strategy.init_state() if self._incremental else None
+        self._incremental_signal = 0
+        
+        # 每笔交易都要用到的风控常量，参数变更时通过 set_capital() 重新计算
+        self._max_order_value = initial_capital * max_position_size
+        self._min_trade_size = _fastpath.MIN_TRADE_SIZE
+        
+        # 持仓缓存 (size, monotonic 时间)：持仓通常只在本进程下单后变化，
+        # 下单成功后直接更新，其余情况每 _position_ttl 秒向交易所刷新一次。
+        # 代价：TTL 内的外部变动（手动下单、强平）最多延迟 _position_ttl 秒才被发现
+        self._position_cache = (0.0, float("-inf"))
+        self._position_ttl = max(5 * check_interval, 60)
+        # 交易路径上的持仓刷新周期；持仓由 1024ex 轮询订阅刷新时不再在交易路径上刷新
+        self._position_refresh = self._position_ttl
+        self._subscribe_positions = subscribe_positions
+        self._position_subscription = None
         
         # 运行状态
         self.is_running = False
         self.current_position = 0.0  # 当前持仓大小
         self.entry_price = 0.0       # 入场价格
         self.trades_count = 0         # 交易次数
-        self.price_history = []       # 价格历史（用于生成信号）
-        self.history_length = 100     # 保留的历史数据长度
+        self.tick_overruns = 0        # 单次循环耗时超过 check_interval 的次数
+        self._iteration = 0
+        self._log_every = max(1, log_every)
+        self._manual_gc = gc_policy == "manual"
+        self._gc_ticks = 0
+        self.history_length = history_length  # 保留的历史数据长度（构造后不可修改）
+        # 价格历史环形缓冲（价格与时间戳两列并行存放）：容量为 2 倍窗口，
+        # 窗口始终连续，写到末尾时才整体搬回开头（每 history_length 次一次）
+        self._prices = np.empty(2 * self.history_length, dtype=np.float64)
+        self._ts = np.empty(2 * self.history_length, dtype=np.int64)  # 毫秒
+        self._start = 0
+        self._count = 0
+        
+        # 价格历史磁盘缓存：每 _cache_every 次更新写一次，停止时再写一次
+        self._cache_file = None
+        self._cache_every = 10
+        self._updates_since_save = 0
+        if cache_path:
+            safe_market = market.replace("/", "_")
+            self._cache_file = os.path.join(cache_path, f"{safe_market}_{check_interval}.npz")
+            self._load_price_cache()
         
         # ========== 简化：Runtime 监控 ==========
         self.runtime_config = runtime_config
@@ -115,8 +312,9 @@ class LiveTrader:
                     self.runtime_reporter = None
             except Exception as e:
                 logger.error(
-                    f"❌ Runtime 初始化错误: {e}，"
-                    f"监控功能已禁用，交易将继续进行"
+                    "❌ Runtime 初始化错误: %s，"
+                    "监控功能已禁用，交易将继续进行",
+                    e
                 )
                 self.runtime_reporter = None
         
@@ -125,56 +323,119 @@ class LiveTrader:
             strategy.initialize()
         
         logger.info(
-            f"LiveTrader 初始化完成: "
-            f"策略={strategy.name}, 市场={market}, "
-            f"监控={'启用' if self.runtime_reporter else '禁用'}"
+            "LiveTrader 初始化完成: "
+            "策略=%s, 市场=%s, 监控=%s",
+            strategy.name,
+            market,
+            '启用' if self.runtime_reporter else '禁用'
         )
     
     def start(self, max_iterations: Optional[int] = None):
         """
-        开始实盘交易
+        开始实盘交易（阻塞直到停止，内部运行 start_async）
+        
+        Args:
+            max_iterations: 最大迭代次数（用于测试，None表示无限运行）
+        """
+        try:
+            # 安装 uvloop 时用其事件循环运行（只作用于本次运行，不修改全局事件循环策略）
+            run = uvloop.run if uvloop is not None else asyncio.run
+            run(self.start_async(max_iterations))
+        except KeyboardInterrupt:
+            if self.is_running:
+                logger.info("\n收到停止信号，正在安全退出...")
+                self.stop()
+    
+    async def start_async(self, max_iterations: Optional[int] = None):
+        """
+        开始实盘交易（协程版本，可与其他协程运行在同一事件循环中）
+        
+        每个 tick 内行情与持仓并发获取，监控上报在后台执行，不阻塞交易路径。
+        交易所提供 stream_ticker(market) 异步迭代器时改由推送驱动，
+        推送中断或结束后回退到按 check_interval 轮询。
         
         Args:
             max_iterations: 最大迭代次数（用于测试，None表示无限运行）
         """
         self.is_running = True
-        iteration = 0
+        self._iteration = 0
+        self._loop = asyncio.get_running_loop()
+        
+        # 交易所提供持仓推送时，用推送更新持仓缓存；REST 仅作为 TTL 内无推送时的校准
+        subscribe_positions = getattr(self.exchange, "subscribe_positions", None)
+        if subscribe_positions is not None and self._position_subscription is None:
+            try:
+                if not isinstance(self.exchange, Exchange1024ex):
+                    self._position_subscription = subscribe_positions(self.market, self._on_positions)
+                elif self._subscribe_positions:
+                    # 1024ex 的订阅是 REST 轮询：间隔取持仓 TTL，并由它代替交易路径上的刷新
+                    self._position_subscription = subscribe_positions(
+                        self.market, self._on_positions, interval=self._position_ttl
+                    )
+                    self._position_refresh = float("inf")
+            except Exception as e:
+                logger.warning("订阅持仓失败，改为定时刷新: %s", e)
         
         logger.info("=" * 60)
         logger.info("🚀 开始实盘交易")
-        logger.info(f"策略: {self.strategy.name}")
-        logger.info(f"市场: {self.market}")
-        logger.info(f"初始资金: ${self.initial_capital}")
-        logger.info(f"检查间隔: {self.check_interval}秒")
+        logger.info("策略: %s", self.strategy.name)
+        logger.info("市场: %s", self.market)
+        logger.info("初始资金: $%s", self.initial_capital)
+        logger.info("检查间隔: %s秒", self.check_interval)
         logger.info("=" * 60)
         
+        # 手动 GC：启动阶段创建的长期对象（策略、交易所客户端等）移入永久代，之后不再扫描
+        gc_was_enabled = gc.isenabled()
+        if self._manual_gc:
+            gc.collect()
+            gc.freeze()
+            gc.disable()
+        
         try:
-            while self.is_running:
-                iteration += 1
-                
-                # 检查是否达到最大迭代次数
-                if max_iterations and iteration > max_iterations:
-                    logger.info(f"达到最大迭代次数 {max_iterations}，停止交易")
-                    break
-                
-                # 执行一次交易循环
-                self._trading_loop()
-                
-                # 等待下一次检查
-                if self.is_running:
-                    time.sleep(self.check_interval)
+            # 交易所提供行情推送时由推送驱动，推送中断或结束后回退到轮询
+            stream_ticker = getattr(self.exchange, "stream_ticker", None)
+            if stream_ticker is not None:
+                try:
+                    await self._run_stream(stream_ticker, max_iterations)
+                except Exception as e:
+                    logger.warning("行情推送中断，改为轮询: %s", e)
+            if self.is_running and not self._reached(max_iterations):
+                await self._run_polling(max_iterations)
+            if self._reached(max_iterations):
+                logger.info("达到最大迭代次数 %s，停止交易", max_iterations)
         
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             logger.info("\n收到停止信号，正在安全退出...")
+            await self._wait_for_order()
+            await self._call(self._close_position_subscription)
             self.stop()
+            raise
         except Exception as e:
-            logger.error(f"交易过程中发生错误: {e}", exc_info=True)
+            logger.error("交易过程中发生错误: %s", e, exc_info=True)
+            await self._wait_for_order()
+            await self._call(self._close_position_subscription)
             self.stop()
+        else:
+            await self._wait_for_order()
+        finally:
+            # 订阅只在运行期间有效（达到 max_iterations 正常返回时不会经过 stop()）；
+            # 取消订阅会等待推送线程退出，放到线程池执行，不阻塞事件循环
+            await self._call(self._close_position_subscription)
+            self._loop = None
+            if self._manual_gc:
+                gc.unfreeze()
+                if gc_was_enabled:
+                    gc.enable()
     
     def stop(self):
         """停止交易"""
         self.is_running = False
         
+        if self._cache_file and self._count:
+            self._save_price_cache()
+        
+        self._close_position_subscription()
+        
         # 更新 Runtime 状态为 stopped
         if self.runtime_reporter:
             try:
@@ -183,183 +444,491 @@ class LiveTrader:
                     total_trades=self.trades_count,
                     final_position=self.current_position
                 )
+                self.runtime_reporter.flush(timeout=2)
             except Exception as e:
-                logger.error(f"更新 Runtime 状态失败: {e}")
+                logger.error("更新 Runtime 状态失败: %s", e)
         
         logger.info("=" * 60)
         logger.info("🛑 交易已停止")
-        logger.info(f"总交易次数: {self.trades_count}")
-        logger.info(f"当前持仓: {self.current_position}")
+        logger.info("总交易次数: %s", self.trades_count)
+        logger.info("当前持仓: %s", self.current_position)
         logger.info("=" * 60)
     
-    def _trading_loop(self):
-        """单次交易循环"""
+    def _close_position_subscription(self):
+        """取消持仓订阅，交易路径恢复按 TTL 刷新持仓"""
+        if self._position_subscription is not None:
+            close = getattr(self._position_subscription, "close", None)
+            if close is not None:
+                close()
+            self._position_subscription = None
+        self._position_refresh = self._position_ttl
+    
+    async def _call(self, fn, *args, **kwargs):
+        """调用交易所方法：协程直接 await，同步方法放到线程池执行"""
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(fn, *args, **kwargs))
+    
+    def _report(self, method: str, **kwargs):
+        """上报到监控系统（只入队，由 RuntimeReporter 后台线程批量发送）"""
+        if not self.runtime_reporter:
+            return
         try:
-            # 1. 获取最新市场数据
-            current_price = self._get_current_price()
+            getattr(self.runtime_reporter, method)(**kwargs)
+        except Exception as e:
+            logger.error("上报监控数据失败: %s", e)
+    
+    def _reached(self, max_iterations: Optional[int]) -> bool:
+        """检查是否达到最大迭代次数"""
+        return bool(max_iterations) and self._iteration >= max_iterations
+    
+    async def _run_polling(self, max_iterations: Optional[int]):
+        """轮询模式：每 check_interval 秒主动获取一次行情"""
+        # 按单调时钟的固定节拍调度，循环本身的耗时不会累积成漂移
+        next_tick = time.monotonic()
+        while self.is_running and not self._reached(max_iterations):
+            self._iteration += 1
+            
+            # 执行一次交易循环
+            await self._trading_loop_async()
+            
+            # 等待下一次检查
+            if self.is_running:
+                next_tick += self.check_interval
+                delay = next_tick - time.monotonic()
+                if delay < 0:
+                    # 循环耗时超过 check_interval：从当前时间重新对齐，不补跑错过的 tick
+                    if self.check_interval > 0:
+                        self.tick_overruns += 1
+                        logger.warning("tick 超时 %.2f 秒，check_interval 可能过短", -delay)
+                    next_tick = time.monotonic()
+                    delay = 0
+                await asyncio.sleep(delay)
+    
+    async def _run_stream(self, stream_ticker, max_iterations: Optional[int]):
+        """
+        推送模式：exchange.stream_ticker(market) 为异步迭代器，逐条产出价格或行情响应
+        
+        读取与决策分离：后台任务持续读取推送，写入容量为 1 的队列（满时丢弃旧价格），
+        决策循环只取最新价格，处理慢的 tick 之后不会逐条补算积压的旧行情。
+        决策循环同时等待新价格与 check_interval 定时器，先到者唤醒：
+        - 两次交易决策至少间隔 check_interval 秒，期间的推送只更新最新价格
+        - 到点时用最新价格决策；一个周期内没有推送时沿用上一价格，保持固定节拍
+        - check_interval 为 0 时每个新价格都决策，不设定时器
+        """
+        latest: asyncio.Queue = asyncio.Queue(maxsize=1)
+        
+        async def read_stream():
+            async for item in stream_ticker(self.market):
+                price = float(item) if isinstance(item, (int, float)) else self._parse_price(item)
+                if price is None:
+                    continue
+                if latest.full():
+                    latest.get_nowait()  # 丢弃尚未被取走的旧价格
+                latest.put_nowait(price)
+        
+        reader = asyncio.ensure_future(read_stream())
+        getter: Optional[asyncio.Future] = None
+        next_tick = float("-inf")
+        latest_price: Optional[float] = None
+        try:
+            while self.is_running:
+                if getter is None:
+                    getter = asyncio.ensure_future(latest.get())
+                timeout = None
+                if self.check_interval > 0:
+                    timeout = max(0.0, next_tick - time.monotonic())
+                done, _ = await asyncio.wait(
+                    {getter, reader}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter in done:
+                    latest_price = getter.result()
+                    getter = None
+                    if time.monotonic() < next_tick:
+                        continue
+                elif reader in done:
+                    reader.result()  # 推送异常时抛出，由 start_async 回退到轮询
+                    return
+                if latest_price is None:
+                    continue
+                next_tick = time.monotonic() + self.check_interval
+                self._iteration += 1
+                
+                if time.monotonic() - self._position_cache[1] >= self._position_refresh:
+                    positions = await asyncio.gather(
+                        self._call(self.exchange.get_positions, market=self.market),
+                        return_exceptions=True
+                    )
+                    actual_position = self._parse_position(positions[0])
+                else:
+                    actual_position = self._position_cache[0]
+                await self._on_tick(latest_price, actual_position)
+                if self._reached(max_iterations):
+                    break
+        finally:
+            reader.cancel()
+            if getter is not None:
+                getter.cancel()
+    
+    async def _trading_loop_async(self):
+        """单次交易循环（轮询模式）"""
+        try:
+            # 获取最新行情；持仓缓存过期时并发刷新持仓
+            refresh_positions = time.monotonic() - self._position_cache[1] >= self._position_refresh
+            fetches = [self._call(self.exchange.get_ticker, self.market)]
+            if refresh_positions:
+                fetches.append(self._call(self.exchange.get_positions, market=self.market))
+            results = await asyncio.gather(*fetches, return_exceptions=True)
+            if refresh_positions:
+                actual_position = self._parse_position(results[1])
+            else:
+                actual_position = self._position_cache[0]
+            
+            current_price = self._parse_price(results[0])
             if current_price is None:
                 logger.warning("无法获取当前价格，跳过本次循环")
                 return
-            
-            # 2. 更新价格历史
+        
+        except Exception as e:
+            logger.error("交易循环错误: %s", e, exc_info=True)
+            return
+        
+        await self._on_tick(current_price, actual_position)
+    
+    async def _on_tick(self, current_price: float, actual_position: float):
+        """处理一个 tick：更新历史、生成信号、风控、下单、上报"""
+        try:
+            # 1. 更新价格历史（增量策略同时更新状态）
             self._update_price_history(current_price)
+            if self._incremental:
+                self._update_strategy_state(current_price)
             
-            # 3. 检查是否有足够的历史数据
+            # 2. 检查是否有足够的历史数据
             if len(self.price_history) < 10:  # 至少需要10个数据点
-                logger.info(f"正在积累历史数据... ({len(self.price_history)}/10)")
+                logger.info("正在积累历史数据... (%d/10)", len(self.price_history))
                 return
             
-            # 4. 生成交易信号
-            signal = self._generate_signal()
-            
-            # 5. 获取当前实际持仓
-            actual_position = self._get_current_position_from_exchange()
+            # 3. 生成交易信号（价格与持仓都未变化时可复用上次信号）
+            last_price, last_position, last_signal = self._last_tick
+            if (
+                self.skip_unchanged_price
+                and current_price == last_price
+                and abs(actual_position - last_position) < 1e-9
+            ):
+                signal = last_signal
+            else:
+                signal = self._generate_signal()
+                self._last_tick = (current_price, actual_position, signal)
             
-            # 6. 检查止损止盈
-            if self._check_stop_loss_take_profit(current_price):
+            # 4. 检查止损止盈
+            if await self._check_stop_loss_take_profit(current_price):
                 return
             
-            # 7. 计算目标仓位
+            # 5. 计算目标仓位
             target_position = self.strategy.calculate_position(signal, actual_position)
-            target_position = min(target_position, self.max_position_size)
-            
-            # 8. 执行交易
-            if abs(target_position - actual_position) > 0.001:  # 仓位变化超过0.1%才交易
-                self._execute_trade(target_position, actual_position, current_price)
+            tick = TickState(
+                price=current_price,
+                position=actual_position,
+                signal=signal,
+                target=min(target_position, self.max_position_size)
+            )
             
-            # 9. 报告信号到监控系统
-            if self.runtime_reporter:
-                try:
-                    self.runtime_reporter.report_signal(
-                        market=self.market,
-                        signal=signal,
-                        price=current_price,
-                        current_position=actual_position,
-                        target_position=target_position
-                    )
-                except Exception as e:
-                    logger.error(f"报告信号失败: {e}")
+            # 6. 执行交易（仓位变化小于 _min_trade_size 时不交易）
+            trade = self._plan_trade(tick)
+            if trade is not None:
+                await self._execute_trade(trade[0], trade[1], tick)
             
-            # 10. 记录状态
-            logger.info(
-                f"📊 状态 | 价格: ${current_price:.2f} | "
-                f"信号: {self._signal_to_str(signal)} | "
-                f"当前仓位: {actual_position:.4f} | "
-                f"目标仓位: {target_position:.4f}"
+            # 7. 报告信号到监控系统
+            self._report(
+                "report_signal",
+                market=self.market,
+                signal=tick.signal,
+                price=tick.price,
+                current_position=tick.position,
+                target_position=tick.target
             )
+            
+            # 8. 记录状态（每 _log_every 次迭代一次）
+            if self._iteration % self._log_every == 0 and logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "📊 状态 | 价格: $%.2f | 信号: %s | 当前仓位: %.4f | 目标仓位: %.4f",
+                    tick.price,
+                    _SIGNAL_STR.get(tick.signal, "⚪ HOLD"),
+                    tick.position,
+                    tick.target
+                )
         
         except Exception as e:
-            logger.error(f"交易循环错误: {e}", exc_info=True)
+            logger.error("交易循环错误: %s", e, exc_info=True)
+        finally:
+            # 手动 GC：在 tick 处理完之后、等待下一个 tick 之前回收
+            if self._manual_gc:
+                self._gc_ticks += 1
+                gc.collect(2 if self._gc_ticks % 1000 == 0 else 0)
     
-    def _get_current_price(self) -> Optional[float]:
-        """获取当前价格"""
+    def _parse_price(self, ticker: Any) -> Optional[float]:
+        """从行情响应中解析当前价格"""
         try:
-            ticker = self.exchange.get_ticker(self.market)
-            # 处理不同的响应格式
-            if isinstance(ticker, dict):
-                # 如果有 'data' 字段，从 data 中获取
-                if 'data' in ticker:
-                    data = ticker['data']
-                    price = float(data.get('last_price', 0))
-                else:
-                    # 直接从ticker获取
-                    price = float(ticker.get('last_price', 0))
-            else:
-                price = 0
+            if isinstance(ticker, BaseException):
+                raise ticker
+            price = self._parse_ticker(ticker)
             return price if price > 0 else None
         except Exception as e:
-            logger.error(f"获取价格失败: {e}", exc_info=True)
+            logger.error("获取价格失败: %s", e, exc_info=True)
             return None
     
-    def _update_price_history(self, price: float):
-        """更新价格历史"""
-        self.price_history.append(price)
+    @property
+    def stop_loss(self) -> Optional[float]:
+        """止损比例（None 表示不启用）"""
+        return self._sl or None
+    
+    @stop_loss.setter
+    def stop_loss(self, value: Optional[float]):
+        self._sl = float(value or 0.0)
+    
+    @property
+    def take_profit(self) -> Optional[float]:
+        """止盈比例（None 表示不启用）"""
+        return self._tp or None
+    
+    @take_profit.setter
+    def take_profit(self, value: Optional[float]):
+        self._tp = float(value or 0.0)
+    
+    @property
+    def price_history(self) -> np.ndarray:
+        """最近 history_length 个价格（只读视图，按时间升序，不复制）"""
+        view = self._prices[self._start:self._start + self._count]
+        view.flags.writeable = False
+        return view
+    
+    @property
+    def timestamp_history(self) -> np.ndarray:
+        """与 price_history 一一对应的采样时间（毫秒，只读视图）"""
+        view = self._ts[self._start:self._start + self._count]
+        view.flags.writeable = False
+        return view
+    
+    def _update_price_history(self, price: float, ts: Optional[int] = None):
+        """更新价格历史（均摊 O(1)，超出 history_length 时丢弃最旧的数据点）"""
+        end = self._start + self._count
+        if end == len(self._prices):
+            self._prices[:self._count] = self._prices[self._start:end]
+            self._ts[:self._count] = self._ts[self._start:end]
+            self._start = 0
+            end = self._count
+        self._prices[end] = price
+        self._ts[end] = ts if ts is not None else time.time_ns() // 1_000_000
+        if self._count < self.history_length:
+            self._count += 1
+        else:
+            self._start += 1
         
-        # 只保留最近的 N 个数据点
-        if len(self.price_history) > self.history_length:
-            self.price_history.pop(0)
+        if self._cache_file:
+            self._updates_since_save += 1
+            if self._updates_since_save >= self._cache_every:
+                self._save_price_cache()
+    
+    def _load_price_cache(self):
+        """从磁盘恢复价格历史（文件不存在、损坏或过期时忽略）"""
+        try:
+            with np.load(self._cache_file) as data:
+                prices = data["prices"][-self.history_length:]
+                ts = data["ts"][-self.history_length:]
+        except FileNotFoundError:
+            logger.debug("价格缓存未命中: %s", self._cache_file)
+            return
+        except Exception as e:
+            logger.warning("读取价格缓存失败，已忽略: %s", e)
+            return
+        
+        max_age_ms = 10 * self.check_interval * 1000
+        if not len(ts) or time.time_ns() // 1_000_000 - ts[-1] > max_age_ms:
+            logger.debug("价格缓存已过期: %s", self._cache_file)
+            return
+        
+        n = len(prices)
+        self._prices[:n] = prices
+        self._ts[:n] = ts
+        self._start = 0
+        self._count = n
+        if self._incremental:
+            for price in prices.tolist():
+                self._update_strategy_state(price)
+        logger.debug("价格缓存命中: %s (%d 个数据点)", self._cache_file, n)
+    
+    def _save_price_cache(self):
+        """写入价格历史（先写临时文件再原子替换，进程中断不会留下半个文件）"""
+        self._updates_since_save = 0
+        try:
+            os.makedirs(os.path.dirname(self._cache_file) or ".", exist_ok=True)
+            tmp = self._cache_file + ".tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, prices=self.price_history, ts=self.timestamp_history)
+            os.replace(tmp, self._cache_file)
+        except Exception as e:
+            logger.warning("写入价格缓存失败: %s", e)
+    
+    def _update_strategy_state(self, price: float):
+        """把新价格交给增量策略"""
+        try:
+            self._strategy_state, self._incremental_signal = self.strategy.update(self._strategy_state, price)
+        except Exception as e:
+            logger.error("更新策略状态失败: %s", e)
+            self._incremental_signal = 0
     
     def _generate_signal(self) -> int:
         """生成交易信号"""
+        if self._incremental:
+            return self._incremental_signal
         try:
-            signals = self.strategy.generate_signals(self.price_history)
-            return signals[-1] if signals else 0
+            # 向量化信号函数直接处理 ndarray 视图，可 @njit 编译
+            if self._signal_core is not None:
+                return int(self._signal_core(self.price_history))
+            data = self.price_history if self._signal_input_ndarray else self.price_history.tolist()
+            signals = self.strategy.generate_signals(data)
+            return signals[-1] if len(signals) else 0
         except Exception as e:
-            logger.error(f"生成信号失败: {e}")
+            logger.error("生成信号失败: %s", e)
             return 0
     
-    def _get_current_position_from_exchange(self) -> float:
-        """从交易所获取当前持仓"""
+    def _parse_position(self, positions: Any) -> float:
+        """从持仓响应中解析当前持仓"""
         try:
-            positions = self.exchange.get_positions(market=self.market)
-            # 处理不同的响应格式
-            if isinstance(positions, dict):
-                # 如果有 'data' 字段，从 data 中获取
-                if 'data' in positions:
-                    positions = positions['data']
-            
-            if positions and len(positions) > 0:
-                position_size = float(positions[0].get('size', 0))
+            if isinstance(positions, BaseException):
+                raise positions
+            position_size = self._parse_positions(positions)
+            if position_size is None:
+                position_size = 0.0
+            else:
                 self.current_position = position_size
-                return position_size
-            return 0.0
+            self._position_cache = (position_size, time.monotonic())
+            return position_size
         except Exception as e:
-            logger.error(f"获取持仓失败: {e}", exc_info=True)
+            logger.error("获取持仓失败: %s", e, exc_info=True)
             return self.current_position
     
-    def _check_stop_loss_take_profit(self, current_price: float) -> bool:
+    def _on_positions(self, positions: Any):
+        """持仓推送回调（可能在交易所的推送线程中调用，转交到事件循环执行）"""
+        loop = self._loop
+        if loop is not None:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not loop:
+                try:
+                    loop.call_soon_threadsafe(self._apply_positions, positions, self._order_seq)
+                except RuntimeError:
+                    # 事件循环已关闭：交易已停止，推送不再有意义
+                    pass
+                return
+        self._apply_positions(positions, self._order_seq)
+    
+    def _apply_positions(self, positions: Any, order_seq: int):
+        """在事件循环中应用持仓推送，与 _place_order 的持仓更新串行执行"""
+        # 订单返回前的推送可能是成交前的快照，会覆盖 _place_order 写回的持仓；
+        # 推送收到后有订单返回 (order_seq 变化) 时同理
+        if self._order_in_flight or order_seq != self._order_seq:
+            return
+        self._parse_position(positions)
+    
+    async def _check_stop_loss_take_profit(self, current_price: float) -> bool:
         """检查止损止盈"""
-        if self.current_position == 0 or self.entry_price == 0:
+        if not self.current_position:
+            return False  # 空仓时省去一次调用
+        exit_code = _fastpath.check_sl_tp(
+            self.current_position,
+            self.entry_price,
+            current_price,
+            self._sl,
+            self._tp
+        )
+        if exit_code == _fastpath.EXIT_NONE:
             return False
         
         pnl_pct = (current_price - self.entry_price) / self.entry_price
         
         # 止损
-        if self.stop_loss and pnl_pct <= -self.stop_loss:
-            logger.warning(f"🛑 触发止损! 当前亏损: {pnl_pct*100:.2f}%")
-            self._close_position(current_price, "止损")
+        if exit_code == _fastpath.EXIT_STOP_LOSS:
+            logger.warning("🛑 触发止损! 当前亏损: %.2f%%", pnl_pct*100)
+            await self._close_position(current_price, "止损")
             return True
         
         # 止盈
-        if self.take_profit and pnl_pct >= self.take_profit:
-            logger.info(f"🎯 触发止盈! 当前盈利: {pnl_pct*100:.2f}%")
-            self._close_position(current_price, "止盈")
-            return True
+        logger.info("🎯 触发止盈! 当前盈利: %.2f%%", pnl_pct*100)
+        await self._close_position(current_price, "止盈")
+        return True
+    
+    def _plan_trade(self, tick: TickState) -> Optional[Tuple[str, float]]:
+        """
+        计算从 tick.position 调整到 tick.target 的交易方向与数量
+        
+        仓位差、最小交易量判断、订单金额与风控检查都只在这里算一次。
+        
+        Returns:
+            (side, size)；无需交易、超出风控限制或上一笔订单未返回时为 None
+        """
+        # 上一笔订单尚未返回时不再下单，避免按过期持仓重复下单
+        if self._pending_order is not None:
+            logger.debug("上一笔订单尚未完成，跳过本次交易")
+            return None
         
-        return False
+        action, size, _ = _fastpath.compute_trade(
+            tick.target - tick.position,
+            tick.price,
+            self._max_order_value,
+            self._min_trade_size
+        )
+        if action == _fastpath.TRADE_NONE:
+            return None
+        if action == _fastpath.TRADE_OVER_LIMIT:
+            logger.warning("订单金额超出限制，跳过交易")
+            return None
+        return ("buy" if action == _fastpath.TRADE_BUY else "sell"), size
     
-    def _execute_trade(self, target_position: float, current_position: float, current_price: float):
-        """执行交易"""
+    async def _execute_trade(self, side: str, size: float, tick: TickState):
+        """执行交易（side / size 由 _plan_trade 计算，这里不再重复检查）"""
         try:
-            position_diff = target_position - current_position
-            
-            if abs(position_diff) < 0.001:
-                return
-            
-            # 计算交易方向和数量
-            side = "buy" if position_diff > 0 else "sell"
-            size = abs(position_diff)
-            
-            # 计算订单金额
-            order_value = size * current_price
+            if self.async_orders:
+                # 后台下单，交易循环继续；结果由 _place_order 在返回后写回状态
+                self._pending_order = asyncio.ensure_future(self._place_order(side, size, tick))
+                self._pending_order.add_done_callback(self._on_order_done)
+            else:
+                await self._place_order(side, size, tick)
+        
+        except Exception as e:
+            logger.error("执行交易失败: %s", e, exc_info=True)
+    
+    async def _place_order(self, side: str, size: float, tick: TickState):
+        """下市价单并更新持仓状态"""
+        try:
+            current_position = tick.position
+            target_position = tick.target
+            current_price = tick.price
             
-            # 风险检查
-            if order_value > self.initial_capital * self.max_position_size:
-                logger.warning(f"订单金额超出限制，跳过交易")
-                return
+            # 每笔订单带唯一 client_order_id：请求重试时交易所按 ID 去重，不会重复成交
+            client_order_id = uuid.uuid4().hex
             
             # 下市价单
-            logger.info(f"📝 执行交易: {side.upper()} {size:.4f} @ ${current_price:.2f}")
-            
-            order = self.exchange.place_order(
-                market=self.market,
-                side=side,
-                order_type="market",  # 使用市价单快速成交
-                size=str(size)
+            logger.info(
+                "📝 执行交易: %s %.4f @ $%.2f (client_order_id=%s)",
+                side.upper(), size, current_price, client_order_id
             )
             
+            # 固定 8 位小数：str() 对很小的数量会输出科学计数法 (如 1e-05)，交易所会拒绝
+            self._order_in_flight = True
+            order_fields = {"side": side, "size": format(size, ".8f"), "client_order_id": client_order_id}
+            if self._submit_order is not None:
+                order = await self._call(self._submit_order, **order_fields)
+            else:
+                order = await self._call(self.exchange.place_order, **self._order_template, **order_fields)
+            
             # 更新状态
             self.current_position = target_position
+            self._position_cache = (target_position, time.monotonic())
+            self._order_seq += 1
             self.trades_count += 1
             
             if target_position > 0 and current_position == 0:
@@ -368,52 +937,79 @@ class LiveTrader:
                 self.entry_price = 0
             
             # 报告交易到监控系统
-            if self.runtime_reporter:
-                try:
-                    self.runtime_reporter.report_trade(
-                        market=self.market,
-                        side=side,
-                        size=size,
-                        price=current_price,
-                        order_id=order.get('order_id'),
-                        position_before=current_position,
-                        position_after=target_position
-                    )
-                    
-                    # 报告持仓更新
-                    self.runtime_reporter.report_position(
-                        market=self.market,
-                        position_size=self.current_position,
-                        entry_price=self.entry_price,
-                        current_price=current_price
-                    )
-                except Exception as e:
-                    logger.error(f"报告交易/持仓失败: {e}")
+            self._report(
+                "report_trade",
+                market=self.market,
+                side=side,
+                size=size,
+                price=current_price,
+                order_id=order.get('order_id'),
+                client_order_id=client_order_id,
+                position_before=current_position,
+                position_after=target_position
+            )
             
-            logger.info(f"✅ 交易成功! 订单ID: {order.get('order_id', 'N/A')}")
+            # 报告持仓更新
+            self._report(
+                "report_position",
+                market=self.market,
+                position_size=self.current_position,
+                entry_price=self.entry_price,
+                current_price=current_price
+            )
+            
+            logger.info("✅ 交易成功! 订单ID: %s", order.get('order_id', 'N/A'))
         
         except Exception as e:
-            logger.error(f"执行交易失败: {e}", exc_info=True)
+            logger.error("执行交易失败: %s", e, exc_info=True)
+        finally:
+            self._order_in_flight = False
+    
+    def _on_order_done(self, task):
+        """后台订单结束回调"""
+        self._pending_order = None
+    
+    async def _wait_for_order(self):
+        """等待后台订单返回（停止前调用，避免订单结果丢失）"""
+        if self._pending_order is not None:
+            await asyncio.gather(self._pending_order, return_exceptions=True)
     
-    def _close_position(self, current_price: float, reason: str):
+    async def _close_position(self, current_price: float, reason: str):
         """平仓"""
         try:
             if self.current_position == 0:
                 return
             
-            logger.info(f"平仓原因: {reason}")
-            self._execute_trade(0.0, self.current_position, current_price)
+            logger.info("平仓原因: %s", reason)
+            tick = TickState(
+                price=current_price,
+                position=self.current_position,
+                signal=0,
+                target=0.0
+            )
+            trade = self._plan_trade(tick)
+            if trade is not None:
+                await self._execute_trade(trade[0], trade[1], tick)
         except Exception as e:
-            logger.error(f"平仓失败: {e}")
-    
-    def _signal_to_str(self, signal: int) -> str:
-        """信号转字符串"""
-        if signal == 1:
-            return "🟢 BUY"
-        elif signal == -1:
-            return "🔴 SELL"
-        else:
-            return "⚪ HOLD"
+            logger.error("平仓失败: %s", e)
+    
+    def set_capital(
+        self,
+        initial_capital: Optional[float] = None,
+        max_position_size: Optional[float] = None
+    ):
+        """
+        修改资金参数并重新计算单笔订单金额上限
+        
+        Args:
+            initial_capital: 初始资金（None 表示不变）
+            max_position_size: 最大仓位比例（None 表示不变）
+        """
+        if initial_capital is not None:
+            self.initial_capital = initial_capital
+        if max_position_size is not None:
+            self.max_position_size = max_position_size
+        self._max_order_value = self.initial_capital * self.max_position_size
     
     def get_status(self) -> Dict[str, Any]:
         """获取当前状态"""
@@ -424,6 +1020,7 @@ class LiveTrader:
             "current_position": self.current_position,
             "entry_price": self.entry_price,
             "trades_count": self.trades_count,
+            "tick_overruns": self.tick_overruns,
             "price_history_length": len(self.price_history)
         }
 
@@ -434,12 +1031,14 @@ def start_trading(
     market: str = "BTC-PERP",
     initial_capital: float = 10000,
     exchange: str = "1024ex",
-    base_url: str = "https://api.1024ex.com",
+    base_url: Union[str, Sequence[str]] = "https://api.1024ex.com",
     max_position_size: float = 0.5,
     check_interval: int = 60,
     stop_loss: Optional[float] = 0.05,
     take_profit: Optional[float] = 0.10,
     runtime_config: Optional[Dict[str, Any]] = None,
+    http2: bool = False,
+    cpu_pin: Optional[int] = None,
     **kwargs
 ) -> LiveTrader:
     """
@@ -472,6 +1071,7 @@ def start_trading(
         initial_capital: 初始资金（默认 10000）
         exchange: 交易所名称（默认 "1024ex"）
         base_url: API 地址（默认 1024ex 主网）
+            - 传入多个地址（如不同区域的接入点）时，启动前逐个测量往返延迟，使用最快的一个
         max_position_size: 最大仓位比例 0-1（默认 0.5 = 50%仓位）
         check_interval: 检查间隔秒数（默认 60秒）
         stop_loss: 止损比例（默认 0.05 = 5%）
@@ -481,6 +1081,11 @@ def start_trading(
             - 可选: "api_base_url", "strategy_id", "environment", "metadata"
             - runtime_id 会自动生成（UUID）
             - 如果不提供，不启用监控
+        http2: 使用 HTTP/2 传输（默认 False，需要 quant1024[http2]）
+            - 行情、持仓、下单请求在同一连接上多路复用
+            - 默认的 HTTP/1.1 连接池同样保持长连接，每次请求不重新握手
+        cpu_pin: 把进程绑定到指定 CPU 核（可选，仅 Linux）
+            - 配合 isolcpus 等隔离的核使用，减少调度抖动
         **kwargs: 其他参数
     
     Returns:
@@ -543,6 +1148,8 @@ def start_trading(
         Quant1024Exception: 其他错误
     """
     
+    configure_logging()
+    
     # 参数验证
     if not isinstance(strategy, QuantStrategy):
         raise InvalidParameterError("strategy 必须是 QuantStrategy 的子类")
@@ -581,16 +1188,31 @@ def start_trading(
                 )
         except Exception as e:
             logger.error(
-                f"❌ Runtime config 配置错误: {e}，"
-                f"监控功能已禁用，交易将继续进行"
+                "❌ Runtime config 配置错误: %s，"
+                "监控功能已禁用，交易将继续进行",
+                e
             )
             runtime_config_obj = None
     
+    # 绑定 CPU 核（仅 Linux 提供 sched_setaffinity）
+    if cpu_pin is not None:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu_pin})
+            logger.info("进程已绑定到 CPU %s", cpu_pin)
+        else:
+            logger.warning("当前平台不支持 CPU 绑定，忽略 cpu_pin")
+    
+    # 多个候选地址时选往返延迟最低的一个
+    if not isinstance(base_url, str):
+        base_url = select_fastest_endpoint(list(base_url))
+        logger.info("选用延迟最低的接入点: %s", base_url)
+    
     # 创建交易所连接
     if exchange.lower() == "1024ex":
         exchange_client = Exchange1024ex(
             api_key=api_key,
-            base_url=base_url
+            base_url=base_url,
+            http2=http2
         )
     else:
         raise InvalidParameterError(f"暂不支持交易所: {exchange}")
@@ -3,7 +3,7 @@ Data models for quant1024
 """
 
 from .market import MarketInfo, TickerData, OrderBook, Trade, Kline, FundingRate, MarketStats
-from .order import Order, OrderRequest, Position
+from .order import Order, OrderRequest, SpotOrderRequest, PredictionOrderRequest, Position
 from .account import Balance, Margin, SubAccount
 
 __all__ = [
@@ -16,6 +16,8 @@ __all__ = [
     "MarketStats",
     "Order",
     "OrderRequest",
+    "SpotOrderRequest",
+    "PredictionOrderRequest",
     "Position",
     "Balance",
     "Margin",
@@ -20,6 +20,28 @@ class OrderRequest(BaseModel):
     client_order_id: Optional[str] = Field(None, description="客户端订单ID")
 
 
+class SpotOrderRequest(BaseModel):
+    """现货下单请求"""
+    market: str
+    side: str = Field(..., description="方向: buy/sell")
+    type: str = Field(..., description="订单类型: limit/market")
+    size: str = Field(..., description="数量（基础货币）")
+    price: Optional[str] = Field(None, description="价格（限价单必填）")
+    quote_amount: Optional[str] = Field(None, description="报价货币数量")
+    post_only: bool = Field(False, description="只做 Maker")
+    time_in_force: str = Field("GTC", description="有效期类型")
+    client_order_id: Optional[str] = Field(None, description="客户端订单ID")
+
+
+class PredictionOrderRequest(BaseModel):
+    """预测市场下单请求"""
+    market_id: int
+    side: int = Field(..., description="方向: 0=买, 1=卖")
+    outcome_index: int = Field(..., description="结果索引")
+    price_e6: int = Field(..., description="价格（e6 格式）")
+    amount: int = Field(..., description="份额数量")
+
+
 class Order(BaseModel):
     """订单信息"""
     order_id: str
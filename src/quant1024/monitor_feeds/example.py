@@ -4,26 +4,43 @@ Monitor Feeds - 使用示例
 这个文件展示了如何使用 Runtime 监控功能
 """
 
+import numpy as np
+
 from quant1024 import QuantStrategy, start_trading
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 # ============================================================
 # 定义一个简单的策略
 # ============================================================
 
+def _trend_signal(arr):
+    """简单的价格趋势判断（数值核心，安装 numba 时编译为本地代码）"""
+    if len(arr) < 2:
+        return 0
+    if arr[-1] > arr[-2]:
+        return 1  # 上涨 -> 买入信号
+    return -1  # 下跌 -> 卖出信号
+
+
+if njit is not None:
+    # cache=True：编译结果缓存到磁盘，进程重启不再重新编译
+    _trend_signal = njit(cache=True, fastmath=True)(_trend_signal)
+
+
 class SimpleStrategy(QuantStrategy):
     """简单的趋势跟踪策略"""
     
+    # 实盘每个 tick 直接调用，跳过 generate_signals 的列表打包
+    _vectorized_core = staticmethod(_trend_signal)
+    
     def generate_signals(self, data):
         """生成交易信号"""
-        if len(data) < 2:
-            return [0]
-        
-        # 简单的价格趋势判断
-        if data[-1] > data[-2]:
-            return [1]  # 上涨 -> 买入信号
-        else:
-            return [-1]  # 下跌 -> 卖出信号
+        return [int(_trend_signal(np.asarray(data, dtype=np.float64)))]
     
     def calculate_position(self, signal, current_position):
         """计算目标仓位"""
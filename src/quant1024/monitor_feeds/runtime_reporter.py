@@ -3,10 +3,12 @@ Runtime 监控报告器
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import queue
+import threading
 import time
-from typing import Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import atexit
 from datetime import datetime
 
@@ -60,8 +62,13 @@ class RuntimeReporter:
     改进：
     - 移除 exchange 参数（api_base_url 与交易所无关）
     - 使用 RuntimeConfig 直接初始化
+    - 报告进入有界队列，由单个后台线程按批取出发送；
+      调用方只做一次 put_nowait，队列满时丢弃最新的报告
     """
     
+    QUEUE_SIZE = 1024   # 待发送报告上限
+    BATCH_SIZE = 64     # 后台线程每批最多取出的报告数
+    
     def __init__(self, config: RuntimeConfig):
         """
         初始化报告器
@@ -71,23 +78,27 @@ class RuntimeReporter:
         """
         self.config = config
         
-        # HTTP Session
+        # HTTP Session：保活连接池，TCP/TLS 握手只在首次报告时发生。
+        # 只连接 api_base_url 一个主机，发送线程 + create_runtime 调用方最多同时占用 2 个连接
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             'X-API-Key': config.api_key,
             'Content-Type': 'application/json'
         })
         
-        # 异步线程池
-        self._executor = ThreadPoolExecutor(
-            max_workers=3,
-            thread_name_prefix="runtime_reporter"
+        # 待发送队列 + 后台发送线程（首次报告时启动）
+        self._queue: "queue.Queue[Optional[Tuple[Callable[..., None], tuple]]]" = queue.Queue(
+            maxsize=self.QUEUE_SIZE
         )
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
         
         atexit.register(self._cleanup)
         
         self._runtime_created = False
-        self._pending_futures = []
         
         # 统计计数器
         self._stats = {
@@ -97,6 +108,7 @@ class RuntimeReporter:
             'trades_failed': 0,
             'positions_sent': 0,
             'positions_failed': 0,
+            'dropped': 0,
         }
         
         logger.info(
@@ -137,9 +149,62 @@ class RuntimeReporter:
         """获取统计信息"""
         return self._stats.copy()
     
-    def _cleanup_completed_futures(self):
-        """清理已完成的futures"""
-        self._pending_futures = [f for f in self._pending_futures if not f.done()]
+    def _submit(self, fn: Callable[..., None], *args: Any, block: bool = False) -> None:
+        """将报告放入发送队列（默认不阻塞，队列满时丢弃）"""
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._drain,
+                        name="runtime_reporter",
+                        daemon=True
+                    )
+                    self._worker.start()
+        try:
+            self._queue.put((fn, args), block=block, timeout=2 if block else None)
+        except queue.Full:
+            self._stats['dropped'] += 1
+            logger.warning("Report queue full, dropping report")
+    
+    def _drain(self) -> None:
+        """后台线程：阻塞等待报告，每次连同已排队的报告一起取出发送"""
+        while True:
+            items: List[Tuple[Callable[..., None], tuple]] = []
+            item = self._queue.get()
+            while item is not None:
+                items.append(item)
+                if len(items) >= self.BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._send_batch(items)
+            if item is None:
+                return
+    
+    def _send_batch(self, items: List[Tuple[Callable[..., None], tuple]]) -> None:
+        """按入队顺序发送一批报告（复用同一 Session 的保活连接）"""
+        for fn, args in items:
+            fn(*args)
+    
+    def flush(self, timeout: float = 2.0) -> None:
+        """
+        发送队列中剩余的报告并停止后台线程
+        
+        之后的报告会重新启动后台线程。
+        
+        Args:
+            timeout: 最多等待秒数
+        """
+        worker = self._worker
+        if worker is None or not worker.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        worker.join(timeout)
     
     def create_runtime(
         self,
@@ -203,12 +268,7 @@ class RuntimeReporter:
             logger.warning("Runtime not created yet, skipping status update")
             return
         
-        future = self._executor.submit(
-            self._update_runtime_status_sync,
-            status,
-            kwargs
-        )
-        self._pending_futures.append(future)
+        self._submit(self._update_runtime_status_sync, status, kwargs, block=True)
     
     def _update_runtime_status_sync(self, status: str, extra_data: Dict[str, Any]) -> None:
         """同步更新 Runtime 状态"""
@@ -253,7 +313,7 @@ class RuntimeReporter:
             logger.warning("Runtime not created yet, skipping trade report")
             return
         
-        future = self._executor.submit(
+        self._submit(
             self._report_trade_sync,
             market,
             side,
@@ -262,7 +322,6 @@ class RuntimeReporter:
             order_id,
             kwargs
         )
-        self._pending_futures.append(future)
     
     def _report_trade_sync(
         self,
@@ -297,10 +356,6 @@ class RuntimeReporter:
         except Exception as e:
             self._stats['trades_failed'] += 1
             logger.error(f"❌ Error reporting trade (after retries): {e}")
-        finally:
-            # 定期清理已完成的futures
-            if len(self._pending_futures) > 100:
-                self._cleanup_completed_futures()
     
     def report_signal(
         self,
@@ -321,14 +376,13 @@ class RuntimeReporter:
         if not self._runtime_created:
             return
         
-        future = self._executor.submit(
+        self._submit(
             self._report_signal_sync,
             market,
             signal,
             price,
             kwargs
         )
-        self._pending_futures.append(future)
     
     def _report_signal_sync(
         self,
@@ -359,9 +413,6 @@ class RuntimeReporter:
         except Exception as e:
             self._stats['signals_failed'] += 1
             logger.error(f"❌ Error reporting signal (after retries): {e}")
-        finally:
-            if len(self._pending_futures) > 100:
-                self._cleanup_completed_futures()
     
     def report_position(
         self,
@@ -384,7 +435,7 @@ class RuntimeReporter:
         if not self._runtime_created:
             return
         
-        future = self._executor.submit(
+        self._submit(
             self._report_position_sync,
             market,
             position_size,
@@ -392,7 +443,6 @@ class RuntimeReporter:
             current_price,
             kwargs
         )
-        self._pending_futures.append(future)
     
     def _report_position_sync(
         self,
@@ -434,33 +484,18 @@ class RuntimeReporter:
         except Exception as e:
             self._stats['positions_failed'] += 1
             logger.error(f"❌ Error reporting position (after retries): {e}")
-        finally:
-            if len(self._pending_futures) > 100:
-                self._cleanup_completed_futures()
     
     def _cleanup(self):
         """清理资源"""
         try:
-            # 使用concurrent.futures.wait批量等待（最多5秒）
-            from concurrent.futures import wait, ALL_COMPLETED
-            
-            if self._pending_futures:
-                logger.info(f"Waiting for {len(self._pending_futures)} pending tasks...")
-                done, pending = wait(self._pending_futures, timeout=5, return_when=ALL_COMPLETED)
-                
-                if pending:
-                    logger.warning(f"{len(pending)} tasks did not complete in time, cancelling...")
-                    for future in pending:
-                        future.cancel()
-                
-                # 记录失败的任务
-                for future in done:
-                    try:
-                        future.result()
-                    except Exception as e:
-                        logger.error(f"Task failed: {e}")
+            # 发送剩余报告（最多5秒）
+            pending = self._queue.qsize()
+            if pending:
+                logger.info(f"Waiting for {pending} pending reports...")
+            self.flush(timeout=5)
+            if self._worker is not None and self._worker.is_alive():
+                logger.warning(f"{self._queue.qsize()} reports were not sent in time")
             
-            self._executor.shutdown(wait=False)
             self.session.close()
             
             # 输出统计信息
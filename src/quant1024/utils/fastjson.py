@@ -0,0 +1,62 @@
+"""
+JSON encode/decode helpers
+
+优先使用 orjson (可选依赖，pip install quant1024[fast])，未安装时回退到标准库 json。
+两种实现输出相同的紧凑 UTF-8 字节，签名结果与所用后端无关。
+
+numpy 数组/标量与 array.array 可直接作为值传入 (如大批量 ID 列表)，
+orjson 原生序列化 numpy，其余经 tolist() 转换。
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """序列化 array.array / numpy 等提供 tolist() 的对象"""
+    tolist = getattr(obj, "tolist", None)
+    if tolist is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return tolist()
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    序列化为紧凑 JSON (UTF-8 bytes)
+    
+    Args:
+        obj: 可 JSON 序列化的对象
+    
+    Returns:
+        JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    反序列化 JSON
+    
+    Args:
+        data: JSON 字节串或字符串
+    
+    Returns:
+        解析结果
+
+    Raises:
+        ValueError: 非法 JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,118 @@
+"""
+TWAP / VWAP / Scale / Iceberg slice schedules
+
+按最小下单单位 (tick) 拆分总数量，整批用 numpy 向量运算完成，
+不逐片做 Decimal 乘除。各片向下取整到 tick，余量并入最后一片，
+保证 sum(slices) == total。
+
+阶梯价格同样在整数 tick 上用 linspace 一次算出。
+
+服务端 TWAP/VWAP/Scale/Iceberg 订单自行拆单；这里用于客户端自行分片下单
+(如配合 batch_place_orders) 或预览拆分结果。
+"""
+
+from decimal import Decimal
+from typing import Any, List, Union
+
+import numpy as np
+
+
+def compute_default_u_shape(n: int) -> np.ndarray:
+    """
+    默认 U 形成交量权重 (首尾高、中间低)
+
+    Args:
+        n: 分片数
+    """
+    return 1.0 + np.abs(np.arange(n) - (n - 1) / 2)
+
+
+def schedule_vwap(total: Union[Decimal, str], weights: Any, tick: Union[Decimal, str] = "0.0001") -> List[Decimal]:
+    """
+    按权重拆分总数量
+
+    Args:
+        total: 总数量
+        weights: 各片权重 (任意非负数组)
+        tick: 最小数量单位
+
+    Returns:
+        各片数量 (Decimal，均为 tick 的整数倍，合计等于 total 按 tick 截断后的值)
+    """
+    tick = Decimal(str(tick))
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.ndim != 1 or not len(weights):
+        raise ValueError("weights must be a non-empty 1-D array")
+    weight_sum = weights.sum()
+    if weight_sum <= 0 or (weights < 0).any():
+        raise ValueError("weights must be non-negative with a positive sum")
+    # 整数 tick 上计算，避免浮点误差累积到合计
+    total_ticks = int(Decimal(str(total)) // tick)
+    ticks = np.floor(total_ticks * (weights / weight_sum)).astype(np.int64)
+    ticks[-1] += total_ticks - int(ticks.sum())
+    return [tick * int(t) for t in ticks]
+
+
+def schedule_twap(total: Union[Decimal, str], n: int, tick: Union[Decimal, str] = "0.0001") -> List[Decimal]:
+    """
+    等分总数量
+
+    Args:
+        total: 总数量
+        n: 分片数
+        tick: 最小数量单位
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    return schedule_vwap(total, np.ones(n), tick)
+
+
+def schedule_scale_prices(
+    start: Union[Decimal, str],
+    end: Union[Decimal, str],
+    n: int,
+    tick: Union[Decimal, str] = "0.01"
+) -> List[Decimal]:
+    """
+    阶梯订单价格 (start 到 end 等距 n 档，含两端，取整到 tick)
+
+    Args:
+        start: 起始价格
+        end: 结束价格
+        n: 档数
+        tick: 最小价格单位
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    tick = Decimal(str(tick))
+    lo = int(Decimal(str(start)) / tick)
+    hi = int(Decimal(str(end)) / tick)
+    ticks = np.rint(np.linspace(lo, hi, n)).astype(np.int64)
+    return [tick * int(t) for t in ticks]
+
+
+def schedule_iceberg(
+    total: Union[Decimal, str],
+    visible: Union[Decimal, str],
+    tick: Union[Decimal, str] = "0.0001"
+) -> List[Decimal]:
+    """
+    冰山订单分片 (每片 visible，最后一片为余量)
+
+    一次算出全部 ceil(total / visible) 片，逐片下单时直接按序取用。
+
+    Args:
+        total: 总数量
+        visible: 每片显示数量
+        tick: 最小数量单位
+    """
+    tick = Decimal(str(tick))
+    total_ticks = int(Decimal(str(total)) // tick)
+    visible_ticks = int(Decimal(str(visible)) // tick)
+    if visible_ticks <= 0:
+        raise ValueError("visible must be at least one tick")
+    count = -(-total_ticks // visible_ticks)
+    ticks = np.full(count, visible_ticks, dtype=np.int64)
+    if count:
+        ticks[-1] = total_ticks - visible_ticks * (count - 1)
+    return [tick * int(t) for t in ticks]
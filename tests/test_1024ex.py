@@ -5,6 +5,7 @@ Contains test cases for the Exchange1024ex connector.
 Tests import functionality and basic API structure.
 """
 
+import gzip
 import pytest
 import responses
 from quant1024.exchanges.exchange_1024ex import Exchange1024ex
@@ -55,6 +56,43 @@ def test_exchange_init_custom_url():
     assert client.base_url == "http://localhost:8090"
 
 
+def test_exchange_session_pooling(client):
+    """Test the shared session mounts a pooled, retrying adapter"""
+    adapter = client.session.get_adapter("https://api.1024ex.com")
+    assert adapter._pool_maxsize == 128
+    assert 503 in adapter.max_retries.status_forcelist
+    assert adapter.max_retries.connect == 0
+    # POSTs carry an Idempotency-Key, so gateway errors on orders are retried too
+    assert "POST" in adapter.max_retries.allowed_methods
+
+
+def test_exchange_http2_transport():
+    """Test the optional HTTP/2 transport plugs into the request layer"""
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    
+    def handler(request):
+        assert request.url.path == "/api/v1/time"
+        assert request.extensions["timeout"]["connect"] == 2
+        assert request.extensions["timeout"]["read"] == 5
+        return httpx.Response(200, json={"success": True, "data": {"server_time": 1}})
+    
+    client = Exchange1024ex(http2=True, timeout=(2, 5))
+    client.session._client = httpx.Client(transport=httpx.MockTransport(handler))
+    assert client.get_server_time()["data"]["server_time"] == 1
+
+
+@responses.activate
+def test_select_fastest_endpoint_skips_unreachable():
+    """Test endpoint probing ignores unreachable hosts and falls back to the first"""
+    from quant1024.exchanges.transport import select_fastest_endpoint
+    responses.add(responses.HEAD, "https://b.example", status=404)
+    
+    assert select_fastest_endpoint(["https://a.example", "https://b.example"], samples=3) == "https://b.example"
+    assert len(responses.calls) == 3 + 1
+    assert select_fastest_endpoint(["https://a.example", "https://c.example"]) == "https://a.example"
+
+
 def test_exchange_modules_exist(client):
     """Test all modules are accessible"""
     assert hasattr(client, 'perp')
@@ -64,6 +102,16 @@ def test_exchange_modules_exist(client):
     assert hasattr(client, 'account')
 
 
+def test_exchange_modules_lazy():
+    """Test modules are constructed on first access and then cached"""
+    client = Exchange1024ex()
+    assert "perp" not in vars(client)
+    perp = client.perp
+    assert vars(client)["perp"] is perp
+    assert client.perp is perp
+    assert not hasattr(perp, "__dict__")
+
+
 def test_perp_module_methods(client):
     """Test perp module has expected methods"""
     perp = client.perp
@@ -174,6 +222,785 @@ def test_get_ticker(client):
     assert "last_price" in result
 
 
+@responses.activate
+def test_get_ticker_typed(client):
+    """Test typed ticker snapshot"""
+    from decimal import Decimal
+    from quant1024.exchanges.snapshot import Ticker
+    
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/markets/BTC-USDC/ticker",
+        json={
+            "success": True,
+            "data": {
+                "market": "BTC-USDC",
+                "last_price": "60000.00",
+                "bid": "59999.50",
+                "ask": "60000.50",
+                "volume_24h": "1234.5",
+                "timestamp": 1762911479265
+            }
+        },
+        status=200
+    )
+    
+    ticker = client.perp.get_ticker("BTC-USDC", typed=True)
+    assert isinstance(ticker, Ticker)
+    assert ticker.last == Decimal("60000.00")
+    assert ticker.ts == 1762911479265
+    assert not hasattr(ticker, "__dict__")
+
+
+def test_codec_decodes_raw_responses():
+    """Test the sans-I/O codec decodes stored response bytes without a client"""
+    from decimal import Decimal
+    from quant1024.exchanges.codec import JsonMarketDataCodec
+    
+    codec = JsonMarketDataCodec()
+    ticker = codec.decode_ticker(b'{"success":true,"data":{"market":"BTC-USDC","last_price":"60000"}}')
+    assert ticker.last == Decimal("60000")
+    klines = codec.decode_klines(b'{"success":true,"data":[{"ts":1,"open":"1","close":"2"}]}')
+    assert klines[0].close == Decimal("2")
+
+
+@responses.activate
+def test_get_orderbook_typed(client):
+    """Test typed orderbook snapshot stores levels column-wise"""
+    pytest.importorskip("numpy")
+    from quant1024.exchanges.snapshot import Order, Orderbook
+    
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/markets/BTC-USDC/orderbook",
+        json={
+            "success": True,
+            "data": {
+                "market": "BTC-USDC",
+                "bids": [["99", "1"], ["98", "3"]],
+                "asks": [{"price": "101", "size": "2"}]
+            }
+        },
+        status=200
+    )
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/orders/o1",
+        json={"success": True, "data": {"order_id": "o1", "size": "0.5", "status": "open"}},
+        status=200
+    )
+    
+    book = client.perp.get_orderbook("BTC-USDC", typed=True)
+    assert isinstance(book, Orderbook)
+    assert book.bids.shape == (2, 2)
+    assert book.mid == 100.0
+    assert book.vwap("bids") == (99 + 98 * 3) / 4
+    assert book.imbalance() == (4 - 2) / 6
+    
+    order = client.perp.get_order("o1", typed=True)
+    assert isinstance(order, Order)
+    assert order.status == "open"
+
+
+@responses.activate
+def test_get_klines_as_frame(client):
+    """Test klines can be returned directly as a DataFrame or typed snapshots"""
+    from decimal import Decimal
+    from quant1024.data.adapters.exchange_adapter import ExchangeAdapter
+    
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/markets/BTC-USDC/klines",
+        json={
+            "success": True,
+            "data": [
+                {"timestamp": 1762909200000, "open": "1", "high": "3", "low": "0.5", "close": "2", "volume": "10"},
+                {"timestamp": 1762912800000, "open": "2", "high": "4", "low": "1.5", "close": "3", "volume": "20"}
+            ]
+        },
+        status=200
+    )
+    
+    df = client.perp.get_klines("BTC-USDC", as_frame=True)
+    assert list(df["close"]) == ["2", "3"]
+    
+    klines = client.perp.get_klines("BTC-USDC", typed=True)
+    assert [k.close for k in klines] == [Decimal("2"), Decimal("3")]
+    assert klines[1].ts == 1762912800000
+    
+    adapter = ExchangeAdapter("1024ex")
+    df = adapter.get_klines("BTC-USDC", "1h", None, None, 2)
+    assert df["close"].dtype == float
+    assert str(df["timestamp"].dt.tz) == "UTC"
+
+
+@responses.activate
+def test_async_perp_gather_tickers(client):
+    """Test concurrent ticker fan-out via async_perp"""
+    import asyncio
+    
+    for market, price in (("BTC-USDC", "60000"), ("ETH-USDC", "3000")):
+        responses.add(
+            responses.GET,
+            f"https://api.1024ex.com/api/v1/perp/markets/{market}/ticker",
+            json={"success": True, "data": {"market": market, "last_price": price}},
+            status=200
+        )
+    
+    tickers = asyncio.run(client.async_perp.gather_tickers(["BTC-USDC", "ETH-USDC"]))
+    assert list(tickers) == ["BTC-USDC", "ETH-USDC"]
+    assert tickers["ETH-USDC"]["data"]["last_price"] == "3000"
+
+
+@responses.activate
+def test_compressed_response_is_decoded(client):
+    """Test gzip responses are negotiated and parsed from the raw bytes"""
+    body = gzip.compress(b'{"success":true,"data":{"bids":[["50000","1.5"]]}}')
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/prediction/markets/7/orderbook",
+        body=body,
+        headers={"Content-Encoding": "gzip"},
+        content_type="application/json",
+        status=200
+    )
+    
+    result = client.prediction.get_market_orderbook("7")
+    assert result["data"]["bids"] == [["50000", "1.5"]]
+    assert "gzip" in responses.calls[0].request.headers["Accept-Encoding"]
+
+
+def test_token_bucket_paces_bursts():
+    """Test the token bucket spaces calls beyond the burst at 1/rate"""
+    import time
+    from quant1024.exchanges.ratelimit import TokenBucket
+    
+    bucket = TokenBucket(rate=100, burst=1)
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.025
+    
+    class CounterBackend:
+        def __init__(self):
+            self.counts = {}
+        def incr(self, key):
+            self.counts[key] = self.counts.get(key, 0) + 1
+            return self.counts[key]
+        def expire(self, key, seconds):
+            pass
+    
+    backend = CounterBackend()
+    shared = TokenBucket(rate=1000, backend=backend, key="test")
+    shared.acquire()
+    shared.acquire()
+    assert sum(backend.counts.values()) == 2
+    assert all(k.startswith("quant1024:ratelimit:test:") for k in backend.counts)
+
+
+@responses.activate
+def test_client_rate_limit_buckets():
+    """Test rate_limit creates separate public and signed buckets"""
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/markets",
+        json={"success": True, "data": []},
+        status=200
+    )
+    
+    client = Exchange1024ex(rate_limit=50)
+    assert client._public_bucket is not client._private_bucket
+    client.perp.get_markets()
+    assert client._public_bucket._tokens < client._private_bucket._tokens
+    assert Exchange1024ex()._public_bucket is None
+
+
+@responses.activate
+def test_route_generated_methods(client):
+    """Test ROUTES-generated methods hit the declared endpoints"""
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/orders/twap",
+        json={"success": True, "data": [{"order_id": "t1"}]},
+        status=200
+    )
+    responses.add(
+        responses.DELETE,
+        "https://api.1024ex.com/api/v1/perp/orders/trailing-stop/t2",
+        json={"success": True},
+        status=200
+    )
+    
+    assert client.perp.get_twap_orders() == [{"order_id": "t1"}]
+    assert client.perp.cancel_trailing_stop("t2") == {"success": True}
+    assert client.perp.cancel_twap.__doc__ == "取消 TWAP 订单"
+
+
+def test_cached_market_data_wrapper():
+    """Test CachedMarketData memoizes per symbol and keeps closed kline windows"""
+    from quant1024.exchanges.cache import CachedMarketData
+    
+    class Provider:
+        def __init__(self):
+            self.calls = []
+        def get_ticker(self, symbol):
+            self.calls.append(("ticker", symbol))
+            return {"market": symbol}
+        def get_klines(self, symbol, interval="1h", start_time=None, end_time=None, limit=100):
+            self.calls.append(("klines", symbol))
+            return [{"timestamp": end_time}]
+        def get_funding_rate(self, symbol):
+            return {"rate": "0.0001"}
+    
+    provider = Provider()
+    market = CachedMarketData(provider, ttl={"klines": 0})
+    market.get_ticker("BTC/USDC")
+    market.get_ticker("btc-usdc")
+    market.get_klines("BTC-USDC", "1h", end_time=1_600_000_000_000)
+    market.get_klines("BTC-USDC", "1h", end_time=1_600_000_000_000)
+    assert provider.calls == [("ticker", "BTC/USDC"), ("klines", "BTC-USDC")]
+    
+    assert market.clear_symbol("BTC-USDC") == 2
+    market.get_ticker("BTC-USDC")
+    assert len(provider.calls) == 3
+    assert market.get_funding_rate("BTC-USDC") == {"rate": "0.0001"}
+
+
+def test_kline_cache_fetches_only_missing_ranges():
+    """Test KlineCache slices cached closed bars and fetches only the missing edges"""
+    pytest.importorskip("numpy")
+    from quant1024.exchanges.cache import KlineCache
+    
+    hour = 3_600_000
+    
+    class Provider:
+        def __init__(self):
+            self.calls = []
+        def get_klines(self, symbol, interval="1h", start_time=None, end_time=None, limit=100):
+            self.calls.append((start_time, end_time))
+            return [
+                {"timestamp": ts, "open": "1", "high": "2", "low": "0.5", "close": str(ts // hour), "volume": "3"}
+                for ts in range(start_time, end_time + 1, hour)
+            ][:limit]
+    
+    provider = Provider()
+    klines = KlineCache(provider, page_size=4)
+    base = 1_600_000_000_000 // hour * hour
+    
+    bars = klines.get("BTC-USDC", "1h", base, base + 9 * hour)
+    assert len(bars) == 10
+    assert list(bars["ts"]) == list(range(base, base + 10 * hour, hour))
+    assert len(provider.calls) == 3
+    
+    calls = len(provider.calls)
+    assert len(klines.get("BTC-USDC", "1h", base + 2 * hour, base + 5 * hour)) == 4
+    assert len(provider.calls) == calls
+    
+    bars = klines.get("btc/usdc", "1h", base - 2 * hour, base + 9 * hour)
+    assert len(bars) == 12
+    assert provider.calls[calls:] == [(base - 2 * hour, base - hour)]
+
+
+def test_kline_cache_stops_when_pages_do_not_advance():
+    """Test KlineCache pagination ends when a provider ignores start_time or repeats bars"""
+    pytest.importorskip("numpy")
+    from quant1024.exchanges.cache import KlineCache
+    
+    hour = 3_600_000
+    base = 1_600_000_000_000 // hour * hour
+    
+    def bar(ts):
+        return {"timestamp": ts, "open": "1", "high": "2", "low": "0.5", "close": "1", "volume": "3"}
+    
+    class IgnoresStart:
+        def __init__(self):
+            self.calls = 0
+        def get_klines(self, symbol, interval="1h", start_time=None, end_time=None, limit=100):
+            self.calls += 1
+            return [bar(base + i * hour) for i in range(limit)]
+    
+    class EchoesBoundary:
+        def __init__(self):
+            self.calls = 0
+        def get_klines(self, symbol, interval="1h", start_time=None, end_time=None, limit=100):
+            self.calls += 1
+            first = max(base, start_time - hour)
+            return [bar(ts) for ts in range(first, end_time + 1, hour)][:limit]
+    
+    provider = IgnoresStart()
+    bars = KlineCache(provider, page_size=3).get("BTC-USDC", "1h", base, base + 9 * hour)
+    assert list(bars["ts"]) == [base, base + hour, base + 2 * hour]
+    assert provider.calls == 2
+    
+    provider = EchoesBoundary()
+    bars = KlineCache(provider, page_size=3).get("BTC-USDC", "1h", base, base + 9 * hour)
+    assert list(bars["ts"]) == list(range(base, base + 10 * hour, hour))
+    assert provider.calls <= 10
+
+
+@responses.activate
+def test_route_cache_ttl():
+    """Test routes declared with cache_ttl are served from the response cache"""
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/spot/markets/BTC-USDC/ticker",
+        json={"success": True, "data": {"last_price": "50000"}},
+        status=200
+    )
+    
+    client = Exchange1024ex(response_cache=True)
+    first = client.spot.get_ticker("BTC-USDC")
+    assert client.spot.get_ticker("BTC-USDC") == first
+    assert len(responses.calls) == 1
+    assert client.spot.get_ticker.__doc__ == "获取 24h 行情"
+
+
+@responses.activate
+def test_fetch_many_fans_out_reads(client):
+    """Test fetch_many runs one call per key and keys the results"""
+    for market_id in ("1", "2", "3"):
+        responses.add(
+            responses.GET,
+            f"https://api.1024ex.com/api/v1/prediction/markets/{market_id}/stats",
+            json={"success": True, "data": {"market_id": market_id}},
+            status=200
+        )
+    
+    stats = client.prediction.fetch_many(client.prediction.get_market_stats, ["1", "2", "3"])
+    assert {k: v["data"]["market_id"] for k, v in stats.items()} == {"1": "1", "2": "2", "3": "3"}
+    assert list(client.prediction.batch_get_stats(["3", "1"])) == ["3", "1"]
+
+
+@responses.activate
+def test_multi_market_reads_keyed_by_market(client):
+    """Test get_orderbooks/get_tickers return results keyed by market"""
+    for market in ("BTC-USDC", "ETH-USDC"):
+        responses.add(
+            responses.GET,
+            f"https://api.1024ex.com/api/v1/perp/markets/{market}/orderbook",
+            json={"success": True, "data": {"market": market}},
+            status=200
+        )
+    
+    books = client.perp.get_orderbooks(["ETH-USDC", "BTC-USDC"], depth=5)
+    assert list(books) == ["ETH-USDC", "BTC-USDC"]
+    assert books["BTC-USDC"]["data"]["market"] == "BTC-USDC"
+    assert all("depth=5" in call.request.url for call in responses.calls)
+    assert not hasattr(client.perp, "aget_orderbooks")
+
+
+@responses.activate
+def test_pipeline_flushes_on_exit(client):
+    """Test pipeline records calls and returns results in call order"""
+    for order_id in ("t1", "t2"):
+        responses.add(
+            responses.DELETE,
+            f"https://api.1024ex.com/api/v1/perp/orders/twap/{order_id}",
+            json={"success": True, "data": {"order_id": order_id}},
+            status=200
+        )
+    
+    with client.perp.pipeline() as pipe:
+        assert pipe.cancel_twap("t2") == 0
+        pipe.cancel_twap("t1")
+        assert len(responses.calls) == 0
+    
+    assert [r["data"]["order_id"] for r in pipe.results] == ["t2", "t1"]
+    assert len(pipe) == 0
+
+
+@responses.activate
+def test_async_twins_gather(client):
+    """Test generated a-prefixed async twins run concurrently"""
+    import asyncio
+    
+    for market_id in ("1", "2"):
+        responses.add(
+            responses.GET,
+            f"https://api.1024ex.com/api/v1/prediction/markets/{market_id}",
+            json={"success": True, "data": {"market_id": market_id}},
+            status=200
+        )
+    
+    async def main():
+        return await asyncio.gather(*(client.prediction.aget_market(m) for m in ("1", "2")))
+    
+    results = asyncio.run(main())
+    assert [r["data"]["market_id"] for r in results] == ["1", "2"]
+    assert asyncio.iscoroutinefunction(client.spot.aplace_order)
+    assert not hasattr(client.perp, "aenable_order_cache")
+
+
+@responses.activate
+def test_async_loader_coalesces_loads(client):
+    """Test concurrent loads in one window share a single batch call"""
+    import asyncio
+    from quant1024.exchanges.modules import AsyncLoader
+    
+    for market_id in ("1", "2"):
+        responses.add(
+            responses.GET,
+            f"https://api.1024ex.com/api/v1/prediction/markets/{market_id}/orderbook",
+            json={"success": True, "data": {"market_id": market_id}},
+            status=200
+        )
+    
+    async def main():
+        loader = client.prediction.orderbook_loader(max_wait_ms=5)
+        books = await asyncio.gather(loader.load("1"), loader.load("2"), loader.load("1"))
+        
+        batches = []
+        async def echo(keys):
+            batches.append(keys)
+            return {k: k * 2 for k in keys}
+        small = AsyncLoader(echo, max_batch=2, max_wait_ms=50)
+        doubled = await small.load_many([1, 2, 3])
+        return books, batches, doubled
+    
+    books, batches, doubled = asyncio.run(main())
+    assert [b["data"]["market_id"] for b in books] == ["1", "2", "1"]
+    assert len(responses.calls) == 2
+    assert batches == [[1, 2], [3]]
+    assert doubled == [2, 4, 6]
+    assert not hasattr(client.prediction, "aorderbook_loader")
+
+
+@responses.activate
+def test_orderbook_subscription_serves_snapshots(client):
+    """Test subscriptions call back only on change and serve local snapshots"""
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/prediction/markets/9/orderbook",
+        json={"success": True, "data": {"bids": [["0.6", "10"]]}},
+        status=200
+    )
+    
+    books = []
+    sub = client.prediction.subscribe_orderbook("9", books.append, interval=60)
+    feed = sub.feed
+    feed.stop()
+    feed.refresh()
+    feed.refresh()
+    calls = len(responses.calls)
+    
+    assert len(books) == 1
+    assert client.prediction.get_market_orderbook("9") == books[0]
+    assert len(responses.calls) == calls
+    
+    sub.close()
+    client.prediction.get_market_orderbook("9")
+    assert len(responses.calls) == calls + 1
+
+
+@responses.activate
+def test_ticker_subscribers_share_one_feed(client):
+    """Test subscribers to one market share a refresh and the last close stops it"""
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/markets/BTC-USDC/ticker",
+        json={"success": True, "data": {"last": "50000"}},
+        status=200
+    )
+    
+    first, second = [], []
+    sub_a = client.perp.subscribe_ticker("BTC-USDC", first.append, interval=60)
+    sub_b = client.perp.subscribe_ticker("BTC-USDC", second.append, interval=60)
+    feed = sub_a.feed
+    assert sub_b.feed is feed
+    feed.stop()
+    calls = len(responses.calls)
+    feed.refresh()
+    
+    assert len(responses.calls) == calls + 1
+    assert len(first) == len(second) == 1
+    
+    sub_a.close()
+    assert feed.keys() == ["BTC-USDC"]
+    sub_b.close()
+    assert feed.keys() == []
+    assert feed._thread is None
+
+
+def test_market_feed_close_removes_only_its_own_subscription(client):
+    """Test closing one subscription keeps other subscribers on the same key"""
+    from quant1024.exchanges.streaming import MarketFeed
+    
+    feed = MarketFeed(client.perp, lambda key: None, interval=60)
+    feed.start = lambda: None  # updates are applied by hand below
+    updates = []
+    with_callback = feed.subscribe("A", updates.append)
+    snapshot_only = feed.subscribe("A")
+    
+    snapshot_only.close()
+    assert feed.keys() == ["A"]
+    feed.apply("A", 1)
+    assert updates == [1]
+    
+    snapshot_only = feed.subscribe("A")
+    with_callback.close()
+    with_callback.close()
+    assert feed.keys() == ["A"]
+    assert feed.get("A") == 1
+    
+    snapshot_only.close()
+    assert feed.keys() == []
+    assert feed.get("A") is None
+
+
+def test_market_feed_unsubscribe_key_removes_all(client):
+    """Test unsubscribe(key) without a callback drops every subscriber"""
+    from quant1024.exchanges.streaming import MarketFeed
+    
+    feed = MarketFeed(client.perp, lambda key: key, interval=60)
+    feed.subscribe("A", lambda value: None)
+    feed.subscribe("A")
+    feed.unsubscribe("A")
+    assert feed.keys() == []
+    assert feed._thread is None
+
+
+def test_market_feed_starts_one_thread_under_concurrent_subscribe(client):
+    """Test concurrent subscribe calls start a single refresh thread"""
+    import threading
+    from quant1024.exchanges.streaming import MarketFeed
+    
+    feed = MarketFeed(client.perp, lambda key: key, interval=60, name="test_market_feed")
+    barrier = threading.Barrier(8)
+    
+    def subscribe(i):
+        barrier.wait()
+        feed.subscribe(f"k{i}", lambda value: None)
+    
+    workers = [threading.Thread(target=subscribe, args=(i,)) for i in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    feeds = [t for t in threading.enumerate() if t.name == "test_market_feed"]
+    assert len(feeds) == 1
+    feed.stop()
+    assert not feeds[0].is_alive()
+
+
+@responses.activate
+def test_position_subscription_filters_market(client):
+    """Test position subscriptions deliver only the subscribed market, on change"""
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/positions",
+        json={"success": True, "data": [
+            {"market": "ETH-USDC", "size": "2"},
+            {"market": "BTC-USDC", "size": "0.5"},
+        ]},
+        status=200
+    )
+    
+    updates = []
+    sub = client.subscribe_positions("BTC-USDC", updates.append, interval=60)
+    feed = sub.feed
+    feed.stop()
+    feed.refresh()
+    feed.refresh()
+    
+    assert updates == [[{"market": "BTC-USDC", "size": "0.5"}]]
+    sub.close()
+    assert feed.keys() == []
+
+
+@responses.activate
+def test_response_cache_serves_repeat_reads():
+    """Test cached public reads skip the network and fill the shared tier"""
+    class DictBackend:
+        def __init__(self):
+            self.store = {}
+        
+        def get(self, key):
+            return self.store.get(key)
+        
+        def setex(self, key, ttl, value):
+            self.store[key] = value
+    
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/prediction/categories",
+        json={"success": True, "data": ["crypto"]},
+        status=200
+    )
+    
+    backend = DictBackend()
+    client = Exchange1024ex(response_cache=True, cache_backend=backend)
+    assert client.prediction.list_categories()["data"] == ["crypto"]
+    assert client.prediction.list_categories()["data"] == ["crypto"]
+    assert len(responses.calls) == 1
+    
+    other = Exchange1024ex(cache_backend=backend)
+    assert other.prediction.list_categories()["data"] == ["crypto"]
+    assert len(responses.calls) == 1
+    
+    uncached = Exchange1024ex()
+    uncached.prediction.list_categories()
+    assert len(responses.calls) == 2
+
+
+# ========== Order Batching Tests ==========
+
+@responses.activate
+def test_batching_proxy_coalesces_orders(client):
+    """Test queued place_order calls go out as one batch request"""
+    import json
+    from quant1024.exchanges.modules import BatchingPerpProxy
+    
+    def batch_callback(request):
+        orders = json.loads(request.body)["orders"]
+        rows = [{"order_id": f"o-{o['client_order_id']}", "client_order_id": o["client_order_id"]}
+                for o in reversed(orders)]
+        return (200, {}, json.dumps({"success": True, "data": rows}))
+    
+    responses.add_callback(
+        responses.POST,
+        "https://api.1024ex.com/api/v1/perp/orders/batch",
+        callback=batch_callback,
+        content_type="application/json"
+    )
+    
+    with BatchingPerpProxy(client.perp, max_batch=3, max_delay_ms=500) as perp:
+        futures = [
+            perp.place_order("BTC-USDC", "long", "limit", "0.1", price="50000", client_order_id=f"c{i}")
+            for i in range(3)
+        ]
+        results = [f.result(timeout=5) for f in futures]
+    
+    assert len(responses.calls) == 1
+    assert [r["order_id"] for r in results] == ["o-c0", "o-c1", "o-c2"]
+
+
+@responses.activate
+def test_batching_proxy_single_order_uses_place_order(client):
+    """Test a lone batched order keeps place_order's Idempotency-Key"""
+    from quant1024.exchanges.modules import BatchingPerpProxy
+    
+    responses.add(
+        responses.POST,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        json={"success": True, "order_id": "o1"},
+        status=200
+    )
+    
+    with BatchingPerpProxy(client.perp, max_batch=3, max_delay_ms=1) as perp:
+        result = perp.place_order("BTC-USDC", "long", "market", "0.1", client_order_id="c1").result(timeout=5)
+    
+    assert result["order_id"] == "o1"
+    assert len(responses.calls) == 1
+    assert responses.calls[0].request.headers["Idempotency-Key"] == "c1"
+
+
+@responses.activate
+def test_order_cache_serves_get_order(client):
+    """Test get_order/get_positions read from the order cache after a refresh"""
+    from quant1024.exchanges.streaming import OrderCache
+    
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        json={"success": True, "data": [{"order_id": "o1", "status": "open"}]},
+        status=200
+    )
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/positions",
+        json={"success": True, "data": [{"market": "BTC-USDC", "size": "0.1"}]},
+        status=200
+    )
+    
+    cache = OrderCache(client.perp)
+    cache.refresh()
+    client.perp._order_cache = cache
+    
+    assert client.perp.get_order("o1")["data"]["status"] == "open"
+    assert client.perp.get_positions("BTC-USDC")[0]["size"] == "0.1"
+    assert len(responses.calls) == 2
+    
+    cache.apply_order({"order_id": "o2", "status": "open"})
+    assert client.perp.get_order("o2")["data"]["order_id"] == "o2"
+    assert len(responses.calls) == 2
+    
+    responses.add(
+        responses.DELETE,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        json={"success": True, "data": {"cancelled": 2}},
+        status=200
+    )
+    client.perp.cancel_all_orders()
+    assert cache.get_order("o1") is None
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_order_cache_refresh_fetches_positions(client):
+    """Test every order cache refresh reloads positions over REST"""
+    from quant1024.exchanges.streaming import OrderCache
+    
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        json={"success": True, "data": []},
+        status=200
+    )
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/positions",
+        json={"success": True, "data": [{"market": "BTC-USDC", "size": "0.1"}]},
+        status=200
+    )
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/positions",
+        json={"success": True, "data": [{"market": "BTC-USDC", "size": "0.2"}]},
+        status=200
+    )
+    
+    cache = OrderCache(client.perp)
+    client.perp._order_cache = cache
+    for _ in range(3):
+        cache.refresh()
+    
+    position_calls = [c for c in responses.calls if c.request.url.endswith("/positions")]
+    assert len(position_calls) == 3
+    assert client.perp.get_positions("BTC-USDC")[0]["size"] == "0.2"
+
+
+@responses.activate
+def test_cancel_coalescer_drains_queued_cancels(client):
+    """Test queued cancels are flushed through the batch endpoint"""
+    import json
+    import threading
+    from quant1024.exchanges.modules import CancelCoalescer
+    
+    release = threading.Event()
+    
+    def single_callback(request):
+        release.wait(5)  # hold the worker until the other cancels are queued
+        return (200, {}, json.dumps({"success": True, "order_id": "a"}))
+    
+    def batch_callback(request):
+        release.wait(5)
+        ids = json.loads(request.body)["order_ids"]
+        return (200, {}, json.dumps({"success": True, "data": [{"order_id": i, "status": "cancelled"} for i in ids]}))
+    
+    responses.add_callback(responses.DELETE, "https://api.1024ex.com/api/v1/perp/orders/a", callback=single_callback)
+    responses.add_callback(responses.DELETE, "https://api.1024ex.com/api/v1/perp/orders/batch", callback=batch_callback)
+    
+    with CancelCoalescer(client.perp, max_delay_ms=0) as cancels:
+        first = cancels.cancel_order("a")
+        rest = [cancels.cancel_order(i) for i in ("b", "c", "d")]
+        release.set()
+        assert first.result(timeout=5)["order_id"] == "a"
+        assert [f.result(timeout=5)["order_id"] for f in rest] == ["b", "c", "d"]
+    
+    assert len(responses.calls) <= 2
+
+
 # ========== Error Handling Tests ==========
 
 @responses.activate
@@ -223,6 +1050,299 @@ def test_api_error(client):
         )
 
 
+# ========== Authentication Tests ==========
+
+def test_auth_headers_timestamp_and_signature():
+    """Test auth headers carry a millisecond timestamp that signs correctly"""
+    from quant1024.auth.hmac_auth import get_auth_headers, verify_signature
+    
+    headers = get_auth_headers("key", "secret", "POST", "/api/v1/perp/orders", '{"a":1}')
+    assert headers["X-TIMESTAMP"].isdigit()
+    assert len(headers["X-TIMESTAMP"]) == 13
+    assert verify_signature(
+        "secret", headers["X-TIMESTAMP"], "POST", "/api/v1/perp/orders",
+        '{"a":1}', headers["X-SIGNATURE"]
+    )
+    
+    fixed = get_auth_headers("key", "secret", "GET", "/x", timestamp="1735084800000")
+    assert fixed["X-TIMESTAMP"] == "1735084800000"
+
+
+def test_hmac_signer_matches_generate_signature():
+    """Test the reusable signer produces the reference signature"""
+    from quant1024.auth.hmac_auth import HmacSigner, generate_signature
+    
+    signer = HmacSigner("secret")
+    for _ in range(2):
+        assert signer.sign("1735084800000", "post", "/api/v1/perp/orders", '{"a":1}') == \
+            generate_signature("secret", "1735084800000", "POST", "/api/v1/perp/orders", '{"a":1}')
+
+
+@responses.activate
+def test_signed_body_matches_sent_bytes(client):
+    """Test the signature covers the exact JSON bytes sent"""
+    from quant1024.auth.hmac_auth import verify_signature
+    
+    responses.add(
+        responses.POST,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        json={"success": True, "data": {"order_id": "1"}},
+        status=200
+    )
+    
+    client.perp.place_order(market="BTC-USDC", side="long", order_type="market", size="0.1")
+    sent = responses.calls[0].request
+    assert verify_signature(
+        "test_secret_key", sent.headers["X-TIMESTAMP"], "POST", "/api/v1/perp/orders",
+        sent.body.decode("utf-8"), sent.headers["X-SIGNATURE"]
+    )
+
+
+@responses.activate
+def test_array_ids_serialize_like_lists(client):
+    """Test array.array / numpy id batches are sent as plain JSON int arrays"""
+    import array
+    np = pytest.importorskip("numpy")
+    
+    responses.add(
+        responses.POST,
+        "https://api.1024ex.com/api/v1/prediction/markets/batch-prices",
+        json={"success": True, "data": []},
+        status=200
+    )
+    
+    client.prediction.batch_get_prices([1, 2, 3])
+    client.prediction.batch_get_prices(array.array("q", [1, 2, 3]))
+    client.prediction.batch_get_prices(np.array([1, 2, 3], dtype=np.int64))
+    assert {call.request.body for call in responses.calls} == {b'{"market_ids":[1,2,3]}'}
+
+
+def test_slice_schedules_sum_to_total():
+    """Test TWAP/VWAP schedules are tick-aligned and sum exactly to the total"""
+    from decimal import Decimal
+    from quant1024.utils.schedules import compute_default_u_shape, schedule_twap, schedule_vwap
+    
+    twap = schedule_twap("1", 3)
+    assert twap == [Decimal("0.3333"), Decimal("0.3333"), Decimal("0.3334")]
+    
+    weights = compute_default_u_shape(5)
+    assert list(weights) == [3.0, 2.0, 1.0, 2.0, 3.0]
+    vwap = schedule_vwap(Decimal("2.5"), weights, tick="0.01")
+    assert sum(vwap) == Decimal("2.5")
+    assert vwap[0] > vwap[2]
+    
+    with pytest.raises(ValueError):
+        schedule_vwap("1", [0, 0])
+    
+    from quant1024.utils.schedules import schedule_iceberg, schedule_scale_prices
+    
+    prices = schedule_scale_prices("100", "101", 3)
+    assert prices == [Decimal("100.00"), Decimal("100.50"), Decimal("101.00")]
+    assert schedule_iceberg("1", "0.3") == [Decimal("0.3")] * 3 + [Decimal("0.1")]
+
+
+@responses.activate
+def test_validate_orders_rejects_bad_payloads():
+    """Test validate_orders checks order payloads before anything is sent"""
+    from quant1024.exceptions import InvalidParameterError
+    
+    responses.add(
+        responses.POST,
+        "https://api.1024ex.com/api/v1/prediction/orders",
+        json={"success": True, "data": {"order_id": 1}},
+        status=200
+    )
+    
+    client = Exchange1024ex(api_key="k", secret_key="s", validate_orders=True)
+    client.prediction.place_order(market_id=1, side=0, outcome_index=0, price_e6=650000, amount=10)
+    with pytest.raises(InvalidParameterError):
+        client.prediction.place_order(market_id=1, side=0, outcome_index=0, price_e6=0.65, amount=10)
+    with pytest.raises(InvalidParameterError):
+        client.perp.place_order(market="BTC-USDC", side="long", order_type="limit", size=0.1)
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_post_retries_reuse_idempotency_key(client, monkeypatch):
+    """Test a retried POST carries the same Idempotency-Key on every attempt"""
+    import requests
+    from quant1024.exchanges import exchange_1024ex
+    
+    monkeypatch.setattr(exchange_1024ex.time, "sleep", lambda seconds: None)
+    url = "https://api.1024ex.com/api/v1/perp/orders"
+    responses.add(responses.POST, url, body=requests.ConnectionError("reset"))
+    responses.add(responses.POST, url, json={"success": True, "data": {"order_id": "1"}}, status=200)
+    responses.add(responses.GET, url, json={"success": True, "data": []}, status=200)
+    
+    client.perp.place_order(market="BTC-USDC", side="long", order_type="market", size="0.1")
+    first, second = (call.request for call in responses.calls)
+    assert first.headers["Idempotency-Key"] == second.headers["Idempotency-Key"]
+    
+    client.perp.get_orders()
+    assert "Idempotency-Key" not in responses.calls[-1].request.headers
+
+
+@responses.activate
+def test_iter_order_history_follows_cursor(client):
+    """Test iter_order_history pages by next_cursor and stops early on break"""
+    from responses import matchers
+    
+    url = "https://api.1024ex.com/api/v1/perp/orders/history"
+    responses.add(
+        responses.GET, url,
+        match=[matchers.query_param_matcher({"market": "BTC-USDC", "limit": "2"})],
+        json={"success": True, "data": [{"order_id": "1"}, {"order_id": "2"}], "next_cursor": "c2"}
+    )
+    responses.add(
+        responses.GET, url,
+        match=[matchers.query_param_matcher({"market": "BTC-USDC", "limit": "2", "cursor": "c2"})],
+        json={"success": True, "data": [{"order_id": "3"}], "next_cursor": None}
+    )
+    
+    orders = client.perp.iter_order_history(market="BTC-USDC", page_size=2)
+    assert [o["order_id"] for o in orders] == ["1", "2", "3"]
+    assert len(responses.calls) == 2
+    
+    for order in client.perp.iter_order_history(market="BTC-USDC", page_size=2):
+        break
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_empty_filters_are_not_sent(client):
+    """Test market="" means no filter while explicit zeros are still sent"""
+    from responses import matchers
+    
+    responses.add(
+        responses.DELETE,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        match=[matchers.query_param_matcher({})],
+        json={"success": True, "data": {"cancelled": 0}}
+    )
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        match=[matchers.query_param_matcher({"limit": "100"})],
+        json={"success": True, "data": []}
+    )
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/perp/funding/history",
+        match=[matchers.query_param_matcher({"limit": "100", "start_time": "0"})],
+        json={"success": True, "data": []}
+    )
+    
+    client.perp.cancel_all_orders(market="")
+    client.perp.get_orders(market="", side="")
+    client.perp.get_user_funding_history(market="", start_time=0)
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_prediction_and_spot_drop_empty_fields(client):
+    """Test prediction/spot treat "" like None while keeping explicit zeros"""
+    import json
+    from responses import matchers
+    
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/prediction/markets",
+        match=[matchers.query_param_matcher({"page": "1", "page_size": "20"})],
+        json={"success": True, "data": []}
+    )
+    responses.add(
+        responses.GET,
+        "https://api.1024ex.com/api/v1/prediction/me/orders",
+        match=[matchers.query_param_matcher({"limit": "50", "market_id": "0"})],
+        json={"success": True, "data": []}
+    )
+    responses.add(
+        responses.PUT,
+        "https://api.1024ex.com/api/v1/spot/orders/o1",
+        json={"success": True}
+    )
+    
+    client.prediction.list_markets(status="", category="")
+    client.prediction.get_my_orders(market_id=0, status="")
+    client.spot.update_order("o1", price="50000", size="")
+    assert len(responses.calls) == 3
+    assert json.loads(responses.calls[2].request.body) == {"price": "50000"}
+
+
+@responses.activate
+def test_client_order_id_dedups_place_order(client):
+    """Test repeated client_order_id submissions place one order and reuse the key"""
+    responses.add(
+        responses.POST,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        json={"success": True, "data": {"order_id": "o1"}},
+        status=200
+    )
+    
+    first = client.perp.place_order("BTC-USDC", "long", "limit", "0.1", price="50000", client_order_id="c1")
+    again = client.perp.place_order("BTC-USDC", "long", "limit", "0.1", price="50000", client_order_id="c1")
+    assert again is first
+    assert len(responses.calls) == 1
+    assert responses.calls[0].request.headers["Idempotency-Key"] == "c1"
+    
+    client.perp.place_order("BTC-USDC", "long", "limit", "0.1", price="50000")
+    client.perp.place_order("BTC-USDC", "long", "limit", "0.1", price="50000")
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_order_template_matches_place_order(client):
+    """Test template bodies are byte-identical to place_order and signed"""
+    from quant1024.auth.hmac_auth import verify_signature
+    
+    responses.add(
+        responses.POST,
+        "https://api.1024ex.com/api/v1/prediction/orders",
+        json={"success": True, "data": {"order_id": 1}},
+        status=200
+    )
+    
+    client.prediction.place_order(market_id=123, side=0, outcome_index=1, price_e6=650000, amount=10)
+    bid = client.prediction.order_template(market_id=123, side=0, outcome_index=1)
+    assert bid.submit(price_e6=650000, amount=10)["data"]["order_id"] == 1
+    
+    first, second = (call.request for call in responses.calls)
+    assert first.body == second.body
+    assert verify_signature(
+        "test_secret_key", second.headers["X-TIMESTAMP"], "POST", "/api/v1/prediction/orders",
+        second.body.decode("utf-8"), second.headers["X-SIGNATURE"]
+    )
+    with pytest.raises(TypeError):
+        bid.body(price_e6=0.65, amount=10)
+
+
+@responses.activate
+def test_perp_order_template_matches_place_order(client):
+    """Test perp template bodies are byte-identical to place_order and deduplicated"""
+    responses.add(
+        responses.POST,
+        "https://api.1024ex.com/api/v1/perp/orders",
+        json={"success": True, "data": {"order_id": "o1"}},
+        status=200
+    )
+    
+    client.perp.place_order(market="BTC-USDC", side="long", order_type="market", size="0.1")
+    client.perp.place_order(
+        market="BTC-USDC", side="short", order_type="market", size="0.2", client_order_id="c1"
+    )
+    template = client.perp.order_template("BTC-USDC")
+    template.submit(side="long", size="0.1")
+    template.submit(side="short", size="0.2", client_order_id="c2")
+    template.submit(side="short", size="0.2", client_order_id="c2")
+    
+    bodies = [call.request.body for call in responses.calls]
+    assert len(bodies) == 4
+    assert bodies[2] == bodies[0]
+    assert bodies[3] == bodies[1].replace(b'"c1"', b'"c2"')
+    assert responses.calls[3].request.headers["Idempotency-Key"] == "c2"
+    assert not hasattr(client.perp, "aorder_template")
+
+
 # ========== Public API Import Tests ==========
 
 def test_public_api_import_exchange():
@@ -97,6 +97,15 @@ class TestQuantStrategyImport:
         # 测试持有信号
         new_position = strategy.calculate_position(0, 0.5)
         assert new_position == 0.5
+    
+    def test_incremental_signal_is_opt_in(self):
+        """测试增量信号默认关闭，未实现 update 时报错"""
+        strategy = SimpleMovingAverageStrategy(name="Test")
+        
+        assert strategy.supports_incremental is False
+        assert strategy.init_state() is None
+        with pytest.raises(NotImplementedError):
+            strategy.update(None, 100.0)
 
 
 class TestUtilityFunctions:
@@ -0,0 +1,482 @@
+"""
+Test LiveTrader
+
+Drives the trading loop against an in-memory exchange (no network).
+"""
+
+import asyncio
+import gc
+import threading
+import time
+
+import numpy as np
+import pytest
+import responses
+# Import from internal modules directly (not public API)
+from quant1024.core import QuantStrategy
+from quant1024.exchanges.base import BaseExchange
+from quant1024.exchanges.exchange_1024ex import Exchange1024ex
+from quant1024.live_trading import LiveTrader, configure_logging
+
+
+class FakeExchange(BaseExchange):
+    """内存交易所：按顺序返回 prices 中的价格，记录所有下单请求"""
+    
+    def __init__(self, prices=None, position=None):
+        super().__init__(api_key="test", api_secret="test", base_url="memory://")
+        self.prices = list(prices or [100.0])
+        self.position = position
+        self.orders = []
+        self.ticker_calls = 0
+        self.position_calls = 0
+    
+    def get_ticker(self, market):
+        price = self.prices[min(self.ticker_calls, len(self.prices) - 1)]
+        self.ticker_calls += 1
+        return {"data": {"last_price": price}}
+    
+    def get_positions(self, market=None):
+        self.position_calls += 1
+        return {"data": [] if self.position is None else [{"size": self.position}]}
+    
+    def place_order(self, market, side, order_type, size, price=None, **kwargs):
+        self.orders.append({"market": market, "side": side, "size": size, **kwargs})
+        return {"order_id": f"o{len(self.orders)}"}
+    
+    def get_server_time(self):
+        raise NotImplementedError
+    
+    def get_health(self):
+        raise NotImplementedError
+    
+    def get_exchange_info(self):
+        raise NotImplementedError
+    
+    def get_markets(self):
+        raise NotImplementedError
+    
+    def get_market(self, market):
+        raise NotImplementedError
+    
+    def get_orderbook(self, market, depth=20):
+        raise NotImplementedError
+    
+    def get_trades(self, market, limit=50):
+        raise NotImplementedError
+    
+    def get_klines(self, market, interval="1h", start_time=None, end_time=None, limit=100):
+        raise NotImplementedError
+    
+    def cancel_order(self, order_id):
+        raise NotImplementedError
+    
+    def get_orders(self, market=None, status=None):
+        raise NotImplementedError
+    
+    def get_order(self, order_id):
+        raise NotImplementedError
+    
+    def get_balance(self):
+        raise NotImplementedError
+    
+    def get_margin(self):
+        raise NotImplementedError
+
+
+class StreamingExchange(FakeExchange):
+    """提供 stream_ticker 推送的交易所：推送 stream_prices 后结束或抛出 stream_error"""
+    
+    def __init__(self, stream_prices, stream_error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.stream_prices = stream_prices
+        self.stream_error = stream_error
+    
+    async def stream_ticker(self, market):
+        for price in self.stream_prices:
+            await asyncio.sleep(0.01)
+            yield price
+        if self.stream_error is not None:
+            raise self.stream_error
+
+
+class AlwaysLongStrategy(QuantStrategy):
+    """始终做多 0.5 的策略（用于测试）"""
+    
+    def generate_signals(self, data):
+        return [1] * len(data)
+    
+    def calculate_position(self, signal, current_position):
+        return 0.5 if signal == 1 else 0.0
+
+
+def make_trader(exchange, **kwargs):
+    kwargs.setdefault("check_interval", 0)
+    return LiveTrader(
+        strategy=AlwaysLongStrategy(name="AlwaysLong"),
+        exchange=exchange,
+        market="BTC-PERP",
+        initial_capital=10000,
+        **kwargs
+    )
+
+
+class TestTradingLoop:
+    """测试轮询交易循环"""
+    
+    def test_stops_after_max_iterations(self):
+        """测试达到 max_iterations 后停止"""
+        exchange = FakeExchange()
+        trader = make_trader(exchange)
+        trader.start(max_iterations=12)
+        
+        assert exchange.ticker_calls == 12
+        assert len(trader.price_history) == 12
+        # 第 10 个数据点起开始交易，之后仓位已到目标不再下单
+        assert [o["side"] for o in exchange.orders] == ["buy"]
+        assert exchange.orders[0]["size"] == "0.50000000"
+        assert trader.current_position == 0.5
+    
+    def test_stop_loss_closes_position(self):
+        """测试跌破止损线时平仓"""
+        exchange = FakeExchange(prices=[100.0] * 10 + [90.0])
+        trader = make_trader(exchange, stop_loss=0.05)
+        trader.start(max_iterations=11)
+        
+        assert [o["side"] for o in exchange.orders] == ["buy", "sell"]
+        assert trader.current_position == 0.0
+        assert trader.entry_price == 0
+    
+    def test_take_profit_closes_position(self):
+        """测试达到止盈线时平仓"""
+        exchange = FakeExchange(prices=[100.0] * 10 + [111.0])
+        trader = make_trader(exchange, stop_loss=0.05, take_profit=0.10)
+        trader.start(max_iterations=11)
+        
+        assert [o["side"] for o in exchange.orders] == ["buy", "sell"]
+        assert trader.current_position == 0.0
+
+
+class RecordingStrategy(AlwaysLongStrategy):
+    """记录 generate_signals 收到的数据（用于测试）"""
+    
+    def __init__(self, name):
+        super().__init__(name)
+        self.inputs = []
+    
+    def generate_signals(self, data):
+        self.inputs.append(data)
+        return super().generate_signals(data)
+
+
+class TestSignalInput:
+    """测试 generate_signals 的输入类型"""
+    
+    def _run(self, strategy):
+        trader = LiveTrader(strategy, FakeExchange(), "BTC-PERP", 10000, check_interval=0)
+        trader.start(max_iterations=10)
+        return strategy.inputs[-1]
+    
+    def test_list_by_default(self):
+        """测试默认传入 list，策略可按 list 使用"""
+        data = self._run(RecordingStrategy(name="Recording"))
+        assert type(data) is list
+        assert data == [100.0] * 10
+        data.append(1.0)  # 策略修改自己的副本，不影响价格历史
+    
+    def test_ndarray_view_when_opted_in(self):
+        """测试 supports_ndarray 为 True 时传入只读数组视图"""
+        strategy = RecordingStrategy(name="Recording")
+        strategy.supports_ndarray = True
+        data = self._run(strategy)
+        assert isinstance(data, np.ndarray)
+        assert not data.flags.writeable
+        assert data.tolist() == [100.0] * 10
+
+
+class TestIncrementalSignals:
+    """测试增量信号"""
+    
+    def test_missing_update_rejected(self):
+        """测试声明 supports_incremental 但未实现 update 时构造即报错"""
+        class Incomplete(AlwaysLongStrategy):
+            supports_incremental = True
+        
+        with pytest.raises(ValueError):
+            LiveTrader(Incomplete(name="Incomplete"), FakeExchange(), "BTC-PERP", 10000)
+    
+    def test_update_drives_signal(self):
+        """测试增量策略每个价格调用一次 update，不再调用 generate_signals"""
+        class Counting(RecordingStrategy):
+            supports_incremental = True
+            
+            def init_state(self):
+                return 0
+            
+            def update(self, state, price):
+                return state + 1, 1
+        
+        strategy = Counting(name="Counting")
+        exchange = FakeExchange()
+        trader = LiveTrader(strategy, exchange, "BTC-PERP", 10000, check_interval=0)
+        trader.start(max_iterations=12)
+        
+        assert trader._strategy_state == 12
+        assert strategy.inputs == []
+        assert [o["side"] for o in exchange.orders] == ["buy"]
+
+
+class TestAsyncOrders:
+    """测试后台下单"""
+    
+    def test_position_push_ignored_while_order_in_flight(self):
+        """测试订单返回前的持仓推送不会覆盖订单结果"""
+        release = asyncio.Event()
+        
+        class SlowExchange(FakeExchange):
+            async def place_order(self, market, side, order_type, size, price=None, **kwargs):
+                await release.wait()
+                return super().place_order(market, side, order_type, size, price, **kwargs)
+        
+        exchange = SlowExchange()
+        trader = make_trader(exchange, async_orders=True)
+        for _ in range(10):
+            trader._update_price_history(100.0)
+        
+        async def run():
+            await trader._on_tick(100.0, 0.0)
+            await asyncio.sleep(0)
+            assert trader._pending_order is not None
+            assert trader._order_in_flight
+            
+            # 成交前的持仓快照：应被忽略
+            trader._on_positions({"data": []})
+            assert trader.current_position == 0.0
+            
+            # 订单未返回时不会重复下单
+            await trader._on_tick(100.0, 0.0)
+            
+            release.set()
+            await trader._wait_for_order()
+        
+        asyncio.run(run())
+        
+        assert len(exchange.orders) == 1
+        assert trader._pending_order is None
+        assert not trader._order_in_flight
+        assert trader.current_position == 0.5
+        
+        # 订单返回后推送照常生效
+        trader._on_positions({"data": [{"size": "0.3"}]})
+        assert trader.current_position == 0.3
+    
+    def test_thread_push_applied_on_event_loop(self):
+        """测试推送线程的持仓回调转交到事件循环，订单返回后丢弃成交前的快照"""
+        exchange = FakeExchange()
+        trader = make_trader(exchange)
+        
+        async def run():
+            trader._loop = asyncio.get_running_loop()
+            
+            # 推送线程中的回调不直接修改持仓，由事件循环执行
+            push = threading.Thread(target=trader._on_positions, args=({"data": [{"size": "0.3"}]},))
+            push.start()
+            push.join()
+            assert trader.current_position == 0.0
+            await asyncio.sleep(0)
+            assert trader.current_position == 0.3
+            
+            # 推送收到后、应用前订单返回：推送是成交前的快照，应被丢弃
+            push = threading.Thread(target=trader._on_positions, args=({"data": []},))
+            push.start()
+            push.join()
+            trader.current_position = 0.5
+            trader._order_seq += 1
+            await asyncio.sleep(0)
+            assert trader.current_position == 0.5
+        
+        asyncio.run(run())
+
+
+class PushExchange(FakeExchange):
+    """提供持仓推送的交易所：记录订阅与取消"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.subscriptions = []
+        self.closed = 0
+        self.close_threads = []
+    
+    def subscribe_positions(self, market, callback):
+        self.subscriptions.append((market, callback))
+        return self
+    
+    def close(self):
+        self.closed += 1
+        self.close_threads.append(threading.current_thread())
+
+
+class HoldStrategy(AlwaysLongStrategy):
+    """从不调仓的策略（用于测试）"""
+    
+    def calculate_position(self, signal, current_position):
+        return current_position
+
+
+class TestPositionUpdates:
+    """测试持仓刷新的请求数"""
+    
+    def test_push_subscription_replaces_per_tick_fetch(self):
+        """测试推送源自动订阅，交易路径只在启动时获取一次持仓"""
+        exchange = PushExchange()
+        trader = make_trader(exchange)
+        trader.start(max_iterations=20)
+        
+        assert [market for market, _ in exchange.subscriptions] == ["BTC-PERP"]
+        assert exchange.position_calls == 1
+        assert exchange.closed == 1
+        # 取消订阅可能等待推送线程退出，不在事件循环线程中执行
+        assert exchange.close_threads[0] is not threading.main_thread()
+        assert trader._position_subscription is None
+        assert trader._loop is None
+    
+    @responses.activate
+    def test_1024ex_polling_subscription_is_opt_in(self):
+        """测试 1024ex 默认不启动轮询订阅，按 TTL 在交易路径上刷新"""
+        responses.add(
+            responses.GET,
+            "https://api.1024ex.com/api/v1/perp/markets/BTC-PERP/ticker",
+            json={"success": True, "data": {"last_price": "100"}}
+        )
+        responses.add(
+            responses.GET,
+            "https://api.1024ex.com/api/v1/perp/positions",
+            json={"success": True, "data": [{"market": "BTC-PERP", "size": "0.5"}]}
+        )
+        exchange = Exchange1024ex(api_key="test", secret_key="test")
+        trader = LiveTrader(HoldStrategy(name="Hold"), exchange, "BTC-PERP", 10000, check_interval=0)
+        trader.start(max_iterations=20)
+        
+        position_calls = [c for c in responses.calls if c.request.url.endswith("/positions")]
+        assert len(position_calls) == 1
+        assert exchange.perp._positions_feed is None
+        assert trader.current_position == 0.5
+    
+    @responses.activate
+    def test_1024ex_polling_subscription_uses_position_ttl(self):
+        """测试 subscribe_positions=True 时按 TTL 轮询，代替交易路径上的刷新"""
+        responses.add(
+            responses.GET,
+            "https://api.1024ex.com/api/v1/perp/markets/BTC-PERP/ticker",
+            json={"success": True, "data": {"last_price": "100"}}
+        )
+        responses.add(
+            responses.GET,
+            "https://api.1024ex.com/api/v1/perp/positions",
+            json={"success": True, "data": [{"market": "BTC-PERP", "size": "0.5"}]}
+        )
+        exchange = Exchange1024ex(api_key="test", secret_key="test")
+        trader = LiveTrader(
+            HoldStrategy(name="Hold"), exchange, "BTC-PERP", 10000,
+            check_interval=0, subscribe_positions=True
+        )
+        trader.start(max_iterations=20)
+        
+        position_calls = [c for c in responses.calls if c.request.url.endswith("/positions")]
+        # 启动时交易路径一次 + 订阅线程首轮一次，之后每 TTL 秒一次
+        assert len(position_calls) <= 2
+        assert exchange.perp._positions_feed.interval == trader._position_ttl
+        assert exchange.perp._positions_feed.keys() == []
+        assert trader._position_refresh == trader._position_ttl
+
+
+class TestStreaming:
+    """测试推送驱动与回退"""
+    
+    def test_falls_back_to_polling_when_stream_ends(self):
+        """测试推送结束后回退到轮询"""
+        exchange = StreamingExchange([100.0, 101.0, 102.0])
+        trader = make_trader(exchange)
+        trader.start(max_iterations=5)
+        
+        assert exchange.ticker_calls == 2
+        assert trader.price_history.tolist()[:3] == [100.0, 101.0, 102.0]
+        assert len(trader.price_history) == 5
+    
+    def test_falls_back_to_polling_when_stream_fails(self):
+        """测试推送异常后回退到轮询"""
+        exchange = StreamingExchange([100.0, 101.0], stream_error=ConnectionError("closed"))
+        trader = make_trader(exchange)
+        trader.start(max_iterations=4)
+        
+        assert exchange.ticker_calls == 2
+        assert len(trader.price_history) == 4
+
+
+class TestPriceCache:
+    """测试价格历史磁盘缓存"""
+    
+    def test_round_trip(self, tmp_path):
+        """测试停止时写入、重启后恢复"""
+        trader = make_trader(FakeExchange(), cache_path=str(tmp_path), check_interval=60)
+        for i in range(15):
+            trader._update_price_history(100.0 + i)
+        trader.stop()
+        
+        restored = make_trader(FakeExchange(), cache_path=str(tmp_path), check_interval=60)
+        assert restored.price_history.tolist() == trader.price_history.tolist()
+        assert restored.timestamp_history.tolist() == trader.timestamp_history.tolist()
+    
+    def test_expired_cache_is_ignored(self, tmp_path):
+        """测试过期缓存被整体丢弃"""
+        trader = make_trader(FakeExchange(), cache_path=str(tmp_path), check_interval=60)
+        stale = time.time_ns() // 1_000_000 - 3600 * 1000
+        for i in range(15):
+            trader._update_price_history(100.0 + i, ts=stale + i)
+        trader.stop()
+        
+        restored = make_trader(FakeExchange(), cache_path=str(tmp_path), check_interval=60)
+        assert len(restored.price_history) == 0
+
+
+class TestConfigureLogging:
+    """测试日志配置"""
+    
+    def test_keeps_global_record_fields(self):
+        """测试不修改全局的线程/进程字段采集开关"""
+        import logging
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        try:
+            configure_logging()
+            assert logging.logThreads and logging.logProcesses and logging.logMultiprocessing
+            record = logging.LogRecord("t", logging.INFO, __file__, 1, "msg", None, None)
+            assert record.threadName is not None and record.process is not None
+        finally:
+            root.handlers[:] = handlers
+            root.setLevel(level)
+
+
+class TestGcPolicy:
+    """测试 GC 策略"""
+    
+    @pytest.mark.parametrize("policy", ["Manual", "off", ""])
+    def test_unknown_policy_rejected(self, policy):
+        """测试未知的 gc_policy（包括大小写错误）直接报错，不回退到 auto"""
+        with pytest.raises(ValueError):
+            make_trader(FakeExchange(), gc_policy=policy)
+    
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_manual_gc_restored_after_start(self, enabled):
+        """测试 manual 模式运行结束后恢复 GC 状态"""
+        was_enabled = gc.isenabled()
+        try:
+            if not enabled:
+                gc.disable()
+            trader = make_trader(FakeExchange(), gc_policy="manual")
+            trader.start(max_iterations=3)
+            
+            assert gc.isenabled() is enabled
+            assert gc.get_freeze_count() == 0
+        finally:
+            if was_enabled:
+                gc.enable()